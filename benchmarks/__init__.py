@@ -0,0 +1 @@
+"""Package containing benchmark scripts."""
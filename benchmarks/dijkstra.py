@@ -0,0 +1,140 @@
+"""
+Benchmark Dijkstra's algorithm on a synthetic road network.
+
+The network is a road graph from benchmarks.generators. Graph.dijkstra, which uses
+an IndexedMinHeap of vertex ids over the graph's CSRGraph, is timed against
+the PriorityQueue search keyed on vertex address strings that Graph used
+originally, a search using a MinHeap of (distance, id) entries with
+duplicate pushes, and the IndexedMinHeap search over the adjacency and edge
+weight dictionaries Graph used to store its edges in (built once from
+Graph.adjacency_list and Graph.edge_weights before timing).
+
+Run from the repository root:
+python -m benchmarks.dijkstra
+"""
+
+import random
+import time
+
+from benchmarks import generators
+from datastructures.IndexedMinHeap import IndexedMinHeap
+from datastructures.MinHeap import MinHeap
+from datastructures.PriorityQueue import PriorityQueue
+
+def priority_queue_dijkstra(graph, start_vertex, adjacency_list, edge_weights):
+    """Run Dijkstra with a PriorityQueue indexed by vertex address."""
+
+    unvisited_queue = PriorityQueue(graph.size, lambda el : el.distance,
+                                    lambda el : el.data)
+    for vertex in graph.vertex_list:
+        vertex.distance = float('inf')
+        vertex.previous_vertex = None
+        if vertex == start_vertex:
+            vertex.distance = 0
+        unvisited_queue.push(vertex)
+
+    while not unvisited_queue.is_empty():
+        current_vertex = unvisited_queue.pop()
+        for adjacent_vertex in adjacency_list[current_vertex]:
+            edge_weight = edge_weights[(current_vertex, adjacent_vertex)]
+            new_distance = current_vertex.distance + edge_weight
+            if new_distance < adjacent_vertex.distance:
+                adjacent_vertex.distance = new_distance
+                adjacent_vertex.previous_vertex = current_vertex
+                unvisited_queue.update_priority(adjacent_vertex)
+
+    return [vertex.distance for vertex in graph.vertex_list]
+
+def lazy_heap_dijkstra(graph, start_vertex, adjacency_list, edge_weights):
+    """Run Dijkstra with a MinHeap of (distance, id) entries."""
+
+    distance = [float('inf')] * len(graph.vertex_list)
+    settled = [False] * len(graph.vertex_list)
+    distance[start_vertex.id] = 0
+    unvisited_queue = MinHeap()
+    unvisited_queue.push((0, start_vertex.id))
+
+    while not unvisited_queue.is_empty():
+        current_distance, current_id = unvisited_queue.pop()
+        if settled[current_id]:
+            continue
+        settled[current_id] = True
+        current_vertex = graph.vertex_list[current_id]
+        for adjacent_vertex in adjacency_list[current_vertex]:
+            new_distance = (current_distance
+                            + edge_weights[(current_vertex, adjacent_vertex)])
+            if new_distance < distance[adjacent_vertex.id]:
+                distance[adjacent_vertex.id] = new_distance
+                unvisited_queue.push((new_distance, adjacent_vertex.id))
+
+    return distance
+
+def dictionary_dijkstra(graph, start_vertex, adjacency_list, edge_weights):
+    """Run Dijkstra with an IndexedMinHeap over the adjacency dictionaries."""
+
+    distance = [float('inf')] * len(graph.vertex_list)
+    settled = [False] * len(graph.vertex_list)
+    distance[start_vertex.id] = 0
+    unvisited_queue = IndexedMinHeap(len(graph.vertex_list))
+    unvisited_queue.push(start_vertex.id, 0)
+
+    while not unvisited_queue.is_empty():
+        current_id, current_distance = unvisited_queue.pop()
+        settled[current_id] = True
+        current_vertex = graph.vertex_list[current_id]
+        for adjacent_vertex in adjacency_list[current_vertex]:
+            adjacent_id = adjacent_vertex.id
+            if settled[adjacent_id]:
+                continue
+            new_distance = (current_distance
+                            + edge_weights[(current_vertex, adjacent_vertex)])
+            if new_distance < distance[adjacent_id]:
+                distance[adjacent_id] = new_distance
+                if unvisited_queue.contains(adjacent_id):
+                    unvisited_queue.decrease_key(adjacent_id, new_distance)
+                else:
+                    unvisited_queue.push(adjacent_id, new_distance)
+
+    return distance
+
+def run(sizes=(1024, 10000), searches=3, seed=1):
+    """
+    Print the average time of a single source search for each method.
+
+    Keyword arguments:
+    sizes -- the numbers of vertices in the graphs to search.
+    searches -- the number of searches from random start vertices.
+    seed -- seed for the random number generator.
+    """
+
+    rng = random.Random(seed)
+    methods = [("PriorityQueue", priority_queue_dijkstra),
+               ("lazy MinHeap", lazy_heap_dijkstra),
+               ("IndexedMinHeap", dictionary_dijkstra),
+               ("IndexedMinHeap + CSRGraph",
+                lambda g, v, adjacency_list, edge_weights : g.dijkstra(v)[0])]
+
+    print("Vertices | Method | ms per search")
+    for size in sizes:
+        graph = generators.make_road_graph(size, seed)
+        starts = [rng.choice(graph.vertex_list) for _ in range(searches)]
+        graph.get_csr()
+        adjacency_list = graph.adjacency_list
+        edge_weights = graph.edge_weights
+
+        expected = None
+        for name, method in methods:
+            start = time.perf_counter()
+            for vertex in starts:
+                distances = method(graph, vertex, adjacency_list,
+                                   edge_weights)
+            elapsed = (time.perf_counter() - start) * 1000 / searches
+
+            if expected == None:
+                expected = distances
+            elif distances != expected:
+                raise AssertionError(name + " found different distances.")
+            print("{} | {} | {:0.1f}".format(size, name, elapsed))
+
+if __name__ == '__main__':
+    run()
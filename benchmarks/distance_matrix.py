@@ -0,0 +1,48 @@
+"""
+Benchmark importing a distance matrix with each all-pairs method.
+
+Map files of road graphs from benchmarks.generators are written to a
+temporary directory for several sizes. Each file is imported with
+import_distance_map_to_graph using a Dijkstra search from every vertex, and
+using Floyd-Warshall on the matrix (vectorized when NumPy is installed).
+
+Run from the repository root:
+python -m benchmarks.distance_matrix
+"""
+
+import os
+import tempfile
+import time
+
+from benchmarks import generators
+from datastructures.Graph import Graph
+from utilities import distance_matrix
+from utilities import imports
+
+def run(sizes=(50, 150), methods=("dijkstra", "floyd-warshall")):
+    """
+    Print the time taken to import each map file with each method.
+
+    Keyword arguments:
+    sizes -- the numbers of stops in the map files.
+    methods -- the all-pairs methods to time.
+    """
+
+    print("NumPy installed: {}".format(distance_matrix.numpy != None))
+    print("Stops | All-pairs method | Import seconds")
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            filename = os.path.join(directory, "map_{}.csv".format(size))
+            generators.write_map_file(filename,
+                                      generators.make_road_graph(size))
+
+            for method in methods:
+                graph = Graph(size, lambda el : el.data)
+                start = time.perf_counter()
+                imports.import_distance_map_to_graph(graph, graph.vertices,
+                                                     filename, method)
+                elapsed = time.perf_counter() - start
+                print("{} | {} | {:0.3f}".format(size, method, elapsed))
+
+if __name__ == '__main__':
+    run()
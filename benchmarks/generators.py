@@ -0,0 +1,157 @@
+"""
+Synthetic road graphs, package manifests, and data files for benchmarks.
+
+Addresses are written the way the imported data writes them, a street
+followed by the zip code in brackets, and the first address is always the
+hub's, so generated files can be run through main.py's simulation. Every
+generator takes a seed, so the same arguments always give the same data.
+
+Functions:
+make_addresses -- return a list of distinct delivery addresses.
+make_road_graph -- return a connected road graph with a vertex per address.
+make_packages -- return a list of packages addressed to graph vertices.
+write_map_file -- write a graph as a map file (a distance matrix).
+write_package_file -- write packages as a package file.
+write_update_file -- write an empty management update file.
+"""
+
+import csv
+import math
+import random
+
+from datastructures.Graph import Graph, Vertex
+from models.Package import Package
+from utilities.time import (convert_minutes_to_standard_time,
+                            convert_standard_time_to_minutes)
+
+HUB_ADDRESS = "4001 South 700 East (84107)"
+
+STREETS = ("Main St", "State St", "900 E", "700 E", "500 S", "2100 S",
+           "Redwood Rd", "Highland Dr", "Van Winkle Expy", "Bangerter Hwy")
+
+# Deadlines given to generated packages and the share of packages with each.
+DEADLINES = (("09:00:00 AM", 0.05), ("10:30:00 AM", 0.25), ("EOD", 0.70))
+
+def make_addresses(count, seed=1) -> []:
+    """
+    Return a list of count distinct addresses, starting with the hub's.
+
+    Time complexity: O(count)
+    """
+
+    rng = random.Random(seed)
+    addresses = [HUB_ADDRESS]
+    for i in range(1, count):
+        addresses.append("{} {} ({})".format(
+            i, STREETS[rng.randrange(len(STREETS))],
+            84100 + rng.randrange(1, 100)))
+    return addresses
+
+def make_road_graph(vertex_count, seed=1) -> Graph:
+    """
+    Return a connected road graph with vertex_count vertices.
+
+    The vertices are laid out on a grid, joined to the next vertex in their
+    row and column by roads of random length, with a few diagonal shortcuts.
+    Vertex data are the addresses from make_addresses.
+
+    Time complexity: O(V)
+    """
+
+    rng = random.Random(seed)
+    addresses = make_addresses(vertex_count, seed)
+    width = max(1, math.ceil(math.sqrt(vertex_count)))
+    graph = Graph(vertex_count, lambda el : el.data)
+    for address in addresses:
+        vertex = Vertex(address)
+        graph.add_vertex(vertex)
+        graph.vertices.add(vertex)
+
+    vertices = graph.vertex_list
+    for i in range(vertex_count):
+        if (i + 1) % width != 0 and i + 1 < vertex_count:
+            graph.add_undirected_edge(vertices[i], vertices[i + 1],
+                                      round(rng.uniform(0.1, 1.0), 1))
+        if i + width < vertex_count:
+            graph.add_undirected_edge(vertices[i], vertices[i + width],
+                                      round(rng.uniform(0.1, 1.0), 1))
+            if ((i + 1) % width != 0 and i + width + 1 < vertex_count
+                    and rng.random() < 0.1):
+                graph.add_undirected_edge(vertices[i], vertices[i + width + 1],
+                                          round(rng.uniform(0.5, 1.4), 1))
+    return graph
+
+def make_packages(count, graph, seed=1) -> []:
+    """
+    Return a list of count packages with ids 1 to count.
+
+    Each package goes to a random vertex of the graph other than the hub
+    (vertex 0), with a deadline drawn from DEADLINES and no special notes.
+    The packages are linked to their vertices.
+
+    Time complexity: O(count)
+    """
+
+    rng = random.Random(seed)
+    deadline_names = [name for name, _ in DEADLINES]
+    deadline_weights = [weight for _, weight in DEADLINES]
+    deadline_minutes = {}
+    for name in deadline_names:
+        deadline_minutes[name] = convert_standard_time_to_minutes(name)
+
+    packages = []
+    vertex_count = len(graph.vertex_list)
+    for package_id in range(1, count + 1):
+        vertex = graph.vertex_list[rng.randrange(1, vertex_count)
+                                   if vertex_count > 1 else 0]
+        street, zip = vertex.data[:-1].split(" (")
+        deadline = rng.choices(deadline_names, deadline_weights)[0]
+        package = Package(package_id, street, "Salt Lake City", "UT", zip,
+                          deadline_minutes[deadline], rng.randint(1, 88), "")
+        package.vertex_id = vertex.id
+        packages.append(package)
+    return packages
+
+def write_map_file(filename, graph) -> None:
+    """
+    Write a graph as a map file.
+
+    The map file is a distance matrix with a row for each vertex; only the
+    lower triangle is read, and a weight of 0 means there is no road. The
+    file holds V^2 cells, so it is only practical for a few thousand
+    vertices.
+
+    Time complexity: O(V^2)
+    """
+
+    addresses = [vertex.data for vertex in graph.vertex_list]
+    with open(filename, "w", newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(["x"] + addresses)
+        for vertex in graph.vertex_list:
+            row = ["0"] * len(addresses)
+            for neighbour, weight in graph.neighbors(vertex):
+                row[neighbour.id] = str(weight)
+            writer.writerow([vertex.data] + row)
+
+def write_package_file(filename, packages) -> None:
+    """
+    Write packages as a package file.
+
+    Time complexity: O(n)
+    """
+
+    with open(filename, "w", newline='') as f:
+        writer = csv.writer(f)
+        for package in packages:
+            writer.writerow([package.package_id, package.address, package.city,
+                             package.state, package.zip,
+                             convert_minutes_to_standard_time(
+                                 package.delivery_deadline),
+                             package.mass, package.special_notes])
+
+def write_update_file(filename) -> None:
+    """Write a management update file with no updates."""
+
+    with open(filename, "w", newline='') as f:
+        f.write("time,action,package_id,address,city,state,zip,deadline,until\n")
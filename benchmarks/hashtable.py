@@ -0,0 +1,65 @@
+"""
+Benchmark the chained and open addressing hashtables.
+
+For increasing numbers of packages from benchmarks.generators, report the
+time taken to add every package and to look up a sample of package ids in
+each table. The chained table is created with the fixed size used in
+main.py so its buckets grow with the number of packages, as they did before
+the switch.
+
+Run from the repository root:
+python -m benchmarks.hashtable
+"""
+
+import random
+import time
+
+from benchmarks import generators
+from datastructures.HashTable import HashTable
+from datastructures.OpenAddressingHashTable import OpenAddressingHashTable
+
+def time_table(table, packages, lookups) -> (float, float):
+    """Return (add seconds, microseconds per lookup) for a table."""
+
+    start = time.perf_counter()
+    for package in packages:
+        table.add(package)
+    add_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for package_id in lookups:
+        table.get(package_id)
+    lookup_time = (time.perf_counter() - start) * 1000000 / len(lookups)
+    return add_time, lookup_time
+
+def run(counts=(10000, 100000, 1000000), lookups=1000, seed=1):
+    """
+    Print add and lookup times for each table.
+
+    Keyword arguments:
+    counts -- the numbers of packages to add.
+    lookups -- the number of ids to look up after adding.
+    seed -- seed for the random number generator.
+    """
+
+    rng = random.Random(seed)
+    graph = generators.make_road_graph(100, seed)
+    get_key = lambda el : el.package_id
+
+    print("Packages | Table | Add seconds | Lookup us")
+    for count in counts:
+        packages = generators.make_packages(count, graph, seed)
+        sample = [rng.randint(1, count) for _ in range(lookups)]
+
+        # Lookups in the chained table scan a bucket of count / 40 packages,
+        # so fewer lookups are made on large tables.
+        chained_sample = sample[:max(10, lookups * 10000 // count)]
+        tables = [("chained", HashTable(40, get_key), chained_sample),
+                  ("open addressing", OpenAddressingHashTable(40, get_key), sample)]
+        for name, table, ids in tables:
+            add_time, lookup_time = time_table(table, packages, ids)
+            print("{} | {} | {:0.3f} | {:0.2f}".format(
+                count, name, add_time, lookup_time))
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,80 @@
+"""
+Benchmark the route optimization strategies against the greedy route.
+
+For random sets of stops on the imported map, report the mileage saved by
+each distance strategy compared to the greedy (nearest neighbour) route and
+the time spent planning.
+
+Run from the repository root:
+python -m benchmarks.route_optimization
+"""
+
+import random
+import time
+
+from datastructures.Graph import Graph
+from utilities import imports
+from utilities import route_optimization
+
+def greedy_tour(start, stops, end, distance) -> []:
+    """Return the nearest neighbour tour through a list of stop ids."""
+
+    tour = [start]
+    remaining = list(stops)
+    while len(remaining) > 0:
+        index = 0
+        for i, v in enumerate(remaining):
+            if distance[tour[-1]][v] < distance[tour[-1]][remaining[index]]:
+                index = i
+        tour.append(remaining.pop(index))
+    tour.append(end)
+    return tour
+
+def run(stop_counts=(8, 16, 26), trials=20, seed=1):
+    """
+    Print mileage gained and planning time for each strategy.
+
+    Keyword arguments:
+    stop_counts -- the numbers of stops to plan routes through.
+    trials -- the number of random stop sets for each stop count.
+    seed -- seed for the random number generator.
+    """
+
+    graph = Graph(27, lambda el : el.data)
+    imports.import_distance_map_to_graph(graph, graph.vertices,
+                                         "map_import_data.csv")
+    distance = graph.distance_matrix()
+    hub = 0
+    candidates = [v.id for v in graph.vertex_list if v.id != hub]
+    rng = random.Random(seed)
+
+    print("Stops | Strategy | Greedy miles | Optimized miles | Saved"
+          + " | Planning ms")
+    for stop_count in stop_counts:
+        stop_count = min(stop_count, len(candidates))
+        stop_sets = [rng.sample(candidates, stop_count) for _ in range(trials)]
+        greedy = [greedy_tour(hub, stops, hub, distance) for stops in stop_sets]
+        greedy_miles = sum(route_optimization.route_length(t, distance)
+                           for t in greedy)
+
+        # The random stops have no deadlines, so the "deadline" strategy,
+        # which orders stops by deadline rather than distance, is skipped.
+        for strategy in route_optimization.STRATEGIES[1:]:
+            if strategy == "deadline":
+                continue
+            optimized_miles = 0
+            start = time.perf_counter()
+            for tour in greedy:
+                optimized = route_optimization.optimize_tour(
+                    tour, distance, strategy)
+                optimized_miles += route_optimization.route_length(
+                    optimized, distance)
+            elapsed = (time.perf_counter() - start) * 1000 / trials
+
+            saved = (greedy_miles - optimized_miles) / greedy_miles * 100
+            print("{} | {} | {:0.2f} | {:0.2f} | {:0.1f}% | {:0.3f}".format(
+                stop_count, strategy, greedy_miles / trials,
+                optimized_miles / trials, saved, elapsed))
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,77 @@
+"""
+Benchmark planning the routes of a large fleet serially and in parallel.
+
+Each truck gets a random set of stops on a road graph from
+benchmarks.generators. The routes are planned one after another with
+route_planning.plan_route and then with a RoutePlanner for each worker
+count; the parallel routes are checked against the serial ones.
+
+Run from the repository root:
+python -m benchmarks.route_planning
+"""
+
+import os
+import random
+import time
+
+from benchmarks import generators
+from utilities import route_planning
+
+def run(size=900, trucks=64, stops=40, strategy="2-opt+or-opt",
+        worker_counts=None, seed=1):
+    """
+    Print the time to plan every truck's route for each worker count.
+
+    Keyword arguments:
+    size -- the number of vertices in the road graph.
+    trucks -- the number of routes to plan.
+    stops -- the number of stops on each route.
+    strategy -- the route optimization strategy.
+    worker_counts -- the worker counts to time (default of 2, 4, ... up to
+                     the number of CPUs).
+    seed -- seed for the random number generator.
+    """
+
+    graph = generators.make_road_graph(size, seed)
+    graph.distance_matrix()
+    hub = 0
+    candidates = [v.id for v in graph.vertex_list if v.id != hub]
+    rng = random.Random(seed)
+    requests = [(hub, rng.sample(candidates, stops), hub, strategy, None, 0,
+                 None) for _ in range(trucks)]
+
+    if worker_counts == None:
+        worker_counts = []
+        count = 2
+        while count <= (os.cpu_count() or 1):
+            worker_counts.append(count)
+            count *= 2
+
+    start = time.perf_counter()
+    serial = [route_planning.plan_route(
+        start_id, stop_ids, end_id, graph.distance_matrix(),
+        graph.all_pairs_previous, strategy, time_budget=None)
+        for start_id, stop_ids, end_id, strategy, _, _, _ in requests]
+    serial_time = time.perf_counter() - start
+
+    print("Vertices: {}, trucks: {}, stops per truck: {}".format(
+        len(graph.vertex_list), trucks, stops))
+    print("Workers | Startup ms | Planning ms | Speedup | Matches serial")
+    print("serial | 0.0 | {:0.1f} | 1.00 | yes".format(serial_time * 1000))
+    for workers in worker_counts:
+        start = time.perf_counter()
+        # Without a time budget, the routes can be compared to the serial
+        # ones.
+        with route_planning.RoutePlanner(graph, workers,
+                                         time_budget=None) as planner:
+            # Start the workers before timing the planning.
+            planner.plan_routes(requests[:workers])
+            started = time.perf_counter()
+            paths = planner.plan_routes(requests)
+            planning_time = time.perf_counter() - started
+        print("{} | {:0.1f} | {:0.1f} | {:0.2f} | {}".format(
+            workers, (started - start) * 1000, planning_time * 1000,
+            serial_time / planning_time, "yes" if paths == serial else "NO"))
+
+if __name__ == '__main__':
+    run()
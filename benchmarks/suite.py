@@ -0,0 +1,532 @@
+"""
+Benchmark suite for the data structures, routing, and simulation.
+
+Every case is timed at each scale (the number of vertices or packages) on
+data from benchmarks.generators, and the results are saved as JSON named
+after the current commit (with "-dirty" added if the tree has uncommitted
+changes), so two commits can be compared:
+
+python -m benchmarks.suite
+python -m benchmarks.suite --compare benchmarks/results/<old commit>.json
+
+Run from the repository root. --scales and --cases pick a subset, for
+example "--scales 27 1000 --cases dijkstra route_planning". Each case
+prints its minimum and median time over a number of repeats (fewer at large
+scales); the setup of a case (building graphs, writing files) is not timed.
+
+Cases that need a map file or the all-pairs tables hold V^2 values, so they
+are only run up to MAX_MATRIX_VERTICES vertices; the full-day simulation at
+larger scales uses a map of that size with more packages and trucks.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import main
+from benchmarks import generators
+from datastructures.Graph import Graph
+from datastructures.HashTable import HashTable
+from datastructures.MinHeap import MinHeap
+from datastructures.OpenAddressingHashTable import OpenAddressingHashTable
+from datastructures.PriorityQueue import PriorityQueue
+from models.Scenario import Scenario
+from models.Truck import Truck
+from utilities import imports
+from utilities import route_planning
+from utilities import simulation
+
+SCALES = (27, 1000, 10000, 100000)
+MAX_MATRIX_VERTICES = 1000
+RESULTS_DIRECTORY = os.path.join("benchmarks", "results")
+
+# Number of times each case is timed at a scale, by largest scale.
+REPEATS = ((1000, 5), (10000, 3), (100000, 1))
+
+# Time ratio above which a case is reported as slower by compare.
+DEFAULT_THRESHOLD = 0.10
+
+class Fixtures:
+    """Generated data for one scale, built on first use and then shared."""
+
+    def __init__(self, scale, directory, seed=1):
+        """
+        Initialize the fixtures of a scale.
+
+        Keyword arguments:
+        scale -- the number of vertices and of packages.
+        directory -- the directory to write data files to.
+        seed -- seed for the generators.
+        """
+
+        self.scale = scale
+        self.directory = directory
+        self.seed = seed
+        self.cache = {}
+
+    def get(self, name, build):
+        """Return the fixture with a name, calling build() to make it once."""
+
+        if name not in self.cache:
+            self.cache[name] = build()
+        return self.cache[name]
+
+    def graph(self):
+        """Return a road graph with scale vertices and its CSRGraph built."""
+
+        def build():
+            graph = generators.make_road_graph(self.scale, self.seed)
+            graph.get_csr()
+            return graph
+        return self.get("graph", build)
+
+    def packages(self):
+        """Return scale packages addressed to the vertices of graph()."""
+
+        return self.get("packages", lambda : generators.make_packages(
+            self.scale, self.graph(), self.seed))
+
+    def path(self, filename):
+        """Return the path of a data file of this scale."""
+
+        return os.path.join(self.directory, str(self.scale) + "_" + filename)
+
+    def package_file(self):
+        """Return the path of a package file holding packages()."""
+
+        def build():
+            filename = self.path("packages.csv")
+            generators.write_package_file(filename, self.packages())
+            return filename
+        return self.get("package_file", build)
+
+    def map_graph(self):
+        """Return graph(), or a graph of MAX_MATRIX_VERTICES vertices if
+        graph() is larger."""
+
+        if self.scale <= MAX_MATRIX_VERTICES:
+            return self.graph()
+        return self.get("map_graph", lambda : generators.make_road_graph(
+            MAX_MATRIX_VERTICES, self.seed))
+
+    def map_file(self):
+        """Return the path of a map file holding map_graph()."""
+
+        def build():
+            filename = self.path("map.csv")
+            generators.write_map_file(filename, self.map_graph())
+            return filename
+        return self.get("map_file", build)
+
+    def map_package_file(self):
+        """Return the path of a package file of scale packages addressed to
+        the vertices of map_graph()."""
+
+        if self.scale <= MAX_MATRIX_VERTICES:
+            return self.package_file()
+
+        def build():
+            filename = self.path("map_packages.csv")
+            generators.write_package_file(filename, generators.make_packages(
+                self.scale, self.map_graph(), self.seed))
+            return filename
+        return self.get("map_package_file", build)
+
+    def update_file(self):
+        """Return the path of a management update file with no updates."""
+
+        def build():
+            filename = self.path("updates.csv")
+            generators.write_update_file(filename)
+            return filename
+        return self.get("update_file", build)
+
+def bench_hashtable_chained(fixtures):
+    """Add every package to a chained HashTable and look each one up."""
+
+    packages = fixtures.packages()
+
+    def run():
+        table = HashTable(len(packages), lambda el : el.package_id)
+        for package in packages:
+            table.add(package)
+        for package in packages:
+            table.get(package.package_id)
+    return run
+
+def bench_hashtable_open_addressing(fixtures):
+    """Add every package to an OpenAddressingHashTable and look each up."""
+
+    packages = fixtures.packages()
+
+    def run():
+        table = OpenAddressingHashTable(40, lambda el : el.package_id)
+        for package in packages:
+            table.add(package)
+        for package in packages:
+            table.get(package.package_id)
+    return run
+
+def bench_hashtable_strided(fixtures, stride=65536):
+    """
+    Add int keys a power of two apart to an OpenAddressingHashTable and look
+    each one up, so keys that share their low bits are timed too.
+    """
+
+    keys = [i * stride for i in range(len(fixtures.packages()))]
+
+    def run():
+        table = OpenAddressingHashTable(40, lambda el : el)
+        for key in keys:
+            table.add(key)
+        for key in keys:
+            table.get(key)
+    return run
+
+def bench_minheap(fixtures):
+    """Push every package onto a MinHeap by deadline and pop them all."""
+
+    packages = fixtures.packages()
+
+    def run():
+        heap = MinHeap(lambda el : el.delivery_deadline)
+        for package in packages:
+            heap.push(package)
+        while not heap.is_empty():
+            heap.pop()
+    return run
+
+def bench_minheap_bulk(fixtures):
+    """Build a MinHeap of every package at once and pop them 16 at a time."""
+
+    packages = fixtures.packages()
+
+    def run():
+        heap = MinHeap.from_iterable(packages, lambda el : el.delivery_deadline)
+        while not heap.is_empty():
+            heap.pop_n(16)
+    return run
+
+def bench_priority_queue(fixtures):
+    """Push the graph's vertices onto a PriorityQueue by distance, lower a
+    quarter of their distances, and pop them all."""
+
+    vertices = fixtures.graph().vertex_list
+    rng = random.Random(fixtures.seed)
+    initial = [rng.random() for _ in vertices]
+    lowered = rng.sample(vertices, len(vertices) // 4)
+
+    def run():
+        queue = PriorityQueue(len(vertices), lambda el : el.distance,
+                              lambda el : el.data)
+        for vertex in vertices:
+            vertex.distance = initial[vertex.id]
+            queue.push(vertex)
+        for vertex in lowered:
+            vertex.distance /= 2
+            queue.update_priority(vertex)
+        while not queue.is_empty():
+            queue.pop()
+    return run
+
+def bench_import_packages(fixtures):
+    """Import a package file into a hashtable and list."""
+
+    filename = fixtures.package_file()
+
+    def run():
+        imports.import_packages_to_hashtable(
+            OpenAddressingHashTable(40, lambda el : el.package_id), [],
+            filename)
+    return run
+
+def bench_import_map(fixtures):
+    """Import a map file and build the all-pairs tables."""
+
+    if fixtures.scale > MAX_MATRIX_VERTICES:
+        return None
+    filename = fixtures.map_file()
+
+    def run():
+        graph = Graph(fixtures.scale, lambda el : el.data)
+        imports.import_distance_map_to_graph(graph, graph.vertices, filename)
+    return run
+
+def bench_dijkstra(fixtures):
+    """Run Dijkstra's algorithm from the hub with dijkstra_shortest_path."""
+
+    graph = fixtures.graph()
+
+    def run():
+        graph.dijkstra_shortest_path(graph.vertex_list[0])
+    return run
+
+def bench_route_planning(fixtures, trucks=2, stops=16):
+    """
+    Plan the routes of trucks through random stops with plan_route.
+
+    The distance and previous rows of the hub and each stop are found with
+    Dijkstra's algorithm during setup, so no all-pairs tables are needed.
+    """
+
+    graph = fixtures.graph()
+    rng = random.Random(fixtures.seed)
+    candidates = range(1, len(graph.vertex_list))
+    stop_sets = [rng.sample(candidates, min(stops, len(candidates)))
+                 for _ in range(trucks)]
+
+    def build():
+        distance = {}
+        previous = {}
+        for source in {0}.union(*stop_sets):
+            distance[source], previous[source] = graph.dijkstra(
+                graph.vertex_list[source])
+        return distance, previous
+    distance, previous = fixtures.get(
+        "rows " + str(trucks) + " " + str(stops), build)
+
+    def run():
+        for stop_ids in stop_sets:
+            route_planning.plan_route(0, stop_ids, 0, distance, previous,
+                                      "2-opt+or-opt", time_budget=None)
+    return run
+
+def bench_rerouting(fixtures, stops=16, changes=16):
+    """
+    Insert stops into a route and remove them again with insert_stop and
+    remove_stop, the incremental alternative to planning it again.
+    """
+
+    graph = fixtures.graph()
+    rng = random.Random(fixtures.seed)
+    candidates = range(1, len(graph.vertex_list))
+    sample = rng.sample(candidates, min(stops + changes, len(candidates)))
+    stop_ids = sample[:stops]
+    change_ids = sample[stops:]
+
+    def build():
+        distance = {}
+        for source in [0] + sample:
+            distance[source] = graph.dijkstra(graph.vertex_list[source])[0]
+        return distance
+    distance = fixtures.get(
+        "reroute rows " + str(stops) + " " + str(changes), build)
+
+    def run():
+        tour = [0] + stop_ids + [0]
+        for stop in change_ids:
+            route_planning.insert_stop(tour, stop, distance)
+        for stop in change_ids:
+            route_planning.remove_stop(tour, stop)
+    return run
+
+def bench_delivery(fixtures):
+    """Load every package onto one truck and deliver them stop by stop."""
+
+    graph = fixtures.graph()
+    packages = fixtures.packages()
+    vertices = [graph.vertex_list[i]
+                for i in sorted({p.vertex_id for p in packages})]
+
+    def run():
+        truck = Truck(1, graph.vertex_list[0], len(packages))
+        for package in packages:
+            truck.add_package(package)
+        for vertex in vertices:
+            main.deliver_packages(truck, vertex, 0)
+    return run
+
+def bench_simulation(fixtures):
+    """
+    Run a full day of the simulation with run_scenario.
+
+    At scale 27 the imported data files are used. Otherwise a map of at
+    most MAX_MATRIX_VERTICES vertices is generated with scale packages, and
+    one truck for every 100 packages.
+    """
+
+    if fixtures.scale == 27:
+        scenario = Scenario("27", snapshot_filename=None)
+    else:
+        scenario = Scenario(str(fixtures.scale),
+                            truck_count=max(2, fixtures.scale // 100),
+                            map_filename=fixtures.map_file(),
+                            package_filename=fixtures.map_package_file(),
+                            update_filename=fixtures.update_file(),
+                            snapshot_filename=None)
+
+    def run():
+        simulation.run_scenario(scenario)
+    return run
+
+# Each case is a function that takes the Fixtures of a scale and returns a
+# function to time, or None if the case is not run at that scale.
+CASES = (("hashtable_chained", bench_hashtable_chained),
+         ("hashtable_open_addressing", bench_hashtable_open_addressing),
+         ("hashtable_strided", bench_hashtable_strided),
+         ("minheap", bench_minheap),
+         ("minheap_bulk", bench_minheap_bulk),
+         ("priority_queue", bench_priority_queue),
+         ("import_packages", bench_import_packages),
+         ("import_map", bench_import_map),
+         ("dijkstra", bench_dijkstra),
+         ("route_planning", bench_route_planning),
+         ("rerouting", bench_rerouting),
+         ("delivery", bench_delivery),
+         ("simulation", bench_simulation))
+
+def get_repeats(scale) -> int:
+    """Return the number of times to time a case at a scale."""
+
+    for largest_scale, repeats in REPEATS:
+        if scale <= largest_scale:
+            return repeats
+    return 1
+
+def get_commit() -> ():
+    """Return (commit hash, whether the tree has changes), or (None, None)."""
+
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"],
+                                capture_output=True, text=True,
+                                check=True).stdout.strip()
+        status = subprocess.run(["git", "status", "--porcelain",
+                                 "--untracked-files=no"],
+                                capture_output=True, text=True,
+                                check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+    return commit, status != ""
+
+def compare(old_results, new_results, threshold=DEFAULT_THRESHOLD) -> []:
+    """
+    Print how the minimum time of each case changed; return the slower ones.
+
+    Keyword arguments:
+    old_results -- results loaded from an earlier run's JSON file.
+    new_results -- results of this run, in the same format.
+    threshold -- ratio of the time change above which a case is slower.
+    """
+
+    old_times = {}
+    for result in old_results["results"]:
+        old_times[(result["case"], result["scale"])] = result["min_seconds"]
+
+    slower = []
+    print()
+    print("Compared with", old_results.get("commit"))
+    print("Case | Scale | Old ms | New ms | Change")
+    for result in new_results["results"]:
+        key = (result["case"], result["scale"])
+        if key not in old_times:
+            continue
+        old = old_times[key]
+        new = result["min_seconds"]
+        change = (new - old) / old if old > 0 else 0.0
+        flag = ""
+        if change > threshold:
+            flag = " slower"
+            slower.append(key)
+        elif change < -threshold:
+            flag = " faster"
+        print("{} | {} | {:0.3f} | {:0.3f} | {:+0.1f}%{}".format(
+            key[0], key[1], old * 1000, new * 1000, change * 100, flag))
+    return slower
+
+def run(scales=SCALES, cases=None, output=None, compare_with=None,
+        repeats=None, seed=1):
+    """
+    Time every case at every scale, print and save the results.
+
+    Keyword arguments:
+    scales -- the scales to run.
+    cases -- the names of the cases to run (default of all of them).
+    output -- the JSON file to write (default of
+              benchmarks/results/<commit>.json).
+    compare_with -- a JSON file from an earlier run to compare against.
+    repeats -- the number of times to time each case (default by scale).
+    seed -- seed for the generators.
+
+    Returns the results as written to the JSON file.
+    """
+
+    selected = [(name, bench) for name, bench in CASES
+                if cases == None or name in cases]
+
+    # Read the earlier results first, in case output is the same file.
+    old_results = None
+    if compare_with != None:
+        with open(compare_with) as f:
+            old_results = json.load(f)
+
+    commit, dirty = get_commit()
+    results = {
+        "commit": commit,
+        "dirty": dirty,
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": [],
+    }
+
+    print("Case | Scale | Repeats | Min ms | Median ms")
+    with tempfile.TemporaryDirectory() as directory:
+        for scale in scales:
+            fixtures = Fixtures(scale, directory, seed)
+            case_repeats = repeats or get_repeats(scale)
+            for name, bench in selected:
+                times = []
+                for _ in range(case_repeats):
+                    function = bench(fixtures)
+                    if function == None:
+                        break
+                    start = time.perf_counter()
+                    function()
+                    times.append(time.perf_counter() - start)
+                if len(times) == 0:
+                    continue
+
+                results["results"].append({
+                    "case": name,
+                    "scale": scale,
+                    "repeats": len(times),
+                    "min_seconds": min(times),
+                    "median_seconds": statistics.median(times),
+                })
+                print("{} | {} | {} | {:0.3f} | {:0.3f}".format(
+                    name, scale, len(times), min(times) * 1000,
+                    statistics.median(times) * 1000), flush=True)
+
+    if output == None:
+        os.makedirs(RESULTS_DIRECTORY, exist_ok=True)
+        name = commit or "results"
+        if dirty:
+            name += "-dirty"
+        output = os.path.join(RESULTS_DIRECTORY, name + ".json")
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print("Results saved to", output)
+
+    if old_results != None:
+        compare(old_results, results)
+    return results
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description="Time the benchmark cases and save the results as JSON.")
+    parser.add_argument("--scales", type=int, nargs="+", default=SCALES)
+    parser.add_argument("--cases", nargs="+",
+                        choices=[name for name, _ in CASES])
+    parser.add_argument("--repeats", type=int)
+    parser.add_argument("--output")
+    parser.add_argument("--compare", dest="compare_with")
+    arguments = parser.parse_args()
+    run(arguments.scales, arguments.cases, arguments.output,
+        arguments.compare_with, arguments.repeats)
@@ -0,0 +1,246 @@
+"""Module containing a compressed sparse row graph class."""
+
+from array import array
+
+from datastructures.IndexedMinHeap import IndexedMinHeap
+
+# NumPy is optional. Without it the arrays are still stored compactly, but
+# to_numpy is unavailable.
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+class CSRGraph:
+    """A directed graph stored in compressed sparse row form."""
+
+    def __init__(self, offsets, targets, weights):
+        """
+        Initialize the CSRGraph.
+
+        The edges leaving vertex id u are stored at indexes offsets[u] to
+        offsets[u + 1] - 1 of targets (the end vertex ids) and weights (the
+        edge weights). Each list is stored as a contiguous array, so a graph
+        takes 8 bytes per vertex and 16 bytes per edge instead of a list per
+        vertex and a dictionary entry per edge.
+
+        Use from_rows or from_edges to create a CSRGraph.
+
+        Keyword arguments:
+        offsets -- a sequence of vertex_count + 1 edge indexes.
+        targets -- a sequence of end vertex ids, one per edge.
+        weights -- a sequence of edge weights, one per edge.
+        """
+
+        self.offsets = array('q', offsets)
+        self.targets = array('q', targets)
+        self.weights = array('d', weights)
+        self.vertex_count = len(self.offsets) - 1
+
+    @classmethod
+    def from_rows(cls, rows):
+        """
+        Return a CSRGraph from a list, indexed by vertex id, of dictionaries
+        of end vertex id to edge weight.
+
+        The edges of each vertex keep the order of its dictionary, so
+        searches visit vertices in the order the edges were added.
+
+        Time complexity: O(V + E)
+        Space complexity: O(V + E)
+        """
+
+        offsets = array('q', [0])
+        targets = array('q')
+        weights = array('d')
+        for row in rows:
+            targets.extend(row.keys())
+            weights.extend(row.values())
+            offsets.append(len(targets))
+        return cls(offsets, targets, weights)
+
+    @classmethod
+    def from_edges(cls, vertex_count, sources, targets, weights):
+        """
+        Return a CSRGraph from parallel sequences of directed edges.
+
+        Large road networks can be loaded this way without creating Vertex
+        objects. Edges from the same vertex keep their given order.
+
+        Keyword arguments:
+        vertex_count -- the number of vertices (ids 0 to vertex_count - 1).
+        sources -- the start vertex id of each edge.
+        targets -- the end vertex id of each edge.
+        weights -- the weight of each edge.
+
+        Time complexity: O(V + E)
+        Space complexity: O(V + E)
+        """
+
+        # Count the edges leaving each vertex, then turn the counts into
+        # starting indexes.
+        offsets = [0] * (vertex_count + 1)
+        for source in sources:
+            offsets[source + 1] += 1
+        for u in range(vertex_count):
+            offsets[u + 1] += offsets[u]
+
+        # Place each edge at the next free index of its source's row.
+        next_index = offsets[:-1]
+        sorted_targets = [0] * len(sources)
+        sorted_weights = [0.0] * len(sources)
+        for i, source in enumerate(sources):
+            index = next_index[source]
+            sorted_targets[index] = targets[i]
+            sorted_weights[index] = weights[i]
+            next_index[source] = index + 1
+
+        return cls(offsets, sorted_targets, sorted_weights)
+
+    def get_edge_count(self):
+        """Return the number of directed edges in the graph."""
+
+        return len(self.targets)
+
+    def add_vertex(self):
+        """Add a vertex without edges; return its id."""
+
+        self.offsets.append(self.offsets[-1])
+        self.vertex_count += 1
+        return self.vertex_count - 1
+
+    def set_edge_weight(self, u, v, weight):
+        """
+        Set the weight of the edge from u to v, adding the edge after the
+        other edges leaving u if there is none; return the previous weight,
+        or None if the edge was added.
+
+        Time complexity: O(d) where d is the number of edges leaving u, or
+        O(V + E) to add an edge.
+        """
+
+        for k in range(self.offsets[u], self.offsets[u + 1]):
+            if self.targets[k] == v:
+                previous_weight = self.weights[k]
+                self.weights[k] = weight
+                return previous_weight
+
+        index = self.offsets[u + 1]
+        self.targets.insert(index, v)
+        self.weights.insert(index, weight)
+        for w in range(u + 1, self.vertex_count + 1):
+            self.offsets[w] += 1
+        return None
+
+    def neighbors(self, u):
+        """Return a list of (vertex id, weight) for the edges leaving u."""
+
+        start = self.offsets[u]
+        end = self.offsets[u + 1]
+        return list(zip(self.targets[start:end], self.weights[start:end]))
+
+    def edge_weight(self, u, v):
+        """
+        Return the weight of the edge from u to v; None if there is none.
+
+        Time complexity: O(d) where d is the number of edges leaving u.
+        """
+
+        for k in range(self.offsets[u], self.offsets[u + 1]):
+            if self.targets[k] == v:
+                return self.weights[k]
+        return None
+
+    def dijkstra(self, source, targets=None):
+        """
+        Return the shortest distances and previous vertex ids from a vertex.
+
+        Results are returned as two lists indexed by vertex id: the distance
+        from source (inf if unreachable) and the id of the previous vertex on
+        the path (-1 if none).
+
+        Keyword arguments:
+        source -- the id of the starting vertex.
+        targets -- an optional list of vertex ids. The search stops once all
+                   of them have been settled; distances to vertices that were
+                   not settled are then upper bounds.
+
+        Time complexity:
+        O(VLogV + ELogV)
+
+        Space complexity:
+        O(V)
+        """
+
+        vertex_count = self.vertex_count
+        distance = [float('inf')] * vertex_count
+        previous = [-1] * vertex_count
+        settled = [False] * vertex_count
+        distance[source] = 0
+
+        # Track how many targets still need to be settled (-1 if no targets
+        # were given, which never reaches 0).
+        is_target = None
+        remaining_targets = -1
+        if targets != None:
+            is_target = [False] * vertex_count
+            remaining_targets = 0
+            for target in targets:
+                if not is_target[target]:
+                    is_target[target] = True
+                    remaining_targets += 1
+            if remaining_targets == 0:
+                return distance, previous
+
+        offsets = self.offsets
+        edge_targets = self.targets
+        edge_weights = self.weights
+
+        unvisited_queue = IndexedMinHeap(vertex_count)
+        unvisited_queue.push(source, 0)
+
+        while not unvisited_queue.is_empty():
+
+            # Time complexity: O(LogV)
+            current_id, current_distance = unvisited_queue.pop()
+            settled[current_id] = True
+
+            # Stop early once every target has been settled.
+            if is_target != None and is_target[current_id]:
+                remaining_targets -= 1
+                if remaining_targets == 0:
+                    break
+
+            # Relax each edge leaving the current vertex.
+            # Time complexity: O(E)
+            for k in range(offsets[current_id], offsets[current_id + 1]):
+                adjacent_id = edge_targets[k]
+                if settled[adjacent_id]:
+                    continue
+
+                new_distance = current_distance + edge_weights[k]
+                if new_distance < distance[adjacent_id]:
+                    distance[adjacent_id] = new_distance
+                    previous[adjacent_id] = current_id
+
+                    # Time complexity: O(LogV)
+                    if unvisited_queue.contains(adjacent_id):
+                        unvisited_queue.decrease_key(adjacent_id, new_distance)
+                    else:
+                        unvisited_queue.push(adjacent_id, new_distance)
+
+        return distance, previous
+
+    def to_numpy(self):
+        """
+        Return (offsets, targets, weights) as NumPy arrays.
+
+        The arrays share memory with the graph and must not be modified.
+        Raises ImportError if NumPy is not installed.
+        """
+
+        if numpy == None:
+            raise ImportError("NumPy is required for CSRGraph.to_numpy.")
+        return (numpy.frombuffer(self.offsets, dtype=numpy.int64),
+                numpy.frombuffer(self.targets, dtype=numpy.int64),
+                numpy.frombuffer(self.weights, dtype=numpy.float64))
@@ -0,0 +1,29 @@
+"""Module containing an event queue class."""
+
+from datastructures.MinHeap import MinHeap
+
+class EventQueue(MinHeap):
+
+    def __init__(self):
+        """
+        Initialize the EventQueue object.
+
+        EventQueue inherits from MinHeap. Events are ordered by their priority
+        field; events with equal priorities are returned in the order they
+        were pushed.
+        """
+
+        super().__init__(lambda el : (el.priority, el.sequence))
+        self.count = 0
+
+    def push(self, event):
+        """
+        Add an event to the queue.
+
+        Time complexity: O(log n)
+        Space complexity: O(1)
+        """
+
+        event.sequence = self.count
+        self.count += 1
+        super().push(event)
@@ -1,9 +1,10 @@
 """Module containing Graph and Vertex classes."""
 
 from datastructures.HashTable import *
+from datastructures.OpenAddressingHashTable import OpenAddressingHashTable
 from datastructures.MinHeap import *
+from datastructures.CSRGraph import CSRGraph
 from datastructures.PriorityQueue import *
-from datastructures.Stack import *
 
 class Vertex:
     """A vertex in a graph."""
@@ -17,6 +18,8 @@ class Vertex:
         """
 
         self.data = data
+        # Dense integer id assigned when the vertex is added to a graph.
+        self.id = None
         self.distance = 0
         self.previous_vertex = None
 
@@ -35,19 +38,46 @@ class Graph:
         """
         Initialize the graph.
 
-        The graph will be created using a list of adjacent vertices for each
-        vertex and a dictionary of edges between vertices.
+        Each vertex is given a dense integer id (its index in vertex_list) so
+        that shortest path results can be stored in plain lists.
+
+        The edges are stored only once, in one of two forms. While the graph
+        is built one edge at a time, out_edges holds a dictionary of end
+        vertex id to weight for each vertex id, in the order the edges were
+        added. The first search packs them into a compressed sparse row
+        CSRGraph and drops out_edges; later edge changes patch the CSRGraph
+        in place. Edges added in bulk (see add_edges and load_csr) go
+        straight into the CSRGraph.
+
+        All-pairs shortest path tables are built lazily (or explicitly with
+        compute_all_pairs_shortest_paths) and kept up to date as edges change.
         """
-        self.adjacency_list = {}
-        self.edge_weights = {}
+        self.vertex_list = []
         self.size = size
 
+        # All-pairs shortest path tables indexed by vertex id.
+        # all_pairs_distance[u][v] is the shortest distance from u to v and
+        # all_pairs_previous[u][v] is the id of the vertex before v on that
+        # path (-1 if none). None when the tables need rebuilding.
+        self.all_pairs_distance = None
+        self.all_pairs_previous = None
+
+        # Edges by vertex id while the graph is built, or None once they are
+        # in csr, the CSRGraph of the edges.
+        self.out_edges = []
+        self.csr = None
+
+        # Increased whenever the vertices, edges, or shortest paths change,
+        # so results cached elsewhere (see route_planning.RouteCache) can
+        # tell they are out of date.
+        self.version = 0
+
         if get_key_function == None:
             self.get_key = lambda el : el.data
         else:
             self.get_key = get_key_function
 
-        self.vertices = HashTable(self.size, get_key_function)
+        self.vertices = OpenAddressingHashTable(self.size, get_key_function)
 
     def add_vertex(self, vertex):
         """
@@ -56,7 +86,14 @@ class Graph:
         Keyword arguments:
         vertex -- the vertex to add to the graph.
         """
-        self.adjacency_list[vertex] = []
+        vertex.id = len(self.vertex_list)
+        self.vertex_list.append(vertex)
+        if self.csr != None:
+            self.csr.add_vertex()
+        else:
+            self.out_edges.append({})
+        self.version += 1
+        self.invalidate_all_pairs()
 
     def add_directed_edge(self, from_v, to_v, weight=1.0):
         """
@@ -67,8 +104,23 @@ class Graph:
         to_v -- the end vertex.
         weight -- the distance or weight of the edge (default of one).
         """
-        self.adjacency_list[from_v].append(to_v)
-        self.edge_weights[(from_v,to_v)] = weight
+        if self.csr != None:
+            previous_weight = self.csr.set_edge_weight(from_v.id, to_v.id,
+                                                       weight)
+        else:
+            edges = self.out_edges[from_v.id]
+            previous_weight = edges.get(to_v.id)
+            edges[to_v.id] = weight
+        self.version += 1
+
+        # Keep the all-pairs tables valid. A shorter (or new) edge can only
+        # shorten paths, so the tables are patched in place. A longer edge may
+        # lengthen paths that used it, so the tables are rebuilt on next use.
+        if self.all_pairs_distance != None:
+            if previous_weight == None or weight <= previous_weight:
+                self.patch_all_pairs(from_v, to_v, weight)
+            else:
+                self.invalidate_all_pairs()
 
     def add_undirected_edge(self, vertex_1, vertex_2, weight=1.0):
         """
@@ -85,12 +137,110 @@ class Graph:
         self.add_directed_edge(vertex_1, vertex_2, weight)
         self.add_directed_edge(vertex_2, vertex_1, weight)
 
-    def dijkstra_shortest_path(self, start_vetex):
+    def add_edges(self, sources, targets, weights):
         """
-        Find the shortest distance from a starting vertex to all other vertices.
+        Add directed edges given as parallel sequences of vertex ids.
+
+        If the graph has no edges yet, they are packed straight into its
+        CSRGraph, without a dictionary entry per edge; edges leaving the same
+        vertex keep their given order. Otherwise they are added one at a
+        time with add_directed_edge.
+
+        Keyword arguments:
+        sources -- the id of the start vertex of each edge.
+        targets -- the id of the end vertex of each edge.
+        weights -- the weight of each edge.
+
+        Time complexity: O(V + E) into a graph without edges.
+        """
+
+        if self.get_edge_count() > 0:
+            for source, target, weight in zip(sources, targets, weights):
+                self.add_directed_edge(self.vertex_list[source],
+                                       self.vertex_list[target], weight)
+            return
+
+        self.csr = CSRGraph.from_edges(len(self.vertex_list), sources,
+                                       targets, weights)
+        self.out_edges = None
+        self.version += 1
+        self.invalidate_all_pairs()
+
+    def get_edge_count(self):
+        """Return the number of directed edges in the graph."""
+
+        if self.csr != None:
+            return self.csr.get_edge_count()
+        return sum(len(edges) for edges in self.out_edges)
+
+    def neighbors(self, vertex):
+        """
+        Return a list of (adjacent vertex, weight) for the edges leaving a
+        vertex, in the order they were added.
+        """
+
+        if self.csr != None:
+            edges = self.csr.neighbors(vertex.id)
+        else:
+            edges = self.out_edges[vertex.id].items()
+        return [(self.vertex_list[i], weight) for i, weight in edges]
+
+    def edge_weight(self, from_v, to_v):
+        """
+        Return the weight of the edge between two vertices; None if there is
+        no edge.
+
+        Time complexity: O(d) where d is the number of edges leaving from_v.
+        """
+
+        if self.csr != None:
+            return self.csr.edge_weight(from_v.id, to_v.id)
+        return self.out_edges[from_v.id].get(to_v.id)
+
+    @property
+    def adjacency_list(self):
+        """
+        Return a dictionary of each vertex to a list of its adjacent vertices.
+
+        The dictionary is built from the edges on each call and is not
+        changed by later edges; use neighbors to read a single vertex.
+
+        Time complexity: O(V + E)
+        """
+
+        return {vertex: [adjacent for adjacent, _ in self.neighbors(vertex)]
+                for vertex in self.vertex_list}
+
+    @property
+    def edge_weights(self):
+        """
+        Return a dictionary of each (vertex, vertex) edge to its weight.
+
+        The dictionary is built from the edges on each call and is not
+        changed by later edges; use edge_weight to read a single edge.
+
+        Time complexity: O(V + E)
+        """
+
+        return {(vertex, adjacent): weight for vertex in self.vertex_list
+                for adjacent, weight in self.neighbors(vertex)}
+
+    def dijkstra(self, start_vertex, targets=None):
+        """
+        Return the shortest distances and previous vertex ids from a vertex.
+
+        Unlike dijkstra_shortest_path, no vertex fields are modified, so any
+        number of searches can run at the same time. Results are returned as
+        two lists indexed by vertex id: the distance from start_vertex (inf if
+        unreachable) and the id of the previous vertex on the path (-1 if
+        none). The search runs on the graph's CSRGraph, so no dictionaries are
+        used while relaxing edges.
 
         Keyword arguments:
         start_vertex -- a vertex object.
+        targets -- an optional list of vertex ids. The search stops once all
+                   of them have been settled; distances to vertices that were
+                   not settled are then upper bounds.
 
         Time complexity:
         O(VLogV + ELogV)
@@ -99,42 +249,79 @@ class Graph:
         O(V)
         """
 
-        unvisited_queue = PriorityQueue(self.size, lambda el : el.distance, lambda el : el.data)
+        return self.get_csr().dijkstra(start_vertex.id, targets)
+
+    def get_csr(self):
+        """
+        Return the CSRGraph of the graph's edges.
+
+        The first call packs the edges added one at a time into a CSRGraph,
+        which then replaces them; after that the CSRGraph is kept up to date
+        as edges change.
 
-        # Set all vertices to a distance of infinity and a previous vertex
-        # of None. Set the start_vertex's distance to 0.
-        for vertex in self.adjacency_list:
-            vertex.distance = float('inf')
-            vertex.previous_vertex = None
-            if vertex == start_vetex:
-                vertex.distance = 0
-            unvisited_queue.push(vertex)
+        Time complexity: O(1), or O(V + E) on the first call.
+        """
 
-        # Time complexity: O(V)
-        while not unvisited_queue.is_empty():
+        if self.csr == None:
+            self.csr = CSRGraph.from_rows(self.out_edges)
+            self.out_edges = None
+        return self.csr
 
-            # Time complexity: O(LogV)
-            current_vertex = unvisited_queue.pop()
+    def load_csr(self, csr):
+        """
+        Add every edge of a CSRGraph to the graph.
 
-            # Go through each of the current_vertex's adjacent vertices checking
-            # to see if the path from the current vertex is shorter than the
-            # previously found paths.
-            # Time complexity: O(E)
-            for adjacent_vertex in self.adjacency_list[current_vertex]:
+        The graph's vertices must already be added, in the order of the
+        CSRGraph's vertex ids. If the graph has no edges yet, the CSRGraph
+        becomes its edge storage; otherwise its edges are added one at a
+        time.
 
-                edge_weight = self.edge_weights[(current_vertex,adjacent_vertex)]
-                new_distance = current_vertex.distance + edge_weight
+        Raises ValueError if the CSRGraph has a different number of vertices.
+
+        Time complexity: O(1) into a graph without edges, otherwise O(E).
+        """
+
+        if csr.vertex_count != len(self.vertex_list):
+            raise ValueError("The CSRGraph has {} vertices, not {}.".format(
+                csr.vertex_count, len(self.vertex_list)))
+
+        if self.get_edge_count() > 0:
+            for u, vertex in enumerate(self.vertex_list):
+                for adjacent_id, weight in csr.neighbors(u):
+                    self.add_directed_edge(
+                        vertex, self.vertex_list[adjacent_id], weight)
+            return
+
+        self.csr = csr
+        self.out_edges = None
+        self.version += 1
+        self.invalidate_all_pairs()
+
+    def dijkstra_shortest_path(self, start_vetex):
+        """
+        Find the shortest distance from a starting vertex to all other vertices.
+
+        Results are written into each vertex's distance and previous_vertex
+        fields for use with find_shortest_path.
+
+        Keyword arguments:
+        start_vertex -- a vertex object.
+
+        Time complexity:
+        O(VLogV + ELogV)
 
-                # If a shorter path is found, update the adjacent vertex's distance
-                # to the new distance and set it's previous pointer to the
-                # current vertex.
-                if new_distance < adjacent_vertex.distance:
-                    adjacent_vertex.distance = new_distance
-                    adjacent_vertex.previous_vertex = current_vertex
+        Space complexity:
+        O(V)
+        """
 
-                    # Time complexity: O(LogV)
-                    unvisited_queue.update_priority(adjacent_vertex)
+        distance, previous = self.dijkstra(start_vetex)
 
+        for vertex in self.vertex_list:
+            vertex.distance = distance[vertex.id]
+            if previous[vertex.id] == -1:
+                vertex.previous_vertex = None
+            else:
+                vertex.previous_vertex = self.vertex_list[previous[vertex.id]]
 
     def find_shortest_path(self, start_vetex, end_vertex):
         """
@@ -150,15 +337,167 @@ class Graph:
         if end_vertex.distance == float('inf'):
             return []
         else:
-            reverse = Stack()
+            path = [end_vertex]
             current_vertex = end_vertex
-            reverse.push(current_vertex)
             while current_vertex != start_vetex:
                 current_vertex = current_vertex.previous_vertex
-                reverse.push(current_vertex)
-
-            path = []
-            while not reverse.is_empty():
-                path.append(reverse.pop())
+                path.append(current_vertex)
+            path.reverse()
 
             return path
+
+    def build_path(self, previous, start_vertex, end_vertex):
+        """
+        Return a list of vertices from the start to end vertex.
+
+        Keyword arguments:
+        previous -- a list of previous vertex ids as returned by dijkstra.
+        start_vertex -- the starting vertex.
+        end_vertex -- the ending vertex.
+
+        Returns an empty list if the end vertex cannot be reached.
+
+        Time complexity: O(P) where P is the number of vertices on the path.
+        Space complexity: O(P)
+        """
+
+        path = [end_vertex]
+        current_id = end_vertex.id
+        while current_id != start_vertex.id:
+            current_id = previous[current_id]
+            if current_id == -1:
+                return []
+            path.append(self.vertex_list[current_id])
+        path.reverse()
+
+        return path
+
+    def compute_all_pairs_shortest_paths(self):
+        """
+        Build the all-pairs shortest distance and previous vertex tables.
+
+        Runs Dijkstra's algorithm once from every vertex and records the
+        results so distance and shortest_path lookups no longer need to run
+        Dijkstra's algorithm.
+
+        Time complexity: O(V * (VLogV + ELogV))
+        Space complexity: O(V^2)
+        """
+
+        self.all_pairs_distance = []
+        self.all_pairs_previous = []
+
+        for source in self.vertex_list:
+            distance, previous = self.dijkstra(source)
+            self.all_pairs_distance.append(distance)
+            self.all_pairs_previous.append(previous)
+
+    def set_all_pairs_shortest_paths(self, distance, previous):
+        """
+        Replace the all-pairs tables with tables calculated elsewhere.
+
+        Keyword arguments:
+        distance -- a list of lists of shortest distances indexed by id.
+        previous -- a list of lists of previous vertex ids indexed by id.
+        """
+
+        self.all_pairs_distance = distance
+        self.all_pairs_previous = previous
+        self.version += 1
+
+    def invalidate_all_pairs(self):
+        """Discard the all-pairs tables so they are rebuilt on next use."""
+
+        self.all_pairs_distance = None
+        self.all_pairs_previous = None
+
+    def patch_all_pairs(self, from_v, to_v, weight):
+        """
+        Update the all-pairs tables after an edge was added or shortened.
+
+        Every path x -> y that becomes shorter by using the edge
+        (from_v, to_v) is replaced by x -> from_v -> to_v -> y.
+
+        Keyword arguments:
+        from_v -- the starting vertex of the edge.
+        to_v -- the end vertex of the edge.
+        weight -- the new weight of the edge.
+
+        Time complexity: O(V^2)
+        Space complexity: O(1)
+        """
+
+        distance = self.all_pairs_distance
+        previous = self.all_pairs_previous
+        a = from_v.id
+        b = to_v.id
+
+        # If the edge is no shorter than the current path between its
+        # endpoints, no other path can be improved by it.
+        if weight >= distance[a][b]:
+            return
+
+        # Row b and column a are read while the tables are updated. Neither
+        # can change: improving distance[b][y] or distance[x][a] through the
+        # new edge would need a path from b back to a shorter than -weight,
+        # i.e. a negative cycle. Row a does change (x == a, where to_start is
+        # 0), but it is only read through distance[x][a], which stays 0.
+        vertex_count = len(self.vertex_list)
+        for x in range(vertex_count):
+            to_start = distance[x][a]
+            if to_start == float('inf'):
+                continue
+            for y in range(vertex_count):
+                new_distance = to_start + weight + distance[b][y]
+                if new_distance < distance[x][y]:
+                    distance[x][y] = new_distance
+                    if y == b:
+                        previous[x][y] = a
+                    else:
+                        previous[x][y] = previous[b][y]
+
+    def distance_matrix(self):
+        """
+        Return the all-pairs shortest distance table indexed by vertex id.
+
+        The tables are built first if needed.
+        """
+
+        if self.all_pairs_distance == None:
+            self.compute_all_pairs_shortest_paths()
+        return self.all_pairs_distance
+
+    def distance(self, from_v, to_v):
+        """
+        Return the shortest distance between two vertices.
+
+        Keyword arguments:
+        from_v -- the starting vertex.
+        to_v -- the end vertex.
+
+        Time complexity: O(1) once the all-pairs tables are built.
+        """
+
+        if self.all_pairs_distance == None:
+            self.compute_all_pairs_shortest_paths()
+        return self.all_pairs_distance[from_v.id][to_v.id]
+
+    def shortest_path(self, from_v, to_v):
+        """
+        Return a list of vertices on the shortest path between two vertices.
+
+        Uses the all-pairs tables instead of running Dijkstra's algorithm.
+        Returns an empty list if no path exists.
+
+        Keyword arguments:
+        from_v -- the starting vertex.
+        to_v -- the end vertex.
+
+        Time complexity: O(P) where P is the number of vertices on the path.
+        Space complexity: O(P)
+        """
+
+        if self.distance(from_v, to_v) == float('inf'):
+            return []
+
+        return self.build_path(self.all_pairs_previous[from_v.id], from_v, to_v)
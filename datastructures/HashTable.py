@@ -1,24 +1,24 @@
 """Module containing a hashtable class."""
 
-import math
-import hashlib
-
 from datastructures.Node import Node
 from datastructures.DoublyLinkedList import DoublyLinkedList
+from datastructures.KeyHasher import default_hasher
 
 class HashTable:
     """A hashtable implemented using chaining."""
 
-    def __init__(self, size=40, get_key_function=None):
+    def __init__(self, size=40, get_key_function=None, hasher=None):
         """Initialize the hashtable.
 
         Keyword arguments:
         size -- the number of indexes in the hashtable (default is 40).
         get_key_function -- function to identify the key of each item.
+        hasher -- the KeyHasher used to hash keys (default is shared).
         """
 
         self.table = []
         self.size = size
+        self.hasher = default_hasher if hasher == None else hasher
 
         # Default get_key function is the item itself.
         if get_key_function == None:
@@ -30,94 +30,81 @@ class HashTable:
         for i in range(self.size):
             self.table.append(DoublyLinkedList(get_key_function))
 
-    def add(self, item):
+    def add(self, item, key_hash=None):
         """
         Add an item to the hash table.
 
+        Keyword arguments:
+        item -- the item to be added.
+        key_hash -- the value of hash() for the item's key, if known.
+
         Time complexity: O(1)
         """
 
-        key = self.get_key(item)
-        index = self.hash(key)
+        index = self.get_index(self.get_key(item), key_hash)
         self.table[index].add(item)
 
     def hash(self, key):
         """
         Calculate a hash value for the provided key.
 
-        Binary mid square hash function is used for numbers and
-        multiplicative string hash function is used for stings.
+        The key is hashed by the shared KeyHasher, which mixes the bits of
+        numbers and caches the hashes of strings. The value is not reduced to
+        the number of buckets (see get_index), so it means the same as the
+        value of OpenAddressingHashTable.hash and can be passed to add, get,
+        remove, or get_all as key_hash to avoid hashing the same key again.
 
         Time complexity: O(1)
         """
 
-        # Mid square hash function for numbers.
-        if type(key) is int or type(key) is float:
-
-            squaredKey = key**2
-            # Bits required to represent self.size.
-            R = math.ceil(math.log2(self.size))
-            # Bits required to represent squaredKey.
-            bits_in_key = math.ceil(math.log2(squaredKey))
-
-            if bits_in_key < R:
-                return squaredKey % self.size
-            else:
-                # Right shift squaredKey by (bits_in_key - R) / 2
-                new_key = squaredKey >> math.floor((bits_in_key - R) / 2)
-                # All bits set to 1 for R bits.
-                mid_bits_on = 2**R - 1
-                # Bitwise AND.
-                extracted_bits = new_key & mid_bits_on
-                return extracted_bits % self.size
-
-        # Multiplicative string hash function for strings.
-        else:
-            hash = self.size * 7
+        return self.hasher.hash_key(key)
 
-            for char in key:
-                hash *= 11
-                hash += ord(char)
+    def get_index(self, key, key_hash):
+        """Return the index of the bucket for a key and its hash, if known."""
 
-            return hash % self.size
+        if key_hash == None:
+            key_hash = self.hasher.hash_key(key)
+        return key_hash % self.size
 
-    def get(self, key):
+    def get(self, key, key_hash=None):
         """
         Retrieve an item from the hashtable; return None if item not found.
 
         Keyword arguments:
         key -- the key of the item to be returned.
-
+        key_hash -- the value of hash(key), if known.
 
         Time complexity: O(1)
         """
 
-        index = self.hash(key)
+        index = self.get_index(key, key_hash)
         item = self.table[index].search(key)
         return item
 
-    def remove(self, key):
+    def remove(self, key, key_hash=None):
         """
         Remove and return an item from the hashtable; return None if not found.
 
         Keyword arguments:
         key -- the key of the item to be removed and returned.
+        key_hash -- the value of hash(key), if known.
 
         Time complexity: O(1)
         """
 
-        index = self.hash(key)
+        index = self.get_index(key, key_hash)
         item = self.table[index].remove(key)
         return item
 
-    def get_all(self, key):
+    def get_all(self, key, key_hash=None):
         """
         Return a linked list of all items in the table with a given key.
 
         Keyword arguments:
         key -- the key of the item(s) to be returned.
+        key_hash -- the value of hash(key), if known.
         """
 
-        index = self.hash(key)
+        index = self.get_index(key, key_hash)
         list = self.table[index].exhaustive_search(key)
         return list
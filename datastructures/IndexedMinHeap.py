@@ -0,0 +1,188 @@
+"""Module containing an indexed min heap class."""
+
+class IndexedMinHeap:
+    """A min heap of integer ids that supports changing the key of an id."""
+
+    def __init__(self, capacity):
+        """
+        Initialize the IndexedMinHeap object.
+
+        The heap holds integer ids from 0 to capacity - 1, each with a numeric
+        key. The key and the heap position of each id are stored in flat lists
+        indexed by the id, so finding an id in the heap needs no hashing and
+        decrease_key runs in O(log n). Ids with equal keys are popped in order
+        of id, so results do not depend on the order ids were pushed.
+
+        Keyword arguments:
+        capacity -- the number of ids that can be stored in the heap.
+        """
+
+        self.heap = []
+        self.keys = [0] * capacity
+        # Index of each id in heap, or -1 if the id is not in the heap.
+        self.positions = [-1] * capacity
+
+    def push(self, id, key):
+        """
+        Add an id to the heap, or change its key if it is already there.
+
+        Time complexity: O(log n)
+        Space complexity: O(1)
+        """
+
+        if self.positions[id] != -1:
+            self.change_key(id, key)
+            return
+
+        self.keys[id] = key
+        self.heap.append(id)
+        self.positions[id] = len(self.heap) - 1
+        self.percolate_up(len(self.heap) - 1)
+
+    def pop(self):
+        """
+        Remove the id with the smallest key; return (id, key).
+
+        Returns None if the heap is empty.
+
+        Time complexity: O(log n)
+        Space complexity: O(1)
+        """
+
+        heap = self.heap
+        if len(heap) == 0:
+            return None
+
+        min_id = heap[0]
+        last_id = heap.pop()
+        self.positions[min_id] = -1
+        if len(heap) > 0:
+            heap[0] = last_id
+            self.positions[last_id] = 0
+            self.percolate_down(0)
+        return min_id, self.keys[min_id]
+
+    def peek(self):
+        """Return (id, key) of the smallest key without removing it."""
+
+        if len(self.heap) == 0:
+            return None
+        return self.heap[0], self.keys[self.heap[0]]
+
+    def decrease_key(self, id, key):
+        """
+        Lower the key of an id that is in the heap.
+
+        Time complexity: O(log n)
+        Space complexity: O(1)
+        """
+
+        self.keys[id] = key
+        self.percolate_up(self.positions[id])
+
+    def change_key(self, id, key):
+        """
+        Change the key of an id that is in the heap, up or down.
+
+        Time complexity: O(log n)
+        Space complexity: O(1)
+        """
+
+        old_key = self.keys[id]
+        self.keys[id] = key
+        if key < old_key:
+            self.percolate_up(self.positions[id])
+        else:
+            self.percolate_down(self.positions[id])
+
+    def contains(self, id):
+        """Return whether or not an id is in the heap."""
+
+        return self.positions[id] != -1
+
+    def get_key(self, id):
+        """Return the key of an id that is (or was last) in the heap."""
+
+        return self.keys[id]
+
+    def percolate_up(self, index):
+        """
+        Move the id at an index up the heap to its proper location.
+
+        Rather than swapping at each level, parents are shifted down into the
+        hole and the id is written once at its final position.
+
+        Time complexity: O(log n)
+        Space complexity: O(1)
+        """
+
+        heap = self.heap
+        keys = self.keys
+        positions = self.positions
+
+        id = heap[index]
+        key = keys[id]
+        while index > 0:
+            parent = (index - 1) >> 1
+            parent_id = heap[parent]
+            parent_key = keys[parent_id]
+            if key < parent_key or (key == parent_key and id < parent_id):
+                heap[index] = parent_id
+                positions[parent_id] = index
+                index = parent
+            else:
+                break
+        heap[index] = id
+        positions[id] = index
+
+    def percolate_down(self, index):
+        """
+        Move the id at an index down the heap to its proper location.
+
+        Time complexity: O(log n)
+        Space complexity: O(1)
+        """
+
+        heap = self.heap
+        keys = self.keys
+        positions = self.positions
+        length = len(heap)
+
+        id = heap[index]
+        key = keys[id]
+        while True:
+            child = index * 2 + 1
+            if child >= length:
+                break
+
+            # Pick the smaller of the two children.
+            child_id = heap[child]
+            child_key = keys[child_id]
+            right = child + 1
+            if right < length:
+                right_id = heap[right]
+                right_key = keys[right_id]
+                if right_key < child_key or (right_key == child_key
+                                             and right_id < child_id):
+                    child = right
+                    child_id = right_id
+                    child_key = right_key
+
+            if child_key < key or (child_key == key and child_id < id):
+                heap[index] = child_id
+                positions[child_id] = index
+                index = child
+            else:
+                break
+        heap[index] = id
+        positions[id] = index
+
+    def is_empty(self):
+        """Return whether or not the heap is empty."""
+
+        return len(self.heap) == 0
+
+    def get_length(self):
+        """Return the number of ids in the heap."""
+
+        return len(self.heap)
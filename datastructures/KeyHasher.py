@@ -0,0 +1,101 @@
+"""Module containing a key hashing class shared by the hashtables."""
+
+# Hash values are kept to 64 bits.
+MASK = 0xFFFFFFFFFFFFFFFF
+
+# Odd 64-bit constant (2^64 divided by the golden ratio) used to mix ints.
+MULTIPLIER = 0x9E3779B97F4A7C15
+
+# Constants of the splitmix64 finalizer, which spreads every input bit over
+# every output bit.
+MIX_1 = 0xBF58476D1CE4E5B9
+MIX_2 = 0x94D049BB133111EB
+
+# FNV-1a constants used to hash strings.
+FNV_OFFSET = 0xCBF29CE484222325
+FNV_PRIME = 0x100000001B3
+
+class KeyHasher:
+    """Calculates 64-bit hash values for int, float, and string keys."""
+
+    def __init__(self, max_cache_size=100000):
+        """
+        Initialize the KeyHasher.
+
+        The hash of each string key is cached, so keys that are looked up
+        repeatedly (such as vertex addresses) are only hashed once.
+
+        Keyword arguments:
+        max_cache_size -- the number of string hashes to keep before the
+                          cache is cleared (default is 100000).
+        """
+
+        self.cache = {}
+        self.max_cache_size = max_cache_size
+
+    def hash_int(self, key):
+        """
+        Return the hash value of an int.
+
+        The key is multiplied by a large odd constant and then mixed with the
+        splitmix64 finalizer. The multiplication alone only carries low bits
+        upwards, so the low bits of the product depend only on the low bits
+        of the key: keys with a power of two stride (such as 1024, 2048, ...)
+        would share their low bits and collide in a table whose size is a
+        power of two. After the finalizer every bit of the hash depends on
+        every bit of the key, so any bits can be used as a table index.
+
+        Time complexity: O(1)
+        """
+
+        hash = (key * MULTIPLIER) & MASK
+        hash = ((hash ^ (hash >> 30)) * MIX_1) & MASK
+        hash = ((hash ^ (hash >> 27)) * MIX_2) & MASK
+        return hash ^ (hash >> 31)
+
+    def hash_string(self, key):
+        """
+        Return the hash value of a string.
+
+        Time complexity: O(1) if the key is cached, otherwise O(k) for a
+        string of length k.
+        """
+
+        hash = self.cache.get(key)
+        if hash != None:
+            return hash
+
+        hash = FNV_OFFSET
+        for char in key:
+            hash = ((hash ^ ord(char)) * FNV_PRIME) & MASK
+
+        if len(self.cache) >= self.max_cache_size:
+            self.cache.clear()
+        self.cache[key] = hash
+        return hash
+
+    def hash_key(self, key):
+        """
+        Return the hash value of a key.
+
+        Floats holding whole numbers hash the same as the equal int.
+
+        Time complexity: O(1) for numbers and cached strings.
+        """
+
+        # The int case is repeated here rather than calling hash_int, since
+        # this is called for every lookup.
+        if type(key) is int:
+            hash = (key * MULTIPLIER) & MASK
+            hash = ((hash ^ (hash >> 30)) * MIX_1) & MASK
+            hash = ((hash ^ (hash >> 27)) * MIX_2) & MASK
+            return hash ^ (hash >> 31)
+        elif type(key) is float:
+            if key.is_integer():
+                return self.hash_int(int(key))
+            return self.hash_int(int(key * 1000003))
+        else:
+            return self.hash_string(key)
+
+# Hasher shared by all hashtables so string hashes are cached once.
+default_hasher = KeyHasher()
@@ -0,0 +1,184 @@
+"""Module containing a min heap class with precomputed keys."""
+
+from datastructures.MinHeap import MinHeap
+
+class KeyedMinHeap(MinHeap):
+
+    def __init__(self, get_key_function=None):
+        """
+        Initialize the KeyedMinHeap object.
+
+        KeyedMinHeap inherits from MinHeap. The key of each item is computed
+        once, when the item is added, and kept in a list parallel to the
+        items, so comparisons read the stored keys instead of calling
+        get_key. Keys may be composite, such as a tuple compared field by
+        field. If an item's fields change, call update to compute its key
+        again and move it.
+
+        The index of each item is kept in a dictionary by the item's id, so
+        update finds an item in O(1). An item may only be in the heap once.
+
+        Keyword arguments:
+        get_key_function -- used to compute the priority of an item.
+        """
+
+        super().__init__(get_key_function)
+        self.keys = []
+        self.positions = {}
+
+    def push(self, item):
+        """
+        Add an item to the heap.
+
+        Time complexity: O(log n)
+        Space complexity: O(1)
+        """
+
+        self.list.append(item)
+        self.keys.append(self.get_key(item))
+        self.positions[id(item)] = len(self.list) - 1
+        self.percolate_up(len(self.list) - 1)
+
+    def pop(self):
+        """
+        Remove the minimum item from the heap.
+
+        Time complexity: O(log n)
+        Space complexity: O(1)
+        """
+
+        if len(self.list) == 0:
+            return None
+        min_item = self.list[0]
+        del self.positions[id(min_item)]
+        last_item = self.list.pop()
+        last_key = self.keys.pop()
+        if len(self.list) > 0:
+            self.list[0] = last_item
+            self.keys[0] = last_key
+            self.percolate_down(0)
+        return min_item
+
+    def percolate_up(self, index):
+        """
+        Percolate an item up the heap to it's proper location.
+
+        Parents are shifted down into the hole, and the item and its key are
+        written once at their final index.
+
+        Time complexity: O(log n)
+        Space complexity: O(1)
+        """
+
+        items = self.list
+        keys = self.keys
+        positions = self.positions
+        item = items[index]
+        key = keys[index]
+        while index > 0:
+            parent = (index - 1) >> 1
+            if key < keys[parent]:
+                items[index] = items[parent]
+                keys[index] = keys[parent]
+                positions[id(items[index])] = index
+                index = parent
+            else:
+                break
+        items[index] = item
+        keys[index] = key
+        positions[id(item)] = index
+
+    def percolate_down(self, index):
+        """
+        Percolate an item down the heap to it's proper location.
+
+        Time complexity: O(log n)
+        Space complexity: O(1)
+        """
+
+        items = self.list
+        keys = self.keys
+        positions = self.positions
+        length = len(items)
+        item = items[index]
+        key = keys[index]
+        while True:
+            child = index * 2 + 1
+            if child >= length:
+                break
+            if child + 1 < length and keys[child + 1] < keys[child]:
+                child += 1
+            if keys[child] < key:
+                items[index] = items[child]
+                keys[index] = keys[child]
+                positions[id(items[index])] = index
+                index = child
+            else:
+                break
+        items[index] = item
+        keys[index] = key
+        positions[id(item)] = index
+
+    def swap(self, i, j):
+        """Swap two elements and their keys."""
+
+        self.list[i], self.list[j] = self.list[j], self.list[i]
+        self.keys[i], self.keys[j] = self.keys[j], self.keys[i]
+        self.positions[id(self.list[i])] = i
+        self.positions[id(self.list[j])] = j
+
+    def contains(self, item):
+        """Return whether an item is in the heap."""
+
+        return id(item) in self.positions
+
+    def update(self, item):
+        """
+        Compute the key of an item in the heap again and restore heap order.
+
+        Use after a field the key depends on has changed, such as a package's
+        deadline or address. Returns False if the item is not in the heap.
+
+        Time complexity: O(log n)
+        Space complexity: O(1)
+        """
+
+        index = self.positions.get(id(item))
+        if index == None:
+            return False
+        old_key = self.keys[index]
+        self.keys[index] = self.get_key(item)
+        if self.keys[index] < old_key:
+            self.percolate_up(index)
+        else:
+            self.percolate_down(index)
+        return True
+
+    def heapify(self, array):
+        """
+        Replace the items in the heap with an array and restore heap order.
+
+        Time complexity: O(n)
+        Space complexity: O(n) for the keys and indexes.
+        """
+
+        self.list = array
+        self.keys = [self.get_key(item) for item in array]
+        self.positions = {id(item): index for index, item in enumerate(array)}
+        for index in range(len(self.list) // 2 - 1, -1, -1):
+            self.percolate_down(index)
+        return self
+
+    def push_many(self, items):
+        """
+        Add a list of items to the heap.
+
+        Time complexity: O(min(n + k, k log(n + k)))
+        Space complexity: O(k)
+        """
+
+        if len(items) >= len(self.list):
+            self.heapify(self.list + list(items))
+        else:
+            for item in items:
+                self.push(item)
@@ -0,0 +1,76 @@
+"""Module containing a bounded least recently used cache class."""
+
+from collections import OrderedDict
+
+class LRUCache:
+    """A mapping of keys to values holding at most capacity entries."""
+
+    def __init__(self, capacity=1024):
+        """
+        Initialize the LRUCache object.
+
+        Entries are kept in an OrderedDict from least to most recently used.
+        A lookup that finds its key moves the entry to the end, and adding an
+        entry to a full cache removes the entry at the front. The numbers of
+        hits, misses, and evictions are counted.
+
+        Keyword arguments:
+        capacity -- the largest number of entries kept (default is 1024).
+        """
+
+        if capacity < 1:
+            raise ValueError("An LRUCache needs a capacity of at least 1.")
+        self.capacity = capacity
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        """
+        Return the value of a key, or default if the key is not cached.
+
+        Time complexity: O(1)
+        """
+
+        value = self.entries.get(key, self)
+        if value is self:
+            self.misses += 1
+            return default
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        """
+        Add or replace the value of a key, evicting the least recently used
+        entry if the cache is full.
+
+        Time complexity: O(1)
+        """
+
+        if key in self.entries:
+            self.entries.move_to_end(key)
+        elif len(self.entries) >= self.capacity:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+        self.entries[key] = value
+
+    def clear(self):
+        """Remove every entry; the statistics are kept."""
+
+        self.entries.clear()
+
+    def get_stats(self):
+        """Return a dictionary of the cache's size and statistics."""
+
+        lookups = self.hits + self.misses
+        return {"entries": len(self.entries), "capacity": self.capacity,
+                "hits": self.hits, "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups > 0 else 0.0}
+
+    def get_length(self):
+        """Return the number of entries in the cache."""
+
+        return len(self.entries)
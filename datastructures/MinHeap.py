@@ -117,31 +117,87 @@ class MinHeap:
         self.list[i] = self.list[j]
         self.list[j] = temp
 
+    def update(self, item):
+        """
+        Restore the heap order after the key of an item in the heap changed.
+
+        Returns False if the item is not in the heap.
+
+        Time complexity: O(n) to find the item, O(log n) to move it.
+        Space complexity: O(1)
+        """
+
+        for index, element in enumerate(self.list):
+            if element is item:
+                self.percolate_up(index)
+                self.percolate_down(index)
+                return True
+        return False
+
     def heapify(self, array):
         """
-        Turn an array into a min heap.
+        Replace the items in the heap with an array and restore heap order.
 
-        Turn an array into a min heap by running percolate_up on all leaf nodes
-        in the min heap.
+        Runs percolate_down on every node that has children, from the last
+        one up to the root, which takes O(n) rather than the O(n log n) of
+        pushing the items one at a time. The array becomes the heap's list.
 
         Keyword arguments:
-        array -- an array to turn into a heap.
+        array -- a list of items to turn into a heap.
 
         Time complexity: O(n)
         Space complexity: O(1)
         """
 
-        heap = MinHeap()
-        heap.list = array
+        self.list = array
+        for index in range(len(self.list) // 2 - 1, -1, -1):
+            self.percolate_down(index)
+        return self
+
+    @classmethod
+    def from_iterable(cls, iterable, get_key_function=None):
+        """
+        Return a new heap containing the items of an iterable.
+
+        Time complexity: O(n)
+        Space complexity: O(n)
+        """
+
+        return cls(get_key_function).heapify(list(iterable))
+
+    def push_many(self, items):
+        """
+        Add a list of items to the heap.
+
+        If there are at least as many new items as items in the heap, the
+        items are appended and the whole heap is rebuilt in O(n + k).
+        Otherwise each item is pushed in O(log n).
+
+        Time complexity: O(min(n + k, k log(n + k)))
+        Space complexity: O(1)
+        """
+
+        if len(items) >= len(self.list):
+            self.list.extend(items)
+            self.heapify(self.list)
+        else:
+            for item in items:
+                self.push(item)
+
+    def pop_n(self, k):
+        """
+        Remove and return a list of the k smallest items, smallest first.
+
+        Returns fewer than k items if the heap runs out.
+
+        Time complexity: O(k log n)
+        Space complexity: O(k)
+        """
 
-        if len(heap.list) > 0:
-            height = math.floor(math.log2(len(heap.list)))
-            leaves_if_full = 2**height
-            nodes_if_full = leaves_if_full * 2 - 1
-            first_leaf = nodes_if_full - leaves_if_full
-            for index in range(first_leaf,len(heap.list)):
-                heap.percolate_up(index)
-        return heap
+        items = []
+        while len(items) < k and len(self.list) > 0:
+            items.append(self.pop())
+        return items
 
     def is_empty(self):
         """Return whether or not the heap is empty."""
@@ -0,0 +1,215 @@
+"""Module containing an open addressing hashtable class."""
+
+from datastructures.Node import Node
+from datastructures.KeyHasher import default_hasher
+
+# Markers for slots that have never been used and slots whose item was removed.
+EMPTY = object()
+DELETED = object()
+
+class OpenAddressingHashTable:
+    """A hashtable implemented using open addressing with linear probing."""
+
+    def __init__(self, size=40, get_key_function=None, max_load_factor=0.7,
+                 hasher=None):
+        """Initialize the hashtable.
+
+        Items are stored in parallel lists of hashes, keys, and items rather
+        than in linked lists. The number of slots is a power of two and is
+        doubled whenever the share of used slots (including removed items)
+        would exceed max_load_factor, so lookups stay O(1) however many items
+        are added.
+
+        Keyword arguments:
+        size -- the number of items expected (default is 40).
+        get_key_function -- function to identify the key of each item.
+        max_load_factor -- the largest share of slots in use before resizing.
+        hasher -- the KeyHasher used to hash keys (default is shared).
+        """
+
+        # Default get_key function is the item's data field.
+        if get_key_function == None:
+            self.get_key = lambda el : el.data
+        else:
+            self.get_key = get_key_function
+
+        self.max_load_factor = max_load_factor
+        self.hasher = default_hasher if hasher == None else hasher
+        self.count = 0
+        self.used = 0
+
+        capacity = 8
+        while capacity * max_load_factor < size:
+            capacity *= 2
+        self.allocate(capacity)
+
+    def allocate(self, capacity):
+        """Replace the slots with capacity empty slots."""
+
+        self.capacity = capacity
+        self.mask = capacity - 1
+        self.hashes = [0] * capacity
+        self.keys = [EMPTY] * capacity
+        self.items = [None] * capacity
+        self.used = self.count
+
+    def hash(self, key):
+        """
+        Calculate a hash value for the provided key.
+
+        The key is hashed by the shared KeyHasher, which mixes the bits of
+        numbers and caches the hashes of strings. The value is not reduced to
+        the number of slots, so it stays valid when the table is resized and
+        can be passed to add, get, remove, or get_all as key_hash to avoid
+        hashing the same key again.
+
+        Time complexity: O(1)
+        """
+
+        return self.hasher.hash_key(key)
+
+    def resize(self, capacity):
+        """
+        Move all items into a new list of slots.
+
+        Time complexity: O(n)
+        """
+
+        hashes = self.hashes
+        keys = self.keys
+        items = self.items
+        self.allocate(capacity)
+
+        for i in range(len(keys)):
+            key = keys[i]
+            if key is not EMPTY and key is not DELETED:
+                index = hashes[i] & self.mask
+                while self.keys[index] is not EMPTY:
+                    index = (index + 1) & self.mask
+                self.hashes[index] = hashes[i]
+                self.keys[index] = key
+                self.items[index] = items[i]
+
+    def find(self, key, key_hash):
+        """Return the slot index of an item with a given key; -1 if not found."""
+
+        index = key_hash & self.mask
+        while True:
+            slot_key = self.keys[index]
+            if slot_key is EMPTY:
+                return -1
+            if (slot_key is not DELETED and self.hashes[index] == key_hash
+                    and slot_key == key):
+                return index
+            index = (index + 1) & self.mask
+
+    def add(self, item, key_hash=None):
+        """
+        Add an item to the hash table.
+
+        Keyword arguments:
+        item -- the item to be added.
+        key_hash -- the value of hash() for the item's key, if known.
+
+        Time complexity: O(1) amortized.
+        """
+
+        # Grow the table if it is getting full, or clear out removed items if
+        # they are taking up most of the used slots.
+        if (self.used + 1) > self.capacity * self.max_load_factor:
+            if self.count + 1 > self.capacity * self.max_load_factor / 2:
+                self.resize(self.capacity * 2)
+            else:
+                self.resize(self.capacity)
+
+        key = self.get_key(item)
+        if key_hash == None:
+            key_hash = self.hash(key)
+
+        index = key_hash & self.mask
+        while self.keys[index] is not EMPTY and self.keys[index] is not DELETED:
+            index = (index + 1) & self.mask
+
+        if self.keys[index] is EMPTY:
+            self.used += 1
+        self.hashes[index] = key_hash
+        self.keys[index] = key
+        self.items[index] = item
+        self.count += 1
+
+    def get(self, key, key_hash=None):
+        """
+        Retrieve an item from the hashtable; return None if item not found.
+
+        Keyword arguments:
+        key -- the key of the item to be returned.
+        key_hash -- the value of hash(key), if known.
+
+        Time complexity: O(1)
+        """
+
+        if key_hash == None:
+            key_hash = self.hash(key)
+        index = self.find(key, key_hash)
+        if index == -1:
+            return None
+        return self.items[index]
+
+    def remove(self, key, key_hash=None):
+        """
+        Remove and return an item from the hashtable; return None if not found.
+
+        Keyword arguments:
+        key -- the key of the item to be removed and returned.
+        key_hash -- the value of hash(key), if known.
+
+        Time complexity: O(1)
+        """
+
+        if key_hash == None:
+            key_hash = self.hash(key)
+        index = self.find(key, key_hash)
+        if index == -1:
+            return None
+
+        item = self.items[index]
+        self.keys[index] = DELETED
+        self.items[index] = None
+        self.count -= 1
+        return item
+
+    def get_all(self, key, key_hash=None):
+        """
+        Return a linked list of all items in the table with a given key.
+
+        Returns the first Node of the list, or None if no items were found.
+
+        Keyword arguments:
+        key -- the key of the item(s) to be returned.
+        key_hash -- the value of hash(key), if known.
+        """
+
+        if key_hash == None:
+            key_hash = self.hash(key)
+        node = None
+        runner = None
+
+        index = key_hash & self.mask
+        while self.keys[index] is not EMPTY:
+            slot_key = self.keys[index]
+            if (slot_key is not DELETED and self.hashes[index] == key_hash
+                    and slot_key == key):
+                if node == None:
+                    node = Node(self.items[index])
+                    runner = node
+                else:
+                    runner.next = Node(self.items[index])
+                    runner = runner.next
+            index = (index + 1) & self.mask
+
+        return node
+
+    def get_length(self):
+        """Return the number of items in the hashtable."""
+
+        return self.count
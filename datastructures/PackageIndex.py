@@ -0,0 +1,109 @@
+"""Module containing a package container indexed by id and destination."""
+
+class PackageIndex:
+    """Packages indexed by package id and by destination vertex id."""
+
+    def __init__(self):
+        """
+        Initialize an empty PackageIndex.
+
+        Packages are kept in a dictionary by id and, for each destination
+        vertex, in a dictionary by id of the packages going there. Both keep
+        insertion order, so iterating over the index visits packages in the
+        order they were added.
+        """
+
+        self.by_id = {}
+        self.by_vertex = {}
+
+    def add(self, package):
+        """
+        Add a package to the index.
+
+        Time complexity: O(1)
+        """
+
+        self.by_id[package.package_id] = package
+        self.add_to_vertex(package)
+
+    def add_to_vertex(self, package):
+        """Add a package to the packages going to its vertex."""
+
+        packages_at_vertex = self.by_vertex.get(package.vertex_id)
+        if packages_at_vertex == None:
+            packages_at_vertex = {}
+            self.by_vertex[package.vertex_id] = packages_at_vertex
+        packages_at_vertex[package.package_id] = package
+
+    def get(self, package_id):
+        """
+        Return the package with an id; None if it is not in the index.
+
+        Time complexity: O(1)
+        """
+
+        return self.by_id.get(package_id)
+
+    def remove(self, package_id):
+        """
+        Remove and return the package with an id; None if not found.
+
+        Time complexity: O(1)
+        """
+
+        package = self.by_id.pop(package_id, None)
+        if package != None:
+            self.remove_from_vertex(package, package.vertex_id)
+        return package
+
+    def remove_from_vertex(self, package, vertex_id):
+        """Remove a package from the packages going to a vertex."""
+
+        packages_at_vertex = self.by_vertex[vertex_id]
+        del packages_at_vertex[package.package_id]
+        if len(packages_at_vertex) == 0:
+            del self.by_vertex[vertex_id]
+
+    def remove_at_vertex(self, vertex_id):
+        """
+        Remove and return a list of the packages going to a vertex.
+
+        Time complexity: O(k) where k is the number of packages removed.
+        """
+
+        packages_at_vertex = self.by_vertex.pop(vertex_id, None)
+        if packages_at_vertex == None:
+            return []
+        for package_id in packages_at_vertex:
+            del self.by_id[package_id]
+        return list(packages_at_vertex.values())
+
+    def move(self, package, old_vertex_id):
+        """
+        Re-index a package whose vertex id changed from old_vertex_id.
+
+        Time complexity: O(1)
+        """
+
+        self.remove_from_vertex(package, old_vertex_id)
+        self.add_to_vertex(package)
+
+    def get_vertex_ids(self):
+        """Return a list of the vertex ids that packages are going to."""
+
+        return list(self.by_vertex)
+
+    def get_length(self):
+        """Return the number of packages in the index."""
+
+        return len(self.by_id)
+
+    def __len__(self):
+        """Return the number of packages in the index."""
+
+        return len(self.by_id)
+
+    def __iter__(self):
+        """Iterate over the packages in the order they were added."""
+
+        return iter(self.by_id.values())
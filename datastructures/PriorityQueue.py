@@ -3,7 +3,7 @@
 import math
 
 from datastructures.MinHeap import MinHeap
-from datastructures.HashTable import HashTable
+from datastructures.OpenAddressingHashTable import OpenAddressingHashTable
 
 class IndexItem:
     """Helper class to track the index of items in the Priority Queue."""
@@ -41,7 +41,11 @@ class PriorityQueue(MinHeap):
         else:
             self.hashtable_get_key = hashtable_get_key_function
 
-        self.index_table = HashTable(size, self.hashtable_get_key)
+        self.index_table = OpenAddressingHashTable(size, self.hashtable_get_key)
+
+        # Hash of each item's hashtable key, kept at the same index as the
+        # item so swaps do not hash the keys again.
+        self.key_hashes = []
 
     def push(self, item):
         """
@@ -55,11 +59,14 @@ class PriorityQueue(MinHeap):
         """
 
         # Add this item to the hash table with an index of the length of list.
-        index_item = IndexItem(self.hashtable_get_key(item), len(self.list))
-        self.index_table.add(index_item)
+        key = self.hashtable_get_key(item)
+        key_hash = self.index_table.hash(key)
+        index_item = IndexItem(key, len(self.list))
+        self.index_table.add(index_item, key_hash)
 
         # Add the item to the list.
         self.list.append(item)
+        self.key_hashes.append(key_hash)
         # Percolate up the item until it reaches it's correct index.
         self.percolate_up(len(self.list) - 1)
 
@@ -82,15 +89,18 @@ class PriorityQueue(MinHeap):
 
             # Get the last item in the list.
             last_item = self.list.pop()
+            last_hash = self.key_hashes.pop()
 
             # If there was a last item.
             if len(self.list) > 0:
 
                 # Place the last_item at the front of the list.
                 self.list[0] = last_item
+                self.key_hashes[0] = last_hash
 
                 # Update the last_item with it's new index
-                index_item = self.index_table.get(self.hashtable_get_key(last_item))
+                index_item = self.index_table.get(
+                    self.hashtable_get_key(last_item), last_hash)
                 index_item.index = 0
 
                 # Percolate the last_item down.
@@ -102,13 +112,15 @@ class PriorityQueue(MinHeap):
         """Swap two elements in the list."""
 
         # Update each item's index in the index hash table.
-        self.index_table.get(self.hashtable_get_key(self.list[i])).index = j
-        self.index_table.get(self.hashtable_get_key(self.list[j])).index = i
+        hashes = self.key_hashes
+        self.index_table.get(self.hashtable_get_key(self.list[i]), hashes[i]).index = j
+        self.index_table.get(self.hashtable_get_key(self.list[j]), hashes[j]).index = i
 
         # Swap the two items.
         temp = self.list[i]
         self.list[i] = self.list[j]
         self.list[j] = temp
+        hashes[i], hashes[j] = hashes[j], hashes[i]
 
     def update_priority(self, item):
         """
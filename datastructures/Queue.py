@@ -1,32 +1,53 @@
 """Module containing a Queue class."""
 
-from datastructures.DoublyLinkedList import DoublyLinkedList
+from collections import deque
 
 class Queue:
-    """A queue implemented with a linked list."""
+    """A queue implemented with a deque."""
 
     def __init__(self):
-        """Initialize the queue as a linked list."""
-        self.list = DoublyLinkedList()
+        """Initialize the queue as an empty deque."""
+        self.list = deque()
+
+    @classmethod
+    def from_iterable(cls, iterable):
+        """Return a queue with the items of an iterable pushed in order."""
+        queue = cls()
+        queue.list.extend(iterable)
+        return queue
 
     def push(self, item):
         """Add an item to the back of the queue."""
-        self.list.add(item)
+        self.list.append(item)
+
+    def extend(self, iterable):
+        """Add each item of an iterable to the back of the queue, in order."""
+        self.list.extend(iterable)
 
     def pop(self):
         """Remove and return item from front of the queue; None if empty."""
-        if not self.list.is_empty():
-            return self.list.remove_from_front()
+        if len(self.list) > 0:
+            return self.list.popleft()
         else:
             return None
 
+    def pop_all(self):
+        """Remove and return a list of all items, from the front back."""
+        items = list(self.list)
+        self.list.clear()
+        return items
+
     def peek(self):
         """Return node at front of queue without removing; None if empty."""
-        if not self.list.is_empty():
-            return self.list.head.data
+        if len(self.list) > 0:
+            return self.list[0]
         else:
             return None
 
     def is_empty(self):
         """Return whether or not the queue is empty."""
-        return self.list.is_empty()
+        return len(self.list) == 0
+
+    def get_length(self):
+        """Return the number of items in the queue."""
+        return len(self.list)
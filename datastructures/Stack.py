@@ -1,32 +1,57 @@
 """Module containing a Stack class."""
 
-from datastructures.DoublyLinkedList import DoublyLinkedList
-
 class Stack:
-    """A stack implemented with a linked list."""
+    """A stack implemented with a Python list."""
 
     def __init__(self):
-        """Initialize the stack as a linked list."""
-        self.list = DoublyLinkedList()
+        """Initialize the stack as an empty list; the top is the list's end."""
+        self.list = []
+
+    @classmethod
+    def from_iterable(cls, iterable):
+        """Return a stack with the items of an iterable pushed in order."""
+        stack = cls()
+        stack.list.extend(iterable)
+        return stack
 
     def push(self,item):
         """Add an item to the top of the stack."""
-        self.list.add_to_front(item)
+        self.list.append(item)
+
+    def extend(self, iterable):
+        """Push each item of an iterable; the last item ends up on top."""
+        self.list.extend(iterable)
 
     def pop(self):
         """Remove and return top item from Stack; None if empty."""
-        return self.list.remove_from_front()
+        if len(self.list) == 0:
+            return None
+        return self.list.pop()
+
+    def pop_all(self):
+        """Remove and return a list of all items, from the top down."""
+        items = self.list[::-1]
+        self.list = []
+        return items
 
     def peek(self):
         """Return top item from Stack without removing; None if empty."""
-        if self.list.head == None:
+        if len(self.list) == 0:
             return None
-        return self.list.head.data
+        return self.list[-1]
+
+    def items(self):
+        """Return a tuple of the items, from the bottom up (top last)."""
+        return tuple(self.list)
 
     def is_empty(self):
         """Return whether or not Stack is empty."""
-        return self.list.is_empty()
+        return len(self.list) == 0
 
     def clear(self):
-        """Clear the stack by initializing a new linked list."""
-        self.list = DoublyLinkedList()
+        """Clear the stack."""
+        self.list = []
+
+    def get_length(self):
+        """Return the number of items in the stack."""
+        return len(self.list)
@@ -6,23 +6,52 @@ print_packages -- print details of all packages.
 print_package -- print details of a single package.
 min_path -- determine the minimum path through a set of vertices.
 set_destinations_for_truck -- set the order of vertices to visit for a truck.
+get_stop_deadlines -- get the deadline of each stop of a truck.
+get_pickup_deadline -- get the time by which to pick up packages at the hub.
+set_route_for_truck -- set a truck's destinations to a planned path.
 get_unique_addresses -- get unique addresses from a list of addresses.
+get_hub_priority -- get the loading priority of a package at the hub.
+receive_packages_at_hub -- add packages that arrived to the hub's heap.
 load_trucks -- load trucks with packages.
 deliver_packages -- deliver packages off a truck to a specified location.
-management_updates_at_hub -- update packages_at_hub with newly received packages.
+management_updates_at_hub -- apply scheduled updates to packages.
 management_updates_for_trucks -- notify trucks of updates at the hub.
+reroute_truck -- change a truck's route after a recall or address correction.
+repair_route_for_truck -- change a truck's route to the stops of its packages.
+program_interface -- prompt the admin for instructions.
+run_simulation -- deliver packages from the start of the day until EOD.
+set_up_simulation -- import the data of a scenario and load the trucks.
 """
 
+import math
+import os
+import sys
+
 from datastructures.Node import Node
+from datastructures.EventQueue import EventQueue
 from datastructures.Graph import Graph, Vertex
-from datastructures.HashTable import HashTable
-from datastructures.MinHeap import MinHeap
-from datastructures.Stack import Stack
+from datastructures.OpenAddressingHashTable import OpenAddressingHashTable
+from datastructures.KeyedMinHeap import KeyedMinHeap
+from models.Event import Event
+from models.ManagementUpdate import ManagementUpdate
 from models.Package import Package
+from models.Scenario import Scenario
 from models.Truck import Truck
+from models.UpdateSchedule import UpdateSchedule
+from utilities import fleet_assignment
 from utilities import imports
+from utilities import instrumentation
+from utilities import route_planning
 from utilities.time import *
 
+# Cache of planned routes used by min_path, or None to plan every route (set
+# by set_up_simulation).
+route_cache = None
+
+# Seconds to spend improving each planned route, or None to stop after a
+# fixed number of moves (set by set_up_simulation).
+planning_time_budget = None
+
 def print_packages() -> None:
     """Print details of all packages."""
 
@@ -51,7 +80,7 @@ def print_package(id, header=True) -> None:
                     )
         mass = package.mass
         notes = package.special_notes
-        status = package.status
+        status = package.get_status_name()
 
         if header:
             print("Package ID | Status | Address | Delivery Deadline |"
@@ -62,74 +91,53 @@ def print_package(id, header=True) -> None:
     else:
         print("Package not found.")
 
-def min_path(start, set, end, graph) -> []:
+def min_path(start, set, end, graph, strategy="greedy", deadlines=None,
+             start_time=0, speed=None) -> []:
     """
     Return the minimum path through a set of vertices as a list.
 
     Determine the minimum path from a starting vertex, through a set of vertices,
-    to  an ending vertex. The minimum path will be chosen by finding the shortest
-    path to the next closest vertex (greedy approach).
+    to  an ending vertex. The stops are first ordered by going to the next
+    closest vertex (greedy approach). Unless the strategy is "greedy", that
+    order is then improved by local search (see utilities.route_optimization).
+    Distances and paths are looked up in the graph's precomputed all-pairs
+    shortest path tables (see utilities.route_planning.plan_route).
 
     Keyword arguments:
     start -- the starting vertex.
     set -- a list of vertices to visit.
     end -- the vertex to end at.
     graph -- the graph containing the vertices.
-
-    Time complexity: O(S * (VLogV + ELogV)) where S is the number of vertices in
-    the set of vertices to visit, V is the number of vertices in the graph, and
-    E is the number of edges in the graph.
-
-    Space complexity: O(V)
+    strategy -- the route optimization strategy (default of "greedy").
+    deadlines -- a dictionary of vertex id to delivery deadline in minutes
+                 (used by the "deadline" strategy).
+    start_time -- the time at which the route starts (used by the "deadline"
+                  strategy).
+    speed -- the speed of the truck (used by the "deadline" strategy).
+
+    Time complexity: O(S^2 + P) where S is the number of vertices in the set of
+    vertices to visit and P is the number of vertices in the returned path,
+    plus the time of the route optimization strategy.
+
+    Space complexity: O(S + P)
     """
 
-    full_path = [start]
-
-    # Time complexity: O(S)
-    while len(set) > 0:
-
-        # Time complexity: O(V^2)
-        graph.dijkstra_shortest_path(start)
-
-        # Time complexity: O(S)
-        index = 0
-        for i, v in enumerate(set):
-            if v.distance < set[index].distance:
-                index = i
-        closest_vertex = set[index]
-
-        # Time complexity: O(S)
-        set.pop(index)
-
-        # Time complexity: O(V)
-        path = graph.find_shortest_path(start, closest_vertex)
-
-        # If a path was found to the closest vertex.
-        if len(path) > 0:
-            full_path.pop()
-            full_path += path
-            start = closest_vertex
-
-        # If a path does not exist, the search can stop here.
-        else:
-            break
-
-    # Determine the shortest path from the last vertex visited in the set
-    # to the end vertex.
-    graph.dijkstra_shortest_path(start)
-    path = graph.find_shortest_path(start, end)
-
-    # If a path was found.
-    if len(path) > 0:
-        full_path.pop()
-        full_path += path
-        return full_path
-
-    # If a path was not found, return the path found thus far.
+    # Routes already planned through the same stops are taken from the
+    # route cache.
+    if route_cache != None and route_cache.graph is graph:
+        path = route_cache.get_route(
+            start.id, [v.id for v in set], end.id, strategy, deadlines,
+            start_time, speed, planning_time_budget)
     else:
-        return full_path
-
-def set_destinations_for_truck(truck, addresses_to_visit, ending_address, graph) -> None:
+        path = route_planning.plan_route(
+            start.id, [v.id for v in set], end.id, graph.distance_matrix(),
+            graph.all_pairs_previous, strategy, deadlines, start_time, speed,
+            planning_time_budget)
+    return [graph.vertex_list[i] for i in path]
+
+def set_destinations_for_truck(truck, addresses_to_visit, ending_address, graph,
+                               strategy="greedy", time=0,
+                               pickup_deadline=None) -> None:
     """
     Set the destination order for a truck to visit.
 
@@ -142,29 +150,91 @@ def set_destinations_for_truck(truck, addresses_to_visit, ending_address, graph)
     addresses_to_visit -- a list of addresses the truck needs to visit.
     ending_address -- the address the truck should end at.
     graph -- the graph containing the vertices to visit.
+    strategy -- the route optimization strategy (default of "greedy").
+    time -- the current time (used by the "deadline" strategy).
+    pickup_deadline -- the time by which the truck should reach the HUB to
+                       pick up packages (used by the "deadline" strategy;
+                       see get_pickup_deadline).
     """
 
     # Get a unique set of addresses to visit.
     addresses = get_unique_addresses(addresses_to_visit)
 
     # Order the destinations that the truck needs to visit to deliver packages.
+    stops = [graph.vertices.get(i) for i in addresses]
+    end = graph.vertices.get(ending_address)
+    deadlines = get_stop_deadlines(truck, strategy)
+    if deadlines != None and pickup_deadline != None:
+        hub_id = graph.vertices.get(hub_address).id
+        deadlines[hub_id] = min(deadlines.get(hub_id, pickup_deadline),
+                                pickup_deadline)
     destination_list = min_path(
-        truck.location, [graph.vertices.get(i) for i in addresses],
-        graph.vertices.get(ending_address), graph)
+        truck.location, stops, end, graph, strategy, deadlines, time,
+        truck.speed)
+
+    set_route_for_truck(truck, destination_list, graph, stops + [end])
+
+def get_stop_deadlines(truck, strategy) -> {}:
+    """
+    Return a dictionary of vertex id to the deadline of a truck's stop there.
+
+    Each stop's deadline is the earliest deadline of the packages on the
+    truck that are delivered there. Returns None unless the strategy is
+    "deadline", the only strategy that uses them.
+
+    Keyword arguments:
+    truck -- a truck object.
+    strategy -- the route optimization strategy.
+    """
+
+    if strategy != "deadline":
+        return None
+
+    deadlines = {}
+    for package in truck.packages:
+        vertex_id = package.vertex_id
+        if (vertex_id not in deadlines
+                or package.delivery_deadline < deadlines[vertex_id]):
+            deadlines[vertex_id] = package.delivery_deadline
+    return deadlines
 
-    # Load the destinations onto the truck's destinations stack.
-    truck.destinations = Stack()
-    while len(destination_list) > 0:
-        truck.destinations.push(destination_list.pop())
+def get_pickup_deadline(speed) -> float:
+    """
+    Return the latest time a truck can leave the HUB and still deliver every
+    package waiting there, or shipping to it, by its deadline; None if there
+    are no such packages.
 
-    # The truck is already at the current location.
-    truck.destinations.pop()
+    Keyword arguments:
+    speed -- the speed of the truck in miles per hour.
 
-    # Deermine the truck's distance to the next destination.
-    if not truck.destinations.is_empty():
-        truck.dist_to_next_vertex = graph.edge_weights[
-            (truck.location, truck.destinations.peek())
-            ]
+    Time complexity: O(P) where P is the number of packages.
+    """
+
+    distance = graph.distance_matrix()[hub_vertex.id]
+    pickup_deadline = None
+    for package in packages:
+        if (package.status == Package.ARRIVED_AT_HUB
+                or package.status == Package.SHIPPING_TO_HUB):
+            leave_by = (package.delivery_deadline
+                        - distance[package.vertex_id] * 60 / speed)
+            if pickup_deadline == None or leave_by < pickup_deadline:
+                pickup_deadline = leave_by
+    return pickup_deadline
+
+def set_route_for_truck(truck, destination_list, graph, stops) -> None:
+    """
+    Set a truck's destinations to a path that starts at its location.
+
+    Keyword arguments:
+    truck -- a truck object.
+    destination_list -- a list of vertices, starting with the truck's
+                        location.
+    graph -- the graph containing the vertices.
+    stops -- the vertices the route was planned to stop at, including its
+             end (see route_planning.insert_truck_stop).
+    """
+
+    truck.set_route(destination_list, stops, graph)
 
 def get_unique_addresses(address_list) -> []:
     """Return a unique set of addresses given a list of addresses."""
@@ -174,7 +244,63 @@ def get_unique_addresses(address_list) -> []:
             addresses.append(address)
     return addresses
 
-def load_trucks(trucks_to_load, packages, graph) -> None:
+def get_hub_priority(package) -> ():
+    """
+    Return the priority of a package waiting at the hub.
+
+    Packages are loaded in order of deadline. Packages due at EOD are then
+    loaded in order of their destination in hub_load_order, then mass. That
+    order goes from each destination to the next closest one, so packages
+    popped one after another, which sequential loading puts on the same
+    truck, are near each other. With fleet loading, which groups packages by
+    location itself, EOD packages are ordered by distance from the hub
+    instead.
+
+    Packages with an earlier deadline keep the order they arrived in (see
+    receive_packages_at_hub), since reordering them by location can make a
+    truck reach one of them late. The order of arrival also breaks any
+    remaining ties between EOD packages, so equal keys never depend on the
+    order of the heap. The priority is computed when the package is added
+    to packages_at_hub (a KeyedMinHeap), and again if it is updated.
+
+    Keyword arguments:
+    package -- a package at the hub.
+    """
+
+    arrival = hub_arrival_order.get(package.package_id, 0)
+    if package.delivery_deadline < EOD:
+        return (package.delivery_deadline, 0, 0, arrival)
+    if package.vertex_id == None:
+        position = float('inf')
+    elif hub_load_order != None:
+        # Destinations added by an address correction go last.
+        position = hub_load_order.get(package.vertex_id, len(hub_load_order))
+    else:
+        position = graph.distance_matrix()[hub_vertex.id][package.vertex_id]
+    return (package.delivery_deadline, position, package.mass, arrival)
+
+def receive_packages_at_hub(arrived) -> None:
+    """
+    Add packages that arrived at the hub to packages_at_hub.
+
+    The order in which each package first arrived is recorded in
+    hub_arrival_order, so packages put back at the hub keep their place
+    (see get_hub_priority).
+
+    Keyword arguments:
+    arrived -- a list of packages, in the order they arrived.
+
+    Time complexity: O(k + min(n + k, k LogN)) for k packages and n packages
+    at the hub.
+    """
+
+    for package in arrived:
+        if package.package_id not in hub_arrival_order:
+            hub_arrival_order[package.package_id] = len(hub_arrival_order)
+    packages_at_hub.push_many(arrived)
+
+def load_trucks(trucks_to_load, packages, graph, time=0, strategy="greedy",
+                assignment="sequential", planner=None) -> None:
     """
     Load trucks with packages.
 
@@ -182,32 +308,80 @@ def load_trucks(trucks_to_load, packages, graph) -> None:
     in the trucks_to_load list, and then determinte the order in which
     to visit the delivery addresses for the packages on each truck.
 
+    With "sequential" assignment, each truck is filled in deadline order
+    before the next truck is loaded. With "fleet" assignment, all packages
+    at the hub are divided between the trucks at once by location, truck
+    restrictions, and deadlines (see utilities.fleet_assignment); packages
+    that do not fit stay at the hub. If fleet assignment raises ValueError,
+    the packages are left at the hub.
+
     Keyword arguments:
     trucks_to_load -- a list of trucks to load with packages.
     packages -- a min heap of packages to load.
     graph -- the graph containing the vertices at which to delivery the packages.
+    time -- the time at which the trucks leave the hub.
+    strategy -- the route optimization strategy (default of "greedy").
+    assignment -- "sequential" or "fleet" (default of "sequential").
+    planner -- a utilities.route_planning.RoutePlanner used to plan the
+               trucks' routes in parallel (default of None to plan them one
+               after another).
     """
 
-    # For each truck, while the truck is not full and there are packages at the
-    # hub, load the package onto the truck.
-    for truck in trucks_to_load:
-        trucks_have_room = True
-        while trucks_have_room and not packages.is_empty():
-            trucks_have_room = False
-            if not truck.is_full():
-                package = packages.pop()
-                if package != None:
-                    package.status = "Out for delivery"
-                    truck.add_package(package)
-                    trucks_have_room = True
+    if assignment == "fleet":
+        waiting = packages.pop_n(packages.get_length())
+
+        # If the packages cannot be assigned, they are put back at the hub
+        # before the error is raised.
+        try:
+            assignments, unassigned = fleet_assignment.assign_packages(
+                trucks_to_load, waiting, graph,
+                graph.vertices.get(hub_address), time, trucks)
+        except ValueError:
+            packages.push_many(waiting)
+            raise
+
+        # Packages that did not fit on a truck stay at the hub.
+        packages.push_many(unassigned)
+
+        for truck, assigned_packages in zip(trucks_to_load, assignments):
+            for package in assigned_packages:
+                package.status = Package.OUT_FOR_DELIVERY
+                truck.add_package(package)
+
+    # For each truck, fill the truck's remaining room with the packages at
+    # the hub that have the earliest deadlines.
+    else:
+        for truck in trucks_to_load:
+            room = truck.max_packages - len(truck.packages)
+            for package in packages.pop_n(room):
+                package.status = Package.OUT_FOR_DELIVERY
+                truck.add_package(package)
 
     # For each truck, determine the fastest route through all package
-    # destinations and back to the HUB.
-    for truck in trucks_to_load:
-        set_destinations_for_truck(
-            truck, [i.address_and_zip for i in truck.packages], hub_address,
-            graph
-            )
+    # destinations and back to the HUB. With a planner, the routes of several
+    # trucks are planned at the same time in its worker processes.
+    if planner != None and len(trucks_to_load) > 1:
+        hub_id = graph.vertices.get(hub_address).id
+        requests = []
+        for truck in trucks_to_load:
+            addresses = get_unique_addresses(
+                [i.address_and_zip for i in truck.packages])
+            requests.append((truck.location.id,
+                             [graph.vertices.get(i).id for i in addresses],
+                             hub_id, strategy,
+                             get_stop_deadlines(truck, strategy), time,
+                             truck.speed))
+        paths = planner.plan_routes(requests)
+        for truck, request, path in zip(trucks_to_load, requests, paths):
+            stops = [graph.vertex_list[i] for i in request[1] + [hub_id]]
+            set_route_for_truck(truck, [graph.vertex_list[i] for i in path],
+                                graph, stops)
+    else:
+        for truck in trucks_to_load:
+            set_destinations_for_truck(
+                truck, [i.address_and_zip for i in truck.packages], hub_address,
+                graph, strategy, time
+                )
 
 def deliver_packages(truck, vertex, time) -> None:
     """
@@ -218,89 +392,172 @@ def deliver_packages(truck, vertex, time) -> None:
     vertex -- the vertex on the graph at which the truck has arrived.
     time -- the current time.
 
-    Time complexity:
-    Worst case: O(p^2). The worst case is if all packages are delivered to one location.
-    Average case: O(p). The average case assumes that typically one package will be
-                        delivered to each location.
-
-    Space complexity:
-    Worst case: O(p)
-    Average case: O(1)
+    Time complexity: O(k) where k is the number of packages delivered here.
+    Space complexity: O(k)
     """
 
-    # Go through the packages on the truck and deliver all packages with
-    # a delivery address of this location.
-    packages_delivered = []
-    for package in truck.packages:
-        if package.address_and_zip == vertex.data:
-            package.delivered_time = time
-            if package.delivered_time <= package.delivery_deadline:
-                package.status = "DELIVERED ON TIME"
-            else:
-                package.status = "DELIVERED LATE"
-            packages_delivered.append(package)
-
-    # Remove all delivered packages from the truck's packages list.
-    for package in packages_delivered:
-        truck.packages.pop(truck.packages.index(package))
+    # Unload the packages addressed to this location from the truck's index
+    # of packages by destination.
+    for package in truck.unload_packages_at(vertex):
+        package.delivered_time = time
+        if package.delivered_time <= package.delivery_deadline:
+            package.status = Package.DELIVERED_ON_TIME
+        else:
+            package.status = Package.DELIVERED_LATE
 
 def management_updates_at_hub(time) -> None:
     """
-    Check for packages received at the hub or other management updates.
+    Apply the scheduled management updates that are due by a time.
+
+    Packages arriving at the hub are added to packages_at_hub. Address
+    corrections and deadline changes are applied to the package. If a
+    package already out for delivery has a corrected address, its truck is
+    added to trucks_to_reroute, and its route is changed to the new address
+    when it reaches its next vertex (see management_updates_for_trucks).
 
     Keyword arguments:
     time -- the current time.
+
+    Time complexity: O(u LogU + u LogP) where u is the number of updates due,
+    U is the number of scheduled updates, and P is the number of packages
+    at the hub.
     """
 
-    # Packages 6, 25, 28, and 32 are arriving to the hub at 09:05:00 AM.
-    # Time complexity: O(n). There is a maximum of 4 packages.
-    # Space complexity: O(1). There is a maximum of 4 packages.
-    if (time >= convert_standard_time_to_minutes("09:05:00 AM")
-            and time <= convert_standard_time_to_minutes("09:10:00 AM")):
-        packages_removed = []
-        for package in packages:
-            if package.package_id in [6, 25, 28, 32]:
-                package.status = "Arrived at HUB"
-                packages_at_hub.push(package)
-                packages_removed.append(package)
-        for package in packages_removed:
-            packages.pop(packages.index(package))
-
-    # Package 9 is having it's delivery address corrected at 10:20:00 AM.
-    # Time complexity: O(n). There is a maximum of 1 package.
-    # Space complexity: O(1).
-    if (time >= convert_standard_time_to_minutes("10:20:00 AM")
-            and time <= convert_standard_time_to_minutes("10:25:00 AM")):
-        packages_removed = []
-        for package in packages:
-            if package.package_id in [9]:
-                package.address = "410 S State St"
-                package.zip = "84111"
-                package.address_and_zip = "410 S State St (84111)"
-                package.status = "Arrived at HUB"
-                packages_at_hub.push(package)
-                packages_removed.append(package)
-        for package in packages_removed:
-            packages.pop(packages.index(package))
+    # Packages arriving now are added to the hub together at the end.
+    arrived = []
+
+    for update in update_schedule.pop_due(time):
+        package = packages_hashtable.get(update.package_id)
+        if package == None:
+            continue
+
+        # The package has arrived at the hub.
+        if update.action == ManagementUpdate.ARRIVE:
+            package.status = Package.ARRIVED_AT_HUB
+            arrived.append(package)
+
+        # The package's delivery address has been corrected.
+        elif update.action == ManagementUpdate.CORRECT_ADDRESS:
+            # Updates imported from a file were checked against the map;
+            # a correction to an address that is not on it is ignored, so
+            # the package keeps a deliverable address.
+            address_and_zip = update.get_address_and_zip()
+            if (address_and_zip == None
+                    or graph.vertices.get(address_and_zip) == None):
+                continue
+            old_vertex_id = package.vertex_id
+            package.set_address(update.address, update.city or package.city,
+                                update.state or package.state, update.zip)
+            imports.link_packages_to_graph([package], graph.vertices)
+
+            # Re-index the package if it is already on a truck, and reroute
+            # the truck when it next reaches a vertex. Otherwise update the
+            # package's priority if it is waiting at the hub.
+            for truck in trucks:
+                if truck.get_package(package.package_id) is package:
+                    truck.packages.move(package, old_vertex_id)
+                    trucks_to_reroute.add(truck)
+            if (package.status == Package.ARRIVED_AT_HUB
+                    and package not in arrived):
+                packages_at_hub.update(package)
+
+        # The package's delivery deadline has changed. Packages waiting at the
+        # hub are ordered by deadline, so their priority is updated as well.
+        elif update.action == ManagementUpdate.CHANGE_DEADLINE:
+            package.delivery_deadline = update.deadline
+            if (package.status == Package.ARRIVED_AT_HUB
+                    and package not in arrived):
+                packages_at_hub.update(package)
+
+    receive_packages_at_hub(arrived)
 
 def management_updates_for_trucks(truck, time) -> None:
     """
     Inform a truck of management updates to delivery locations and deadlines.
 
+    If trucks are being recalled at this time, or the address of a package
+    on the truck was corrected, the truck is rerouted (see reroute_truck).
+
     Keyword arguments:
     truck -- a truck object.
     time -- the current time.
+
+    Time complexity: O(LogW) where W is the number of recall windows, plus
+    the time to change the truck's destinations.
+    """
+
+    recalling = update_schedule.is_recalling(time)
+    if not recalling and truck not in trucks_to_reroute:
+        return
+    trucks_to_reroute.discard(truck)
+    reroute_truck(truck, time, recalling)
+
+def reroute_truck(truck, time, recalling) -> None:
+    """
+    Change a truck's route after a recall or an address correction.
+
+    If trucks are being recalled, add the HUB to the truck's destinations so
+    it can pick up newly arrived packages. If the address of a package on
+    the truck was corrected, stop at the new address instead of the old one.
+
+    A recall plans the route again, since where the HUB goes in the route
+    decides when the truck is back. After an address correction, the stops
+    are changed in place with incremental rerouting (see
+    repair_route_for_truck), unless routes are planned by deadline, as
+    inserting a stop only looks at distance.
+
+    Keyword arguments:
+    truck -- a truck object at a vertex.
+    time -- the current time.
+    recalling -- whether trucks are being recalled to the HUB.
     """
 
-    # If the time is between 09:00:00 AM and 09:05:00 AM, add the HUB to the
-    # destinations stack of the truck to pick up packages 6, 25, 28, and 32.
-    if (time >= convert_standard_time_to_minutes("09:00:00 AM")
-            and time <= convert_standard_time_to_minutes("09:05:00 AM")):
-        address_list = get_unique_addresses(
-            [i.address_and_zip for i in truck.packages]
-            )
+    if (not recalling and incremental_rerouting
+            and routing_strategy != "deadline"):
+        repair_route_for_truck(truck)
+        return
+
+    address_list = get_unique_addresses(
+        [i.address_and_zip for i in truck.packages]
+        )
+    pickup_deadline = None
+    if recalling:
         address_list.append(hub_address)
-        set_destinations_for_truck(truck, address_list, hub_address, graph)
+        if routing_strategy == "deadline":
+            pickup_deadline = get_pickup_deadline(truck.speed)
+    set_destinations_for_truck(truck, address_list, hub_address, graph,
+                               routing_strategy, time, pickup_deadline)
+
+def repair_route_for_truck(truck) -> None:
+    """
+    Change a truck's route in place to the stops of its packages.
+
+    Stops no package on the truck is going to are removed, other than the
+    HUB and the end of the route, and the packages' missing stops are
+    inserted where they add the least distance (see
+    route_planning.insert_truck_stop).
+
+    Keyword arguments:
+    truck -- a truck object at a vertex.
+
+    Time complexity: O(kP) where k is the number of stops changed and P is
+    the number of destinations, plus the time of the polish.
+    """
+
+    tour = truck.get_tour()
+    package_vertex_ids = set(truck.packages.get_vertex_ids())
+    for vertex_id in tour[1:-1]:
+        if vertex_id not in package_vertex_ids and vertex_id != hub_vertex.id:
+            route_planning.remove_truck_stop(
+                truck, graph.vertex_list[vertex_id], graph,
+                rerouting_polish_iterations)
+
+    stop_ids = set(tour)
+    for vertex_id in package_vertex_ids:
+        if vertex_id not in stop_ids:
+            route_planning.insert_truck_stop(
+                truck, graph.vertex_list[vertex_id], graph,
+                rerouting_polish_iterations)
 
 def program_interface(trucks, current_time, run_until):
     """
@@ -391,7 +648,249 @@ def program_interface(trucks, current_time, run_until):
             print('Please enter 1, 2, 3, or 4.')
             print()
 
-if __name__ == '__main__':
+def run_simulation(trucks, start_time, end_time, time_segment, run_until):
+    """
+    Deliver packages from start_time until end_time; return the final time.
+
+    Discrete-event simulation of the trucks. Instead of moving every truck
+    for every time segment, only the moments at which something happens are
+    handled: admin prompts, management updates at the hub, truck arrivals at
+    vertices, and loading of trucks waiting at the hub. Prompts and hub
+    updates happen at the start of a time segment. Events are handled in the
+    order a loop moving each truck for one time segment at a time would
+    handle them (by time segment, then prompts and hub updates, then each
+    truck in order, then by time). Distances covered in each time segment
+    are calculated the same way as that loop, so the results (including
+    arrival times and mileage) are exactly the same while the work done
+    depends on the number of events rather than on the number of time
+    segments times the number of trucks.
+
+    Keyword arguments:
+    trucks -- an array of the trucks that are delivering packages.
+    start_time -- the time deliveries start.
+    end_time -- the time deliveries stop (EOD).
+    time_segment -- how often (in minutes) the admin and hub are checked.
+    run_until -- the next time to stop the program to ask for further instructions.
+
+    Time complexity: O(E LogE + D) where E is the number of events and D is
+    the number of time segments that trucks drive through without arriving
+    anywhere, plus the time to handle each event.
+    """
+
+    events = EventQueue()
+    infinity = float('inf')
+
+    # Each truck's next arrival event, the distances it covers at the end of
+    # each time segment it drives through before then (as a list of
+    # (segment end, distance) in reverse order), and the time segment of its
+    # next check for packages to load.
+    next_arrival = {}
+    segment_distances = {}
+    next_load_check = {}
+
+    def segment_at_or_after(time):
+        """Return the start of the first time segment at or after a time."""
+        if time <= start_time:
+            return start_time
+        return (start_time
+                + math.ceil((time - start_time) / time_segment) * time_segment)
+
+    def is_waiting_at_hub(truck):
+        """Return whether a truck is idle at the hub with packages to load."""
+        return (truck.destinations.is_empty()
+                and truck.location == hub_vertex
+                and not packages_at_hub.is_empty())
+
+    def schedule_arrival(index, truck, time, segment):
+        """
+        Schedule a truck's arrival at its next destination.
+
+        The truck leaves at time, during the time segment starting at
+        segment. It is driven one time segment at a time, recording the
+        distance covered in each segment it does not arrive in.
+        """
+        next_arrival[truck] = None
+        segment_distances[truck] = []
+        distance = truck.dist_to_next_vertex
+        while not truck.destinations.is_empty():
+            stop_time = min(segment + time_segment, end_time)
+            time_to_next_stop = distance * 60 / truck.speed
+
+            # If the truck can get to the next destination before the stop_time.
+            if time + time_to_next_stop < stop_time:
+                arrival = time + time_to_next_stop
+                event = Event(arrival, Event.ARRIVAL,
+                              (segment, 2, index, arrival), truck)
+                next_arrival[truck] = event
+                events.push(event)
+                break
+
+            covered = (stop_time - time) * truck.speed / 60
+            distance -= covered
+            segment_distances[truck].append((stop_time, covered))
+            if stop_time >= end_time:
+                break
+            time = stop_time
+            segment += time_segment
+        segment_distances[truck].reverse()
+
+    def drive_truck(truck, time):
+        """Update a truck's mileage for the time segments ending by a time."""
+        distances = segment_distances.get(truck, [])
+        while len(distances) > 0 and distances[-1][0] <= time:
+            covered = distances.pop()[1]
+            truck.dist_to_next_vertex -= covered
+            truck.mileage += covered
+
+    def schedule_load_check(index, truck, after):
+        """Schedule a load check at the end of a truck's next turn."""
+        segment = after[0]
+        if (segment, 2, index, infinity) <= after:
+            segment += time_segment
+        if segment < end_time and next_load_check.get(truck) != segment:
+            next_load_check[truck] = segment
+            events.push(Event(segment, Event.LOAD,
+                              (segment, 2, index, infinity), truck))
+
+    # Schedule the admin prompts, hub updates, and the trucks' first moves.
+    prompt_time = segment_at_or_after(run_until[0])
+    if prompt_time < end_time:
+        events.push(Event(prompt_time, Event.PROMPT,
+                          (prompt_time, 0, 0, prompt_time)))
+    def schedule_hub_update():
+        """Schedule a hub update for the next scheduled management update."""
+        if not update_schedule.is_empty():
+            update_time = segment_at_or_after(update_schedule.next_time())
+            if update_time < end_time:
+                events.push(Event(update_time, Event.HUB_UPDATE,
+                                  (update_time, 1, 0, update_time)))
+
+    schedule_hub_update()
+    for index, truck in enumerate(trucks):
+        schedule_arrival(index, truck, start_time, start_time)
+        if is_waiting_at_hub(truck):
+            schedule_load_check(index, truck, (start_time, 1, 0, start_time))
+
+    # Time complexity: O(E)
+    while not events.is_empty():
+
+        # Time complexity: O(LogE)
+        event = events.pop()
+        time = event.time
+
+        # Stop to ask the admin for further instructions.
+        if event.kind == Event.PROMPT:
+            for truck in trucks:
+                drive_truck(truck, time)
+            program_interface(trucks, time, run_until)
+            prompt_time = max(segment_at_or_after(run_until[0]),
+                              time + time_segment)
+            if prompt_time < end_time:
+                events.push(Event(prompt_time, Event.PROMPT,
+                                  (prompt_time, 0, 0, prompt_time)))
+
+        # Check for packages received at the hub or other management updates,
+        # and let trucks waiting at the hub know about new packages.
+        elif event.kind == Event.HUB_UPDATE:
+            management_updates_at_hub(time)
+            schedule_hub_update()
+            for index, truck in enumerate(trucks):
+                if is_waiting_at_hub(truck):
+                    schedule_load_check(index, truck, event.priority)
+
+        # A truck reached the next vertex on its route.
+        elif event.kind == Event.ARRIVAL:
+            truck = event.truck
+            index = event.priority[2]
+            if next_arrival[truck] is not event:
+                continue
+
+            # Update the truck's location and mileage.
+            drive_truck(truck, event.priority[0])
+            truck.move_to_next_vertex()
+            truck.mileage += truck.dist_to_next_vertex
+
+            # Check for updates to package priorities including delivery
+            # deadlines and delivery locations.
+            management_updates_for_trucks(truck, time)
+
+            # If the truck happens to be at the hub, check if there are more
+            # packages available for delivery and load the truck as needed.
+            if truck.location == hub_vertex:
+                if not packages_at_hub.is_empty():
+                    load_trucks([truck], packages_at_hub, graph, time,
+                                routing_strategy, loading_strategy)
+            # If the truck is not at the hub, check if there are packages
+            # to deliver at the current location.
+            else:
+                deliver_packages(truck, truck.location, time)
+
+            # If the truck has more destinations to visit, update the
+            # truck's distance to the next destination and continue.
+            if not truck.destinations.is_empty():
+                truck.dist_to_next_vertex = graph.edge_weight(
+                    truck.location, truck.destinations.peek())
+
+            # If the truck has no more scheduled destinations to visit.
+            else:
+
+                # If the truck is not at the hub, head back to the hub.
+                if truck.location != hub_vertex:
+                    set_destinations_for_truck(truck, [], hub_address, graph,
+                                               routing_strategy, time)
+
+                # If the truck is at the hub and there are more packages at
+                # the hub, load the truck and continue.
+                elif not packages_at_hub.is_empty():
+                    load_trucks([truck], packages_at_hub, graph, time,
+                                routing_strategy, loading_strategy)
+
+            schedule_arrival(index, truck, time, event.priority[0])
+            if is_waiting_at_hub(truck):
+                schedule_load_check(index, truck, event.priority)
+
+        # If packages come later on in the day and the truck is sitting at the
+        # hub, load the truck at the end of its turn and continue delivering
+        # packages from the next time segment.
+        elif event.kind == Event.LOAD:
+            truck = event.truck
+            index = event.priority[2]
+            if is_waiting_at_hub(truck):
+                stop_time = min(time + time_segment, end_time)
+                load_trucks([truck], packages_at_hub, graph, stop_time,
+                            routing_strategy, loading_strategy)
+                schedule_arrival(index, truck, stop_time, time + time_segment)
+                if is_waiting_at_hub(truck):
+                    schedule_load_check(index, truck, event.priority)
+
+    # Trucks still driving at EOD have covered part of their current edge.
+    for truck in trucks:
+        drive_truck(truck, end_time)
+
+    return segment_at_or_after(end_time)
+
+def set_up_simulation(scenario) -> []:
+    """
+    Import the data of a scenario and load the trucks; return the trucks.
+
+    The functions in this module share the graph, packages, hub, and
+    strategies through module variables. All of them are set again from the
+    scenario, so a simulation can be set up and run more than once in the
+    same process.
+
+    Keyword arguments:
+    scenario -- a Scenario object with the settings of the simulation.
+    """
+
+    global graph, packages, update_schedule, packages_hashtable
+    global packages_at_hub, hub_address, hub_vertex, trucks
+    global routing_strategy, loading_strategy, EOD, route_cache
+    global incremental_rerouting, rerouting_polish_iterations
+    global trucks_to_reroute, hub_load_order, planning_time_budget
+    global hub_arrival_order
+
+    if scenario.loading_strategy != "fleet" and scenario.truck_count < 2:
+        raise ValueError("Sequential loading needs at least 2 trucks.")
 
     # Graph to store map data.
     graph = Graph(27,lambda el : el.data)
@@ -399,159 +898,176 @@ if __name__ == '__main__':
     # Packages to be received at the hub.
     packages = []
 
-    # Hashtable of all packages.
-    packages_hashtable = HashTable(40,lambda el : el.package_id)
-
-    # Packages received at the hub.
-    packages_at_hub = MinHeap(lambda el : el.delivery_deadline)
+    # Scheduled management updates (package arrivals, address corrections,
+    # deadline changes, and truck recalls).
+    update_schedule = UpdateSchedule()
 
-    # Import map data.
-    imports.import_distance_map_to_graph(graph, graph.vertices,
-                                         "map_import_data.csv")
-    # Import package data.
-    imports.import_packages_to_hashtable(packages_hashtable, packages,
-                                         "package_import_data.csv")
+    # Hashtable of all packages.
+    packages_hashtable = OpenAddressingHashTable(40,lambda el : el.package_id)
+
+    # Packages received at the hub, and the order each package first
+    # arrived there in by package id.
+    packages_at_hub = KeyedMinHeap(get_hub_priority)
+    hub_arrival_order = {}
+
+    # Import map and package data, from the snapshot if it is up to date.
+    if scenario.snapshot_filename == None:
+        imports.import_distance_map_to_graph(graph, graph.vertices,
+                                             scenario.map_filename)
+        imports.import_packages_to_hashtable(packages_hashtable, packages,
+                                             scenario.package_filename)
+        imports.link_packages_to_graph(packages, graph.vertices)
+    else:
+        imports.import_with_snapshot(graph, graph.vertices, packages_hashtable,
+                                     packages, scenario.map_filename,
+                                     scenario.package_filename,
+                                     scenario.snapshot_filename)
+    # Import management update data.
+    # Address corrections to addresses that are not on the map are rejected.
+    imports.import_management_updates_to_schedule(update_schedule,
+                                                  scenario.update_filename,
+                                                  graph.vertices)
     # Locate the HUB.
     hub_address = "4001 South 700 East (84107)"
     hub_vertex = graph.vertices.get(hub_address)
 
-    # Initialize truck variables.
-    max_packages = 16
-    truck_speed = 18
-    trucks = []
-    truck1 = Truck(1,hub_vertex,max_packages,truck_speed)
-    truck2 = Truck(2,hub_vertex,max_packages,truck_speed)
-    trucks.append(truck1)
-    trucks.append(truck2)
+    # Routes planned on this map, so a truck given the same stops again is
+    # not rerouted. The cache is kept for the next simulation in this process
+    # if it uses the same, unchanged map file.
+    map_source = (os.path.abspath(scenario.map_filename),
+                  os.path.getmtime(scenario.map_filename))
+    if scenario.route_cache_size <= 0:
+        route_cache = None
+    elif (route_cache != None and route_cache.source == map_source
+            and route_cache.routes.capacity == scenario.route_cache_size):
+        route_cache.attach(graph)
+    else:
+        route_cache = route_planning.RouteCache(
+            graph, scenario.route_cache_size, map_source)
+
+    # Route optimization strategy used when planning truck routes (see
+    # utilities.route_optimization.STRATEGIES). "deadline" orders stops by
+    # their delivery deadlines.
+    routing_strategy = scenario.routing_strategy
+
+    # How packages at the hub are divided between trucks. "sequential" fills
+    # one truck at a time; "fleet" assigns packages to all trucks at once.
+    loading_strategy = scenario.loading_strategy
+
+    # Seconds to spend improving each route, or None to stop after a fixed
+    # number of moves, so the routes are the same on every run. The serial
+    # and parallel planners use the same value.
+    planning_time_budget = scenario.planning_time_budget
+
+    # Whether a truck's route is changed in place when it is recalled or a
+    # package's address is corrected, rather than planned again, and how
+    # many local search moves then improve it.
+    incremental_rerouting = scenario.incremental_rerouting
+    rerouting_polish_iterations = scenario.rerouting_polish_iterations
+
+    # Trucks holding a package whose address was corrected.
+    trucks_to_reroute = set()
+
+    # Position of each package destination when going from the hub to the
+    # next closest destination, used to load nearby EOD packages together
+    # (see get_hub_priority). Fleet loading orders them by distance instead.
+    hub_load_order = None
+    if loading_strategy != "fleet":
+        destinations = {p.vertex_id for p in packages if p.vertex_id != None}
+        order = route_planning.order_stops(hub_vertex.id, list(destinations),
+                                           graph.distance_matrix())
+        hub_load_order = {vertex_id: i for i, vertex_id in enumerate(order)}
 
-    # Set time variables.
-    current_time = convert_standard_time_to_minutes("08:00:00 AM")
-    EOD = convert_standard_time_to_minutes("05:00:00 PM")
+    trucks = []
+    for number in range(1, scenario.truck_count + 1):
+        trucks.append(Truck(number, hub_vertex, scenario.max_packages,
+                            scenario.truck_speed))
 
-    # Set how often program checks for updates from the admin (in minutes).
-    time_segment = 5
+    EOD = scenario.end_time
 
     # Receive packages at the hub and load to specified trucks if needed as per
-    # the special notes.
+    # the special notes. Packages staying at the hub are added to the heap in
+    # one O(n) build after the loop.
     # Time complexity: O(n)
     # Space complexity: O(n)
-    packages_remaining = []
+    arrived_at_hub = []
     for package in packages:
+        # Fleet assignment handles packages restricted to a truck or that must
+        # be delivered together, so they wait at the hub with the others.
+        if (loading_strategy == "fleet"
+                and (package.special_notes == ""
+                     or fleet_assignment.get_required_truck(package) != None
+                     or len(fleet_assignment.get_delivered_with(package)) > 0)):
+            package.status = Package.ARRIVED_AT_HUB
+            arrived_at_hub.append(package)
         # Place all packages that need to be delivered together on one truck.
-        if package.package_id in [13, 14, 15, 16, 19, 20]:
-            package.status = "Out for delivery"
-            truck1.packages.append(package)
+        elif package.package_id in [13, 14, 15, 16, 19, 20]:
+            package.status = Package.OUT_FOR_DELIVERY
+            trucks[0].add_package(package)
         # Place all packages that must be delivered on truck 2 on truck 2.
         elif package.special_notes == "Can only be on truck 2":
-            package.status = "Out for delivery"
-            truck2.packages.append(package)
+            package.status = Package.OUT_FOR_DELIVERY
+            trucks[1].add_package(package)
         # Add packages without any other special notes to the packages at the hub.
         elif package.special_notes == "":
-            package.status = "Arrived at HUB"
-            packages_at_hub.push(package)
+            package.status = Package.ARRIVED_AT_HUB
+            arrived_at_hub.append(package)
         # The packages that have not arrived to the hub or are pending destination
-        # address updates will remian in the packages queue.
+        # address updates will arrive through the update schedule.
         else:
-            package.status = "Shipping to HUB"
-            packages_remaining.append(package)
-    packages = packages_remaining
+            package.status = Package.SHIPPING_TO_HUB
+    receive_packages_at_hub(arrived_at_hub)
+
+    # Fail now, rather than part way through the day, if fleet assignment
+    # could never place some packages on a truck.
+    if loading_strategy == "fleet":
+        fleet_assignment.check_packages(trucks, packages, graph)
+
+    # Load the trucks with packages and set their routes. With more than one
+    # planning worker, the routes of the trucks are planned in parallel (see
+    # utilities.route_planning).
+    if scenario.planning_workers > 1:
+        with route_planning.RoutePlanner(
+                graph, scenario.planning_workers,
+                planning_time_budget) as planner:
+            load_trucks(trucks, packages_at_hub, graph, scenario.start_time,
+                        routing_strategy, loading_strategy, planner)
+    else:
+        load_trucks(trucks, packages_at_hub, graph, scenario.start_time,
+                    routing_strategy, loading_strategy)
+
+    return trucks
+
+if __name__ == '__main__':
 
-    # Load the trucks with packages and set their routes.
-    load_trucks(trucks, packages_at_hub, graph)
+    # Settings of the simulation: two trucks holding 16 packages each and
+    # driving at 18 miles per hour, with the hub checked for updates every 5
+    # minutes from 08:00:00 AM until 05:00:00 PM (see models.Scenario).
+    scenario = Scenario()
+
+    # Set to True to time each phase of the day per truck and count Dijkstra
+    # searches, heap operations, hash lookups, and reroutes (see
+    # utilities.instrumentation). A summary is printed at EOD and a JSON trace
+    # is written to simulation_trace.json.
+    instrument = False
+    if instrument:
+        instrumentation.enable(sys.modules[__name__], tracing=True)
+
+    # Import the data, receive packages at the hub, and load the trucks.
+    trucks = set_up_simulation(scenario)
+    current_time = scenario.start_time
 
     # Control variable for the user interface.
     run_until = [convert_standard_time_to_minutes("08:00:00 AM")]
     print()
     print("Welcome to the package delivery system!")
 
-    # Deliver packages from 08:00:00 AM until EOD at 05:00:00 PM. For each truck,
-    # move the truck along the map for 5 minutes, then switch to the next truck.
-    # Deliver packages at each vertex as the trucks moves across the map. Once a
-    # truck has delivered all it's packages, it will go back to the HUB and pick
-    # up more to deliver if any are left.
-    while current_time < EOD:
-
-        if current_time >= run_until[0]:
-            program_interface(trucks, current_time, run_until)
-
-        # Check for packages received at the hub or other management updates.
-        management_updates_at_hub(current_time)
-
-        # For each truck, move the truck along the map for 5 minutes, then switch
-        # to the next truck.
-        for truck in trucks:
-            time = current_time
-            stop_time = min((time + time_segment), EOD)
-
-            # While the truck has scheduled destinations left to visit and time
-            # is less than the stop time (current time + 5 minutes).
-            while not truck.destinations.is_empty() and time < stop_time:
-
-                # Determine the amount of time needed to get to the next destination.
-                time_to_next_stop = truck.dist_to_next_vertex * 60 / truck.speed
-
-                # If the truck can get to the next destination before the stop_time.
-                if time + time_to_next_stop < stop_time:
-
-                    # Update time.
-                    time = time + time_to_next_stop
-
-                    # Update the truck's location and mileage.
-                    truck.location = truck.destinations.pop()
-                    truck.mileage += truck.dist_to_next_vertex
-
-                    # Check for updates to package priorities including delivery
-                    # deadlines and delivery locations.
-                    management_updates_for_trucks(truck, time)
-
-                    # If the truck happens to be at the hub, check if there are more
-                    # packages available for delivery and load the truck as needed.
-                    if truck.location == hub_vertex:
-                        if not packages_at_hub.is_empty():
-                            load_trucks([truck], packages_at_hub, graph)
-                    # If the truck is not at the hub, check if there are packages
-                    # to deliver at the current location.
-                    else:
-                        deliver_packages(truck, truck.location, time)
-
-                    # If the truck has more destinations to visit, update the
-                    # truck's distance to the next destination and continue.
-                    if not truck.destinations.is_empty():
-                        truck.dist_to_next_vertex = graph.edge_weights[
-                            (truck.location, truck.destinations.peek())
-                        ]
-
-                    # If the truck has no more scheduled destinations to visit.
-                    else:
-
-                        # If the truck is not at the hub, head back to the hub.
-                        if truck.location != hub_vertex:
-                            set_destinations_for_truck(truck, [], hub_address, graph)
-
-                        # If the truck is at the hub.
-                        else:
-
-                            # If there are more packages at the hub, load the truck
-                            # and continue.
-                            if not packages_at_hub.is_empty():
-                                load_trucks([truck], packages_at_hub, graph)
-
-                # If the truck cannot get to the next destination before the stop
-                # time, update the truck's mileage and distance to the next stop.
-                else:
-                    truck.dist_to_next_vertex -= (stop_time - time) * truck.speed / 60
-                    truck.mileage += (stop_time - time) * truck.speed / 60
-                    time = stop_time
-
-            # If packages come later on in the day and the truck is sitting at the
-            # hub, load the truck and continue delivering packages.
-            if (truck.destinations.is_empty()
-                    and truck.location == hub_vertex
-                    and not packages_at_hub.is_empty()):
-                load_trucks([truck], packages_at_hub, graph)
-
-        # Move time along by the time segment (5 minutes).
-        current_time += time_segment
+    # Deliver packages from 08:00:00 AM until EOD at 05:00:00 PM. Trucks move
+    # along the map delivering packages at each vertex. Once a truck has
+    # delivered all it's packages, it will go back to the HUB and pick up more
+    # to deliver if any are left.
+    current_time = run_simulation(trucks, current_time, EOD,
+                                  scenario.time_segment, run_until)
 
     # Print status of all packages at EOD.
     print("Current time:", convert_minutes_to_standard_time(current_time))
@@ -560,6 +1076,14 @@ if __name__ == '__main__':
     print()
 
     # Print location and mileage of trucks at EOD.
-    print("Truck 1 location: " + truck1.location.data + ", mileage: {:0.2f}".format(truck1.mileage))
-    print("Truck 2 location: " + truck2.location.data + ", mileage: {:0.2f}".format(truck2.mileage))
-    print("Total mileage: {:0.2f}".format(truck1.mileage + truck2.mileage))
+    for truck in trucks:
+        print("Truck " + str(truck.number) + " location: "
+              + truck.location.data + ", mileage: {:0.2f}".format(truck.mileage))
+    print("Total mileage: {:0.2f}".format(sum(truck.mileage for truck in trucks)))
+
+    # Print where the time went during the day.
+    if instrument:
+        instrumentation.disable()
+        print()
+        instrumentation.print_summary()
+        instrumentation.write_json("simulation_trace.json")
@@ -0,0 +1,24 @@
+"""Object to represent an event in the delivery simulation."""
+
+class Event:
+
+    # Kinds of events.
+    PROMPT = "prompt"
+    HUB_UPDATE = "hub update"
+    ARRIVAL = "arrival"
+    LOAD = "load"
+
+    def __init__(self, time, kind, priority, truck=None):
+        """Initialize an event object.
+
+        Keyword arguments:
+        time -- the time at which the event happens.
+        kind -- the kind of event (PROMPT, HUB_UPDATE, ARRIVAL, or LOAD).
+        priority -- a tuple used to order events that are due.
+        truck -- the truck the event applies to, if any.
+        """
+        self.time = time
+        self.kind = kind
+        self.priority = priority
+        self.truck = truck
+        self.sequence = 0
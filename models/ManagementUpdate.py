@@ -0,0 +1,66 @@
+"""Object to represent a timed management update to packages or trucks."""
+
+class ManagementUpdate:
+
+    # Kinds of updates.
+    ARRIVE = "arrive"
+    CORRECT_ADDRESS = "correct_address"
+    CHANGE_DEADLINE = "change_deadline"
+    RECALL_TRUCKS = "recall_trucks"
+
+    # The fields each kind of update needs.
+    REQUIRED_FIELDS = {ARRIVE: ("package_id",),
+                       CORRECT_ADDRESS: ("package_id", "address", "zip"),
+                       CHANGE_DEADLINE: ("package_id", "deadline"),
+                       RECALL_TRUCKS: ("until",)}
+
+    def __init__(self, time, action, package_id=None, address=None, city=None,
+                 state=None, zip=None, deadline=None, until=None):
+        """Initialize a management update object.
+
+        Keyword arguments:
+        time -- the time (in minutes) at which the update takes effect.
+        action -- the kind of update (ARRIVE, CORRECT_ADDRESS, CHANGE_DEADLINE,
+                  or RECALL_TRUCKS).
+        package_id -- the id of the package the update applies to.
+        address -- the corrected street address (CORRECT_ADDRESS).
+        city -- the corrected city (CORRECT_ADDRESS).
+        state -- the corrected state (CORRECT_ADDRESS).
+        zip -- the corrected zip code (CORRECT_ADDRESS).
+        deadline -- the new delivery deadline in minutes (CHANGE_DEADLINE).
+        until -- the end of the time window in minutes (RECALL_TRUCKS).
+        """
+        self.time = time
+        self.action = action
+        self.package_id = package_id
+        self.address = address
+        self.city = city
+        self.state = state
+        self.zip = zip
+        self.deadline = deadline
+        self.until = until
+        self.sequence = 0
+
+    def validate(self):
+        """
+        Raise ValueError if the update's action is unknown, a field its
+        action needs is missing, or a recall window ends before it starts.
+        """
+        required_fields = self.REQUIRED_FIELDS.get(self.action)
+        if required_fields == None:
+            raise ValueError("unknown action {!r}.".format(self.action))
+        for field in required_fields:
+            if getattr(self, field) == None:
+                raise ValueError("{} is missing its {}.".format(self.action,
+                                                                 field))
+        if self.action == self.RECALL_TRUCKS and self.until < self.time:
+            raise ValueError("recall_trucks until is before its time.")
+
+    def get_address_and_zip(self):
+        """
+        Return the corrected address as packages key it, or None if the
+        update has no address (see models.Package).
+        """
+        if self.address == None or self.zip == None:
+            return None
+        return self.address + " (" + self.zip + ")"
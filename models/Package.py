@@ -1,10 +1,33 @@
 """Object to represent a package"""
 
+import sys
+
 class Package:
 
-    def __init__(self, package_id, address, city, state, zip, delivery_deadline, mass, special_notes, status="Not Delivered", delivered_time=None):
+    # Status codes. A small int is stored per package instead of a string.
+    NOT_DELIVERED = 0
+    SHIPPING_TO_HUB = 1
+    ARRIVED_AT_HUB = 2
+    OUT_FOR_DELIVERY = 3
+    DELIVERED_ON_TIME = 4
+    DELIVERED_LATE = 5
+
+    # Name of each status code, as printed in reports.
+    STATUS_NAMES = ("Not Delivered", "Shipping to HUB", "Arrived at HUB",
+                    "Out for delivery", "DELIVERED ON TIME", "DELIVERED LATE")
+
+    # Packages have no __dict__, so each one only takes space for these
+    # fields.
+    __slots__ = ("package_id", "address", "city", "state", "zip",
+                 "delivery_deadline", "mass", "special_notes", "status",
+                 "delivered_time", "address_and_zip", "vertex_id")
+
+    def __init__(self, package_id, address, city, state, zip, delivery_deadline, mass, special_notes, status=NOT_DELIVERED, delivered_time=None):
         """Initialize a package object.
 
+        Address strings are interned, so packages going to the same place
+        share one copy of each string.
+
         Keyword arguments:
         package_id -- the id of the package.
         address -- the street address of the delivery location.
@@ -14,17 +37,33 @@ class Package:
         delivery_deadline -- the delivery deadline of the package.
         mass -- the mass of the package.
         special_notes -- any special notes associated with the package.
-        state -- the status of the package in regard to delivery.
+        status -- the status code of the package in regard to delivery.
         delivered_time -- the time the package was delivered.
         """
         self.package_id = package_id
-        self.address = address
-        self.city = city
-        self.state = state
-        self.zip = zip
         self.delivery_deadline = delivery_deadline
         self.mass = mass
-        self.special_notes = special_notes
+        self.special_notes = sys.intern(special_notes)
         self.status = status
         self.delivered_time = delivered_time
-        self.address_and_zip = address + " (" + zip + ")"
+        self.set_address(address, city, state, zip)
+
+    def set_address(self, address, city, state, zip):
+        """
+        Change the delivery location of the package.
+
+        The vertex id is cleared, since the new address may be at a different
+        vertex; see utilities.imports.link_packages_to_graph.
+        """
+        self.address = sys.intern(address)
+        self.city = sys.intern(city)
+        self.state = sys.intern(state)
+        self.zip = sys.intern(zip)
+        self.address_and_zip = sys.intern(address + " (" + zip + ")")
+
+        # Id of the graph vertex at the delivery address, or None if unknown.
+        self.vertex_id = None
+
+    def get_status_name(self):
+        """Return the name of the package's status."""
+        return Package.STATUS_NAMES[self.status]
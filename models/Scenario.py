@@ -0,0 +1,68 @@
+"""Object to represent the settings of one run of the delivery simulation."""
+
+from utilities.time import convert_standard_time_to_minutes
+
+class Scenario:
+
+    def __init__(self, name="", truck_count=2, max_packages=16, truck_speed=18,
+                 time_segment=5, routing_strategy="greedy",
+                 loading_strategy="sequential", planning_workers=1,
+                 planning_time_budget=None, route_cache_size=1024,
+                 incremental_rerouting=True, rerouting_polish_iterations=0,
+                 start_time=convert_standard_time_to_minutes("08:00:00 AM"),
+                 end_time=convert_standard_time_to_minutes("05:00:00 PM"),
+                 map_filename="map_import_data.csv",
+                 package_filename="package_import_data.csv",
+                 update_filename="update_import_data.csv",
+                 snapshot_filename="import_data.snapshot"):
+        """Initialize a scenario object.
+
+        The defaults are the settings of the interactive program.
+
+        Keyword arguments:
+        name -- a label for the scenario, copied to its result.
+        truck_count -- the number of trucks, numbered from 1.
+        max_packages -- the maximum packages each truck can hold.
+        truck_speed -- the speed of each truck in miles per hour.
+        time_segment -- how often (in minutes) the hub checks for updates.
+        routing_strategy -- the route optimization strategy (see
+                            utilities.route_optimization.STRATEGIES).
+        loading_strategy -- "sequential" or "fleet" (see main.load_trucks).
+        planning_workers -- the number of processes used to plan the routes
+                            of the trucks leaving the hub in the morning.
+        planning_time_budget -- seconds to spend improving each route, or
+                                None to stop after a fixed number of moves
+                                so routes are the same on every run.
+        route_cache_size -- the number of planned routes kept for reuse (0
+                            to plan every route again).
+        incremental_rerouting -- whether a truck's route is changed in place
+                                 when it is recalled or a package's address
+                                 is corrected, instead of planned again.
+        rerouting_polish_iterations -- the most 2-opt and or-opt moves made
+                                       after changing a route in place.
+        start_time -- the time in minutes at which deliveries start.
+        end_time -- the time in minutes at which deliveries stop (EOD).
+        map_filename -- the map file to import.
+        package_filename -- the package file to import.
+        update_filename -- the management update file to import.
+        snapshot_filename -- the snapshot of the map and package files, or
+                             None to always parse the CSV files.
+        """
+        self.name = name
+        self.truck_count = truck_count
+        self.max_packages = max_packages
+        self.truck_speed = truck_speed
+        self.time_segment = time_segment
+        self.routing_strategy = routing_strategy
+        self.loading_strategy = loading_strategy
+        self.planning_workers = planning_workers
+        self.planning_time_budget = planning_time_budget
+        self.route_cache_size = route_cache_size
+        self.incremental_rerouting = incremental_rerouting
+        self.rerouting_polish_iterations = rerouting_polish_iterations
+        self.start_time = start_time
+        self.end_time = end_time
+        self.map_filename = map_filename
+        self.package_filename = package_filename
+        self.update_filename = update_filename
+        self.snapshot_filename = snapshot_filename
@@ -0,0 +1,53 @@
+"""Object to represent the outcome of one run of the delivery simulation."""
+
+class SimulationResult:
+
+    def __init__(self, name, on_time_count, late_count, undelivered_count,
+                 truck_mileage, total_lateness, max_lateness, late_package_ids,
+                 end_time, route_cache_stats=None):
+        """Initialize a simulation result object.
+
+        Keyword arguments:
+        name -- the name of the scenario that was run.
+        on_time_count -- the number of packages delivered on time.
+        late_count -- the number of packages delivered late.
+        undelivered_count -- the number of packages not delivered by EOD.
+        truck_mileage -- a list of the mileage of each truck, by number.
+        total_lateness -- the sum of the minutes by which late packages
+                          missed their deadlines.
+        max_lateness -- the most minutes by which a package was late.
+        late_package_ids -- a list of the ids of the late packages.
+        end_time -- the time in minutes at which the simulation stopped.
+        route_cache_stats -- the hits, misses, and size of the route cache
+                             (see LRUCache.get_stats), or None if no cache
+                             was used. The cache is shared by the runs in a
+                             process that use the same map, so its counts
+                             include those runs.
+        """
+        self.name = name
+        self.on_time_count = on_time_count
+        self.late_count = late_count
+        self.undelivered_count = undelivered_count
+        self.truck_mileage = truck_mileage
+        self.total_mileage = sum(truck_mileage)
+        self.total_lateness = total_lateness
+        self.max_lateness = max_lateness
+        self.late_package_ids = late_package_ids
+        self.end_time = end_time
+        self.route_cache_stats = route_cache_stats
+
+    def to_dict(self):
+        """Return the fields of the result as a dictionary, e.g. for JSON."""
+        return {
+            "name": self.name,
+            "on_time_count": self.on_time_count,
+            "late_count": self.late_count,
+            "undelivered_count": self.undelivered_count,
+            "truck_mileage": list(self.truck_mileage),
+            "total_mileage": self.total_mileage,
+            "total_lateness": self.total_lateness,
+            "max_lateness": self.max_lateness,
+            "late_package_ids": list(self.late_package_ids),
+            "end_time": self.end_time,
+            "route_cache_stats": self.route_cache_stats,
+        }
@@ -1,9 +1,7 @@
 """A truck object used to move across a graph and deliver packages."""
 
-from datastructures.MinHeap import *
+from datastructures.PackageIndex import PackageIndex
 from datastructures.Stack import Stack
-from datastructures.HashTable import HashTable
-from datastructures.Queue import Queue
 
 class Truck:
     def __init__(self, number, location, max_packages=18, speed=16, mileage=0):
@@ -24,20 +22,91 @@ class Truck:
         self.location = location
         self.mileage = mileage
         self.dist_to_next_vertex = 0
-        self.packages = []
+        # Packages on the truck, indexed by id and by destination vertex id.
+        self.packages = PackageIndex()
         self.destinations = Stack()
+        # Ids of the vertices the current route was planned to stop at that
+        # the truck has not reached yet. The other destinations are vertices
+        # the truck passes through on the way.
+        self.stop_ids = set()
 
     def add_package(self, package):
         """Load a package onto the truck."""
         if len(self.packages) < self.max_packages:
-            self.packages.append(package)
+            self.packages.add(package)
             return True
         else:
             return False
 
+    def get_package(self, package_id):
+        """Return the package with an id if it is on the truck, else None."""
+        return self.packages.get(package_id)
+
+    def remove_package(self, package_id):
+        """Unload and return the package with an id; None if not on the truck."""
+        return self.packages.remove(package_id)
+
+    def unload_packages_at(self, vertex):
+        """
+        Unload and return a list of the packages addressed to a vertex.
+
+        Time complexity: O(k) where k is the number of packages unloaded.
+        """
+        return self.packages.remove_at_vertex(vertex.id)
+
     def is_full(self):
         """Return whether or not the truck is full."""
         if len(self.packages) >= self.max_packages:
             return True
         else:
             return False
+
+    def set_route(self, path, stops, graph):
+        """
+        Set the truck's destinations to a path that starts at its location.
+
+        Keyword arguments:
+        path -- a list of vertices, starting with the truck's location.
+        stops -- the vertices in the path the route was planned to stop at,
+                 including its end.
+        graph -- the graph containing the vertices.
+        """
+
+        # Load the destinations onto the destinations stack, so the first
+        # destination is on top. The truck is already at the first vertex.
+        self.destinations = Stack.from_iterable(reversed(path[1:]))
+        self.stop_ids = {vertex.id for vertex in stops}
+
+        # Determine the truck's distance to the next destination.
+        if not self.destinations.is_empty():
+            self.dist_to_next_vertex = graph.edge_weight(
+                self.location, self.destinations.peek())
+
+    def move_to_next_vertex(self):
+        """Move the truck to its next destination and return the vertex."""
+        self.location = self.destinations.pop()
+        self.stop_ids.discard(self.location.id)
+        return self.location
+
+    def get_tour(self):
+        """
+        Return the truck's location and remaining stops as a list of vertex
+        ids, ending with the end of its route.
+
+        Time complexity: O(P) where P is the number of destinations.
+        """
+
+        tour = [self.location.id]
+        path = self.destinations.items()
+        if len(path) == 0:
+            return tour
+
+        # The stack's top is the last item, so walk it backwards.
+        seen = set()
+        for i in range(len(path) - 1, 0, -1):
+            vertex_id = path[i].id
+            if vertex_id in self.stop_ids and vertex_id not in seen:
+                seen.add(vertex_id)
+                tour.append(vertex_id)
+        tour.append(path[0].id)
+        return tour
@@ -0,0 +1,97 @@
+"""Schedule of timed management updates."""
+
+import bisect
+
+from datastructures.MinHeap import MinHeap
+from models.ManagementUpdate import ManagementUpdate
+
+class UpdateSchedule:
+    def __init__(self):
+        """
+        Initialize an update schedule.
+
+        Package updates are kept in a min heap ordered by the time they take
+        effect (updates with the same time keep the order they were added),
+        so only the updates that are due need to be looked at. Truck recall
+        windows are kept as sorted, non-overlapping [start, end] windows.
+        """
+
+        self.updates = MinHeap(lambda el : (el.time, el.sequence))
+        self.count = 0
+        self.recall_windows = []
+
+    def add(self, update):
+        """
+        Add a management update to the schedule.
+
+        Raises ValueError if the update is not valid (see
+        ManagementUpdate.validate).
+
+        Time complexity: O(log n) for package updates, O(w) for recall windows
+        where w is the number of recall windows.
+        """
+
+        update.validate()
+        if update.action == ManagementUpdate.RECALL_TRUCKS:
+            self.add_recall_window(update.time, update.until)
+        else:
+            update.sequence = self.count
+            self.count += 1
+            self.updates.push(update)
+
+    def add_recall_window(self, start, end):
+        """
+        Add a recall window, merging it with any windows it overlaps.
+
+        Raises ValueError if the window has no end or ends before it starts.
+        """
+
+        if end == None or end < start:
+            raise ValueError("recall window [{}, {}] is not valid.".format(
+                start, end))
+
+        windows = []
+        for window in self.recall_windows:
+            if window[1] < start or window[0] > end:
+                windows.append(window)
+            else:
+                start = min(start, window[0])
+                end = max(end, window[1])
+        windows.append([start, end])
+        windows.sort(key=lambda el : el[0])
+        self.recall_windows = windows
+
+    def next_time(self):
+        """Return the time of the next package update; None if none left."""
+
+        update = self.updates.peek()
+        if update == None:
+            return None
+        return update.time
+
+    def pop_due(self, time) -> []:
+        """
+        Remove and return the package updates that take effect by a time.
+
+        Time complexity: O(u log n) where u is the number of updates returned.
+        """
+
+        due = []
+        while not self.updates.is_empty() and self.updates.peek().time <= time:
+            due.append(self.updates.pop())
+        return due
+
+    def is_recalling(self, time):
+        """
+        Return whether trucks are recalled to the hub at a time.
+
+        Time complexity: O(log w) where w is the number of recall windows.
+        """
+
+        index = bisect.bisect_right(self.recall_windows, [time, float('inf')]) - 1
+        return index >= 0 and self.recall_windows[index][1] >= time
+
+    def is_empty(self):
+        """Return whether or not there are package updates left."""
+
+        return self.updates.is_empty()
@@ -0,0 +1,77 @@
+"""Tests for datastructures.KeyedMinHeap."""
+
+import random
+import unittest
+
+from datastructures.KeyedMinHeap import KeyedMinHeap
+
+class Item:
+    """An item whose priority can be changed after it is pushed."""
+
+    def __init__(self, priority):
+        self.priority = priority
+
+class KeyedMinHeapTest(unittest.TestCase):
+
+    def make_heap(self, priorities):
+        heap = KeyedMinHeap(lambda el : el.priority)
+        items = [Item(priority) for priority in priorities]
+        for item in items:
+            heap.push(item)
+        return heap, items
+
+    def assert_positions(self, heap):
+        """Check that the index map matches the items' indexes."""
+
+        self.assertEqual(len(heap.positions), len(heap.list))
+        for index, item in enumerate(heap.list):
+            self.assertEqual(heap.positions[id(item)], index)
+
+    def pop_priorities(self, heap):
+        priorities = []
+        while not heap.is_empty():
+            priorities.append(heap.pop().priority)
+        return priorities
+
+    def test_update_moves_item_up(self):
+        heap, items = self.make_heap([5, 3, 8, 1, 9, 7])
+        items[4].priority = 0
+        self.assertTrue(heap.update(items[4]))
+        self.assert_positions(heap)
+        self.assertIs(heap.peek(), items[4])
+        self.assertEqual(self.pop_priorities(heap), [0, 1, 3, 5, 7, 8])
+
+    def test_update_moves_item_down(self):
+        heap, items = self.make_heap([5, 3, 8, 1, 9, 7])
+        items[3].priority = 10
+        self.assertTrue(heap.update(items[3]))
+        self.assert_positions(heap)
+        self.assertEqual(self.pop_priorities(heap), [3, 5, 7, 8, 9, 10])
+
+    def test_update_missing_item(self):
+        heap, items = self.make_heap([2, 1])
+        popped = heap.pop()
+        self.assertFalse(heap.contains(popped))
+        self.assertFalse(heap.update(popped))
+        self.assertFalse(heap.update(Item(0)))
+        self.assertTrue(heap.contains(items[0]))
+        self.assert_positions(heap)
+
+    def test_random_updates(self):
+        rng = random.Random(1)
+        heap = KeyedMinHeap(lambda el : el.priority)
+        items = [Item(rng.randrange(100)) for _ in range(50)]
+        heap.push_many(items[:10])
+        heap.push_many(items[10:])
+        self.assert_positions(heap)
+        for _ in range(200):
+            item = rng.choice(items)
+            item.priority = rng.randrange(100)
+            self.assertTrue(heap.update(item))
+        self.assert_positions(heap)
+        self.assertEqual(self.pop_priorities(heap),
+                         sorted(item.priority for item in items))
+        self.assertEqual(heap.positions, {})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+"""Tests for datastructures.OpenAddressingHashTable."""
+
+import unittest
+
+from datastructures.OpenAddressingHashTable import (DELETED,
+                                                    OpenAddressingHashTable)
+from datastructures.Node import Node
+
+class CollidingHasher:
+    """A KeyHasher that gives every key the same hash, so all keys probe."""
+
+    def hash_key(self, key):
+        return 0
+
+class OpenAddressingHashTableTest(unittest.TestCase):
+
+    def make_table(self, size=8, hasher=None):
+        return OpenAddressingHashTable(size, lambda el : el.data,
+                                       hasher=hasher)
+
+    def test_resize_keeps_items(self):
+        table = self.make_table()
+        capacity = table.capacity
+        nodes = [Node(i) for i in range(1000)]
+        for node in nodes:
+            table.add(node)
+
+        self.assertGreater(table.capacity, capacity)
+        self.assertLessEqual(table.used,
+                             table.capacity * table.max_load_factor)
+        self.assertEqual(table.get_length(), 1000)
+        for node in nodes:
+            self.assertIs(table.get(node.data), node)
+            self.assertIs(table.get(node.data, table.hash(node.data)), node)
+        self.assertIsNone(table.get(1000))
+
+    def test_remove_leaves_tombstone(self):
+        table = self.make_table(hasher=CollidingHasher())
+        nodes = [Node(i) for i in range(4)]
+        for node in nodes:
+            table.add(node)
+
+        # Every key probes from slot 0, so key 3 is found past the
+        # removed key 1.
+        self.assertIs(table.remove(1), nodes[1])
+        self.assertIs(table.keys[1], DELETED)
+        self.assertIsNone(table.get(1))
+        self.assertIsNone(table.remove(1))
+        self.assertIs(table.get(3), nodes[3])
+        self.assertEqual(table.get_length(), 3)
+
+        # A new item takes the first removed slot.
+        node = Node(4)
+        table.add(node)
+        self.assertIs(table.keys[1], 4)
+        self.assertIs(table.get(4), node)
+
+    def test_tombstones_cleared_without_growing(self):
+        table = self.make_table()
+        capacity = table.capacity
+        for i in range(100):
+            table.add(Node(i))
+            self.assertIsNotNone(table.remove(i))
+
+        # Removed items are cleared by resizing to the same capacity, since
+        # the table never holds more than one item.
+        self.assertEqual(table.capacity, capacity)
+        self.assertEqual(table.get_length(), 0)
+        self.assertLessEqual(table.used,
+                             table.capacity * table.max_load_factor)
+
+    def test_get_all_skips_tombstones(self):
+        table = self.make_table(hasher=CollidingHasher())
+        nodes = [Node("a"), Node("b"), Node("a"), Node("a")]
+        for node in nodes:
+            table.add(node)
+        table.remove("a")
+
+        found = []
+        node = table.get_all("a")
+        while node != None:
+            found.append(node.data)
+            node = node.next
+        self.assertEqual(found, [nodes[2], nodes[3]])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+"""Tests for utilities.route_planning."""
+
+import random
+import unittest
+
+from benchmarks import generators
+from models.Truck import Truck
+from utilities import route_planning
+from utilities.route_optimization import route_length
+
+# Distances between four points on a line, at 0, 1, 2, and 10 miles.
+LINE = [[0, 1, 2, 10],
+        [1, 0, 1, 9],
+        [2, 1, 0, 8],
+        [10, 9, 8, 0]]
+
+class InsertAndRemoveStopTest(unittest.TestCase):
+
+    def test_insert_stop_where_it_adds_least(self):
+        tour = [0, 2, 3, 0]
+        self.assertEqual(route_planning.insert_stop(tour, 1, LINE), 1)
+        self.assertEqual(tour, [0, 1, 2, 3, 0])
+
+    def test_insert_stop_keeps_ends(self):
+        # Starting at 0 would add the least distance, but the start and end
+        # stay in place.
+        tour = [1, 2]
+        self.assertEqual(route_planning.insert_stop(tour, 0, LINE), 1)
+        self.assertEqual(tour, [1, 0, 2])
+
+    def test_insert_stop_ties_take_first_index(self):
+        # 1 is on the way both to and from 2.
+        tour = [0, 2, 0]
+        self.assertEqual(route_planning.insert_stop(tour, 1, LINE), 1)
+        self.assertEqual(tour, [0, 1, 2, 0])
+
+    def test_remove_stop(self):
+        tour = [0, 1, 2, 1, 0]
+        self.assertTrue(route_planning.remove_stop(tour, 1))
+        self.assertEqual(tour, [0, 2, 1, 0])
+        self.assertFalse(route_planning.remove_stop(tour, 3))
+        self.assertEqual(tour, [0, 2, 1, 0])
+
+    def test_remove_stop_keeps_ends(self):
+        tour = [0, 1, 0]
+        self.assertFalse(route_planning.remove_stop([0, 1, 2], 2))
+        self.assertTrue(route_planning.remove_stop(tour, 1))
+        self.assertFalse(route_planning.remove_stop(tour, 0))
+        self.assertEqual(tour, [0, 0])
+
+class TruckStopTest(unittest.TestCase):
+
+    def setUp(self):
+        self.graph = generators.make_road_graph(49)
+        self.vertices = self.graph.vertex_list
+        self.truck = Truck(1, self.vertices[0])
+        route_planning.set_truck_tour(self.truck, [0, 10, 30, 0], self.graph)
+
+    def test_insert_truck_stop(self):
+        distance = self.graph.distance_matrix()
+        self.assertTrue(route_planning.insert_truck_stop(
+            self.truck, self.vertices[20], self.graph))
+        tour = self.truck.get_tour()
+        self.assertEqual(sorted(tour[1:-1]), [10, 20, 30])
+        self.assertEqual((tour[0], tour[-1]), (0, 0))
+
+        expected = [0, 10, 30, 0]
+        route_planning.insert_stop(expected, 20, distance)
+        self.assertEqual(tour, expected)
+        self.assertEqual(self.truck.stop_ids, {10, 20, 30, 0})
+
+        # The truck already stops there.
+        self.assertFalse(route_planning.insert_truck_stop(
+            self.truck, self.vertices[20], self.graph))
+
+    def test_remove_truck_stop(self):
+        self.assertTrue(route_planning.remove_truck_stop(
+            self.truck, self.vertices[10], self.graph))
+        self.assertEqual(self.truck.get_tour(), [0, 30, 0])
+        self.assertEqual(self.truck.stop_ids, {30, 0})
+        self.assertFalse(route_planning.remove_truck_stop(
+            self.truck, self.vertices[10], self.graph))
+
+    def test_path_follows_roads(self):
+        route_planning.insert_truck_stop(self.truck, self.vertices[20],
+                                         self.graph)
+        location = self.truck.location
+        miles = 0
+        while not self.truck.destinations.is_empty():
+            vertex = self.truck.move_to_next_vertex()
+            miles += self.graph.edge_weight(location, vertex)
+            location = vertex
+        self.assertEqual(location, self.vertices[0])
+        self.assertEqual(self.truck.stop_ids, set())
+
+        distance = self.graph.distance_matrix()
+        expected = [0, 10, 30, 0]
+        route_planning.insert_stop(expected, 20, distance)
+        self.assertAlmostEqual(miles, route_length(expected, distance))
+
+class RoutePlannerTest(unittest.TestCase):
+
+    def test_parallel_routes_match_serial(self):
+        graph = generators.make_road_graph(100)
+        distance = graph.distance_matrix()
+        rng = random.Random(1)
+        candidates = list(range(1, 100))
+        deadlines = {i: rng.choice((540, 630, 1020)) for i in candidates}
+        requests = []
+        for strategy in ("greedy", "2-opt+or-opt", "deadline"):
+            for _ in range(4):
+                requests.append((0, rng.sample(candidates, 12), 0, strategy,
+                                 deadlines, 480, 18))
+
+        serial = [route_planning.plan_route(
+            start, stops, end, distance, graph.all_pairs_previous, strategy,
+            stop_deadlines, start_time, speed)
+            for start, stops, end, strategy, stop_deadlines, start_time, speed
+            in requests]
+        with route_planning.RoutePlanner(graph, 2) as planner:
+            self.assertEqual(planner.plan_routes(requests), serial)
+            self.assertEqual(planner.plan_routes([]), [])
+
+if __name__ == '__main__':
+    unittest.main()
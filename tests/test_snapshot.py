@@ -0,0 +1,108 @@
+"""Tests for utilities.snapshot."""
+
+import os
+import struct
+import sys
+import tempfile
+import unittest
+
+from benchmarks import generators
+from datastructures.Graph import Graph
+from datastructures.OpenAddressingHashTable import OpenAddressingHashTable
+from utilities import snapshot
+
+def make_empty_tables():
+    """Return an empty graph, package hashtable, and package list."""
+
+    graph = Graph(27, lambda el : el.data)
+    hashtable = OpenAddressingHashTable(40, lambda el : el.package_id)
+    return graph, hashtable, []
+
+class SnapshotTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, "test.snapshot")
+        self.graph = generators.make_road_graph(30)
+        self.packages = generators.make_packages(40, self.graph)
+        snapshot.save_snapshot(self.filename, self.graph, self.packages)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def rewrite_header(self, offset, format, value):
+        """Overwrite one field of the snapshot's header."""
+
+        with open(self.filename, "r+b") as f:
+            f.seek(offset)
+            f.write(struct.pack(format, value))
+
+    def assert_rejected(self, message):
+        """Check that loading fails with a message and changes nothing."""
+
+        graph, hashtable, packages = make_empty_tables()
+        with self.assertRaisesRegex(snapshot.SnapshotError, message):
+            snapshot.load_snapshot(self.filename, graph, graph.vertices,
+                                   hashtable, packages)
+        self.assertEqual(len(graph.vertex_list), 0)
+        self.assertEqual(hashtable.get_length(), 0)
+        self.assertEqual(packages, [])
+
+    def test_round_trip(self):
+        graph, hashtable, packages = make_empty_tables()
+        snapshot.load_snapshot(self.filename, graph, graph.vertices,
+                               hashtable, packages)
+
+        self.assertEqual([v.data for v in graph.vertex_list],
+                         [v.data for v in self.graph.vertex_list])
+        for vertex in self.graph.vertex_list:
+            self.assertIs(graph.vertices.get(vertex.data),
+                          graph.vertex_list[vertex.id])
+        expected_csr = self.graph.get_csr()
+        csr = graph.get_csr()
+        self.assertEqual(csr.offsets, expected_csr.offsets)
+        self.assertEqual(csr.targets, expected_csr.targets)
+        self.assertEqual(csr.weights, expected_csr.weights)
+        self.assertEqual(graph.distance_matrix(), self.graph.distance_matrix())
+        self.assertEqual(graph.all_pairs_previous,
+                         self.graph.all_pairs_previous)
+
+        fields = lambda p : (p.package_id, p.address, p.city, p.state, p.zip,
+                             p.delivery_deadline, p.mass, p.special_notes)
+        self.assertEqual([fields(p) for p in packages],
+                         [fields(p) for p in self.packages])
+        for package in packages:
+            self.assertIs(hashtable.get(package.package_id), package)
+
+    def test_source_files(self):
+        map_filename = os.path.join(self.directory.name, "map.csv")
+        generators.write_map_file(map_filename, self.graph)
+        snapshot.save_snapshot(self.filename, self.graph, self.packages,
+                               [map_filename])
+        self.assertTrue(snapshot.is_fresh(self.filename, [map_filename]))
+
+        with open(map_filename, "a") as f:
+            f.write("\n")
+        self.assertFalse(snapshot.is_fresh(self.filename, [map_filename]))
+        graph, hashtable, packages = make_empty_tables()
+        with self.assertRaisesRegex(snapshot.SnapshotError, "source files"):
+            snapshot.load_snapshot(self.filename, graph, graph.vertices,
+                                   hashtable, packages, [map_filename])
+
+    def test_rejects_other_version(self):
+        self.rewrite_header(8, "<I", snapshot.VERSION + 1)
+        self.assertFalse(snapshot.is_fresh(self.filename, []))
+        self.assert_rejected("version")
+
+    def test_rejects_other_byte_order(self):
+        other = "big" if sys.byteorder == "little" else "little"
+        self.rewrite_header(12, "<B", snapshot.BYTE_ORDERS[other])
+        self.assert_rejected("byte order")
+
+    def test_rejects_truncated_file(self):
+        with open(self.filename, "r+b") as f:
+            f.truncate(os.path.getsize(self.filename) - 16)
+        self.assert_rejected("Corrupt")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+"""
+Functions used to load a distance matrix and find all-pairs shortest paths.
+
+The map file is a complete distance matrix: a header row of addresses, then
+one row per address starting with the address. Only the lower triangle is
+read and it is mirrored, so the matrix is always symmetric. A weight of 0
+between two different addresses means there is no direct road.
+
+When NumPy is installed, the matrix is parsed in one call and Floyd-Warshall
+relaxes a whole row of the matrix per step. Otherwise the same results are
+calculated with Python lists.
+
+Functions:
+read_distance_matrix -- return the addresses and weights in a map file.
+floyd_warshall -- return the all-pairs shortest distance and previous tables.
+"""
+
+import csv
+
+# NumPy is optional. Without it the pure Python versions are used.
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+def use_numpy_default(use_numpy):
+    """Return whether to use NumPy when use_numpy may be None (automatic)."""
+
+    if use_numpy == None:
+        return numpy != None
+    if use_numpy and numpy == None:
+        raise ImportError("NumPy is not installed.")
+    return use_numpy
+
+def read_distance_matrix(filename, use_numpy=None):
+    """
+    Return (addresses, weights) read from a map file.
+
+    weights is a symmetric NumPy array when NumPy is used, otherwise a list
+    of lists of floats.
+
+    Keyword arguments:
+    filename -- the map file to read.
+    use_numpy -- True or False to choose, None to use NumPy if installed.
+
+    Time complexity: O(n^2)
+    Space complexity: O(n^2)
+    """
+
+    with open(filename, newline='') as f:
+        rows = list(csv.reader(f))[1:]
+    addresses = [row[0] for row in rows]
+    size = len(addresses)
+
+    if use_numpy_default(use_numpy):
+        cells = numpy.array([row[1:size + 1] + [''] * (size + 1 - len(row))
+                             for row in rows])
+        cells[cells == ''] = '0'
+        lower = numpy.tril(cells.astype(numpy.float64), -1)
+        return addresses, lower + lower.T
+
+    weights = [[0.0] * size for _ in range(size)]
+    for i, row in enumerate(rows):
+        for j in range(i):
+            weight = float(row[j + 1])
+            weights[i][j] = weight
+            weights[j][i] = weight
+    return addresses, weights
+
+def floyd_warshall(weights, use_numpy=None):
+    """
+    Return (distance, previous) tables of all-pairs shortest paths.
+
+    distance[u][v] is the shortest distance from u to v (inf if there is no
+    path) and previous[u][v] is the index of the vertex before v on that
+    path (-1 if none). Both are returned as lists of lists, the format of
+    Graph.all_pairs_distance and Graph.all_pairs_previous.
+
+    Keyword arguments:
+    weights -- a square matrix of edge weights where 0 means no edge.
+    use_numpy -- True or False to choose, None to use NumPy if installed.
+
+    Time complexity: O(n^3). With NumPy each of the n steps is a single
+    vectorized operation on the whole matrix.
+    Space complexity: O(n^2)
+    """
+
+    if use_numpy_default(use_numpy):
+        weights = numpy.asarray(weights, dtype=numpy.float64)
+        size = len(weights)
+        has_edge = weights > 0
+        distance = numpy.where(has_edge, weights, numpy.inf)
+        numpy.fill_diagonal(distance, 0)
+        previous = numpy.where(has_edge, numpy.arange(size)[:, None], -1)
+
+        for k in range(size):
+            # Paths i -> k -> j for every i and j at once.
+            through_k = distance[:, k, None] + distance[None, k, :]
+            shorter = through_k < distance
+            distance = numpy.where(shorter, through_k, distance)
+            previous = numpy.where(shorter, previous[None, k, :], previous)
+
+        return distance.tolist(), previous.tolist()
+
+    size = len(weights)
+    infinity = float('inf')
+    distance = []
+    previous = []
+    for i in range(size):
+        distance.append([weights[i][j] if weights[i][j] > 0 else infinity
+                         for j in range(size)])
+        previous.append([i if weights[i][j] > 0 else -1 for j in range(size)])
+        distance[i][i] = 0
+
+    for k in range(size):
+        distance_k = distance[k]
+        previous_k = previous[k]
+        for i in range(size):
+            distance_i = distance[i]
+            to_k = distance_i[k]
+            if to_k == infinity:
+                continue
+            previous_i = previous[i]
+            for j in range(size):
+                new_distance = to_k + distance_k[j]
+                if new_distance < distance_i[j]:
+                    distance_i[j] = new_distance
+                    previous_i[j] = previous_k[j]
+
+    return distance, previous
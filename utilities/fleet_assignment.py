@@ -0,0 +1,426 @@
+"""
+Functions used to divide the packages at the hub between a fleet of trucks.
+
+Packages are assigned to all trucks at once with the Clarke-Wright savings
+algorithm over the graph's all-pairs distance matrix: every group of packages
+starts on its own route from the hub, and routes are joined end to end in
+order of the distance saved by not returning to the hub in between. Joins
+that would overfill a truck, combine packages restricted to different trucks,
+or add lateness are skipped. The resulting routes are then given to trucks in
+order of their earliest deadline; a truck takes more than one route when
+there are more routes than trucks, it has room, and no delivery is made
+later.
+
+Limits: each group is only joined with the MAX_NEIGHBORS groups it saves
+the most distance with, so the savings list holds O(G * MAX_NEIGHBORS)
+entries for G groups rather than O(G^2); finding those neighbours still
+takes O(G^2) time. Groups are at most one per address for unrestricted
+packages, so G stays at the number of addresses served. Routes are only
+joined end to end, and a truck given several routes visits their stops in
+the order its route planner chooses.
+
+A group of packages that no truck of the fleet can ever take (restricted to
+different trucks or to a truck the fleet does not have, or larger than the
+trucks it may go on) raises ValueError rather than waiting at the hub
+forever; check_packages checks every package before the day starts.
+
+Functions:
+get_required_truck -- return the truck a package must be delivered on.
+get_delivered_with -- return the ids a package must be delivered with.
+get_group_truck -- return the truck a group of packages must be on.
+check_packages -- check that every package can be assigned to a truck.
+assign_packages -- assign packages to trucks.
+"""
+
+import re
+
+from utilities import route_optimization
+
+# The most groups each group is considered for joining with, in order of the
+# distance joining them saves.
+MAX_NEIGHBORS = 32
+
+class Route:
+    """A route from the hub through one or more groups of packages."""
+
+    def __init__(self, group, stops, required_truck):
+        """
+        Initialize a route containing a single group of packages.
+
+        Keyword arguments:
+        group -- a list of packages that must be delivered together.
+        stops -- the vertex ids of the packages' addresses in visiting order.
+        required_truck -- the number of the truck the route must be on or None.
+        """
+
+        self.packages = list(group)
+        self.stops = list(stops)
+        self.required_truck = required_truck
+        self.deadline = min(p.delivery_deadline for p in group)
+        self.lateness = 0
+
+        # Each entry is [group index, reversed]. A group's stops are visited
+        # backwards if the route was reversed.
+        self.groups = []
+
+    def reversed(self):
+        """Return (stops, groups) for visiting the route in reverse order."""
+
+        stops = self.stops[::-1]
+        groups = [[group, not reversed] for group, reversed in self.groups[::-1]]
+        return stops, groups
+
+    def head(self):
+        """Return the (group index, side) at the start of the route."""
+
+        group, reversed = self.groups[0]
+        return (group, "end" if reversed else "start")
+
+    def tail(self):
+        """Return the (group index, side) at the end of the route."""
+
+        group, reversed = self.groups[-1]
+        return (group, "start" if reversed else "end")
+
+def get_required_truck(package):
+    """Return the number of the truck a package must be on, or None."""
+
+    match = re.match(r"Can only be on truck (\d+)", package.special_notes)
+    if match:
+        return int(match.group(1))
+    return None
+
+def get_delivered_with(package) -> []:
+    """Return the ids of the packages a package must be delivered with."""
+
+    if package.special_notes.startswith("Must be delivered with"):
+        return [int(i) for i in re.findall(r"\d+", package.special_notes)]
+    return []
+
+def get_group_truck(group, fleet):
+    """
+    Return the number of the truck a group of packages must be on, or None
+    if any truck can take it.
+
+    Keyword arguments:
+    group -- a list of packages that must be delivered together.
+    fleet -- every truck that could take the group.
+
+    Raises ValueError, naming the packages, if no truck of the fleet can
+    ever take the group: its packages are restricted to different trucks or
+    to a truck not in the fleet, or there are more of them than the trucks
+    they may go on hold.
+    """
+
+    names = ("Package " if len(group) == 1 else "Packages ") + ", ".join(
+        str(p.package_id) for p in group)
+    required = {get_required_truck(p) for p in group} - {None}
+    if len(required) > 1:
+        raise ValueError(
+            names + " must be delivered together but are"
+            + " restricted to trucks "
+            + ", ".join(str(t) for t in sorted(required)) + ".")
+    required_truck = required.pop() if len(required) == 1 else None
+
+    allowed = [truck for truck in fleet
+               if required_truck == None or truck.number == required_truck]
+    if len(allowed) == 0:
+        raise ValueError(names + " can only be on truck " + str(required_truck)
+                         + ", which is not in the fleet.")
+    if len(group) > max(truck.max_packages for truck in allowed):
+        raise ValueError(names + " must be delivered together"
+                         + " but do not fit on one truck.")
+    return required_truck
+
+def check_packages(trucks, packages, graph):
+    """
+    Raise ValueError if a group of packages can never be assigned to a truck
+    of a fleet (see get_group_truck).
+
+    Keyword arguments:
+    trucks -- every truck of the fleet.
+    packages -- a list of packages.
+    graph -- the graph containing the packages' delivery addresses.
+
+    Time complexity: O(n + GT) where G is the number of groups and T the
+    number of trucks.
+    """
+
+    for group in group_packages(packages, graph, trucks):
+        get_group_truck(group, trucks)
+
+def find(parent, i):
+    """Return the root of i in a union-find parent list."""
+
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+def group_packages(packages, graph, fleet=None) -> []:
+    """
+    Return lists of packages that must be on the same truck.
+
+    Packages joined by "Must be delivered with" notes form one group. Other
+    packages going to the same address and restricted to the same truck are
+    grouped together as well, as long as the group still fits on a truck of
+    the fleet it may go on.
+
+    Keyword arguments:
+    packages -- a list of packages.
+    graph -- the graph containing the packages' delivery addresses.
+    fleet -- every truck of the fleet (default of None to not limit the
+             size of groups at one address).
+
+    Time complexity: O(n + T) where T is the number of trucks.
+    """
+
+    index_of_id = {}
+    for i, package in enumerate(packages):
+        index_of_id[package.package_id] = i
+
+    parent = list(range(len(packages)))
+    for i, package in enumerate(packages):
+        for other_id in get_delivered_with(package):
+            j = index_of_id.get(other_id)
+            if j != None:
+                parent[find(parent, i)] = find(parent, j)
+
+    groups = {}
+    for i, package in enumerate(packages):
+        root = find(parent, i)
+        if root not in groups:
+            groups[root] = []
+        groups[root].append(package)
+
+    # The most packages a truck can hold, by truck number (None for any
+    # truck of the fleet).
+    limits = {}
+    if fleet != None:
+        for truck in fleet:
+            limits[truck.number] = max(limits.get(truck.number, 0),
+                                       truck.max_packages)
+            limits[None] = max(limits.get(None, 0), truck.max_packages)
+
+    # Merge single-address groups that share an address and truck. Once a
+    # merged group is full, another one is started at the address.
+    merged = []
+    by_address = {}
+    for group in groups.values():
+        addresses = {p.address_and_zip for p in group}
+        required = {get_required_truck(p) for p in group} - {None}
+        if len(addresses) == 1 and len(required) <= 1:
+            key = (addresses.pop(), required.pop() if required else None)
+            if (key in by_address and len(by_address[key]) + len(group)
+                    <= limits.get(key[1], float('inf'))):
+                by_address[key] += group
+                continue
+            by_address[key] = group
+        merged.append(group)
+
+    return merged
+
+def order_stops(group, graph, hub_id) -> []:
+    """Return the vertex ids of a group's addresses in nearest first order."""
+
+    distance = graph.distance_matrix()
+    remaining = []
+    for package in group:
+        vertex_id = package.vertex_id
+        if vertex_id not in remaining:
+            remaining.append(vertex_id)
+
+    stops = []
+    current = hub_id
+    while len(remaining) > 0:
+        index = 0
+        for i, v in enumerate(remaining):
+            if distance[current][v] < distance[current][remaining[index]]:
+                index = i
+        current = remaining.pop(index)
+        stops.append(current)
+    return stops
+
+def get_lateness(route, graph, hub_id, start_time, speed):
+    """Return the minutes by which a route from the hub misses deadlines."""
+
+    deadlines = {}
+    for package in route.packages:
+        vertex_id = package.vertex_id
+        if (vertex_id not in deadlines
+                or package.delivery_deadline < deadlines[vertex_id]):
+            deadlines[vertex_id] = package.delivery_deadline
+    return route_optimization.route_lateness(
+        [hub_id] + route.stops + [hub_id], graph.distance_matrix(), deadlines,
+        start_time, speed)
+
+def get_best_saving(distance, hub_id, ends_a, ends_b):
+    """Return the most distance saved by joining an end of a to an end of b."""
+
+    return max(distance[hub_id][i] + distance[hub_id][j] - distance[i][j]
+               for i in ends_a for j in ends_b)
+
+def assign_packages(trucks, packages, graph, hub_vertex, start_time=0,
+                    fleet=None, max_neighbors=MAX_NEIGHBORS):
+    """
+    Assign packages to trucks; return (assignments, unassigned).
+
+    assignments is a list containing the list of packages for each truck in
+    trucks. unassigned is a list of the packages that did not fit on any
+    truck and should stay at the hub, e.g. because they are restricted to a
+    truck of the fleet that is not being loaded.
+
+    Keyword arguments:
+    trucks -- a list of trucks to load.
+    packages -- a list of packages to assign.
+    graph -- the graph containing the packages' delivery addresses.
+    hub_vertex -- the vertex the trucks leave from and return to.
+    start_time -- the time the trucks leave the hub.
+    fleet -- every truck of the fleet (default of trucks).
+    max_neighbors -- the most groups each group is considered for joining
+                     with.
+
+    Raises ValueError if a group of packages can never be assigned to a
+    truck of the fleet (see get_group_truck).
+
+    Time complexity: O(G^2 + GK LogGK + GK * R) where G is the number of
+    groups of packages (at most one per address for unrestricted packages),
+    K is max_neighbors, and R is the number of stops on a route.
+
+    Space complexity: O(GK)
+    """
+
+    if fleet == None:
+        fleet = trucks
+    distance = graph.distance_matrix()
+    hub_id = hub_vertex.id
+    speed = min(truck.speed for truck in trucks)
+    capacity = {}
+    for truck in trucks:
+        capacity[truck.number] = truck.max_packages - len(truck.packages)
+    largest_capacity = max(capacity.values())
+
+    # Start with one route per group of packages. Routes are kept in a
+    # dictionary by id, in the order they were made, so joined routes are
+    # replaced in O(1).
+    groups = group_packages(packages, graph, fleet)
+    routes = {}
+    route_of_group = []
+    for g, group in enumerate(groups):
+        required_truck = get_group_truck(group, fleet)
+        route = Route(group, order_stops(group, graph, hub_id), required_truck)
+        route.groups.append([g, False])
+        route.lateness = get_lateness(route, graph, hub_id, start_time, speed)
+        routes[id(route)] = route
+        route_of_group.append(route)
+
+    # Find the groups each group saves the most distance with joining.
+    ends = [(route.stops[0], route.stops[-1]) for route in route_of_group]
+    neighbors = []
+    for a in range(len(groups)):
+        others = [b for b in range(len(groups)) if b != a]
+        if len(others) > max_neighbors:
+            others.sort(key=lambda b : get_best_saving(distance, hub_id,
+                                                       ends[a], ends[b]),
+                        reverse=True)
+            others = others[:max_neighbors]
+        neighbors.append(set(others))
+
+    # Savings for joining the end of one group to the end of a neighbour.
+    savings = []
+    for a in range(len(groups)):
+        a_ends = {"start": ends[a][0], "end": ends[a][1]}
+        for b in range(a + 1, len(groups)):
+            if b not in neighbors[a] and a not in neighbors[b]:
+                continue
+            b_ends = {"start": ends[b][0], "end": ends[b][1]}
+            for side_a, i in a_ends.items():
+                for side_b, j in b_ends.items():
+                    saving = distance[hub_id][i] + distance[hub_id][j] - distance[i][j]
+                    savings.append((saving, a, side_a, b, side_b))
+    savings.sort(key=lambda el : el[0], reverse=True)
+
+    # Join routes in order of savings.
+    for saving, a, side_a, b, side_b in savings:
+        route_a = route_of_group[a]
+        route_b = route_of_group[b]
+        if route_a is route_b:
+            continue
+
+        # Both group ends must be at an end of their route.
+        if (a, side_a) not in (route_a.head(), route_a.tail()):
+            continue
+        if (b, side_b) not in (route_b.head(), route_b.tail()):
+            continue
+
+        # Both routes must be allowed on the same truck and fit on it.
+        if (route_a.required_truck != None and route_b.required_truck != None
+                and route_a.required_truck != route_b.required_truck):
+            continue
+        required_truck = route_a.required_truck or route_b.required_truck
+        limit = capacity.get(required_truck, 0) if required_truck else largest_capacity
+        if len(route_a.packages) + len(route_b.packages) > limit:
+            continue
+
+        # Orient the routes so the joined group ends meet.
+        stops_a, groups_a = route_a.stops, route_a.groups
+        if route_a.tail() != (a, side_a):
+            stops_a, groups_a = route_a.reversed()
+        stops_b, groups_b = route_b.stops, route_b.groups
+        if route_b.head() != (b, side_b):
+            stops_b, groups_b = route_b.reversed()
+
+        joined = Route(route_a.packages + route_b.packages,
+                       stops_a + stops_b, required_truck)
+        joined.groups = groups_a + groups_b
+
+        # Do not join routes if doing so makes deliveries later.
+        joined.lateness = get_lateness(joined, graph, hub_id, start_time, speed)
+        if joined.lateness > route_a.lateness + route_b.lateness:
+            continue
+
+        del routes[id(route_a)]
+        del routes[id(route_b)]
+        routes[id(joined)] = joined
+        for group, reversed in joined.groups:
+            route_of_group[group] = joined
+
+    # Give routes to trucks, earliest deadline first. Routes restricted to a
+    # truck are placed before the others. Each route goes to an empty truck
+    # if one can take it. Otherwise it is added after the route of a truck
+    # that still has room, if that makes no delivery later, so trucks are
+    # not left underfilled when there are more routes than trucks.
+    routes = sorted(routes.values(),
+                    key=lambda el : (el.required_truck == None, el.deadline,
+                                     -len(el.packages)))
+    truck_routes = [None for truck in trucks]
+    unassigned = []
+    for route in routes:
+        allowed = [t for t, truck in enumerate(trucks)
+                   if route.required_truck == None
+                   or route.required_truck == truck.number]
+        for t in allowed:
+            if (truck_routes[t] == None
+                    and len(route.packages) <= capacity[trucks[t].number]):
+                truck_routes[t] = route
+                break
+        else:
+            for t in allowed:
+                current = truck_routes[t]
+                if (current == None or len(current.packages)
+                        + len(route.packages) > capacity[trucks[t].number]):
+                    continue
+                joined = Route(current.packages + route.packages,
+                               current.stops + route.stops,
+                               current.required_truck or route.required_truck)
+                joined.lateness = get_lateness(joined, graph, hub_id,
+                                               start_time, speed)
+                if joined.lateness <= current.lateness + route.lateness:
+                    truck_routes[t] = joined
+                    break
+            else:
+                unassigned += route.packages
+
+    assignments = [route.packages if route != None else []
+                   for route in truck_routes]
+    return assignments, unassigned
@@ -1,73 +1,258 @@
 """Functions used to import package and graph data."""
 
+import csv
+from array import array
+
 from datastructures.Graph import *
+from datastructures.KeyHasher import default_hasher
+from models.ManagementUpdate import *
 from models.Package import *
+from utilities import distance_matrix
+from utilities import snapshot
 from utilities.time import *
 
+def stream_packages(filename, batch_size=1000, zips=None, deadline_range=None,
+                    shard_by=None, shard_count=1, shard_index=0):
+    """
+    Read a package file one row at a time, yielding lists of packages.
+
+    Rows are parsed with the csv module, so quoted special notes containing
+    commas are read as one column. Unquoted special notes containing commas
+    are split into extra columns, which are joined back into one. Filters
+    and sharding are applied to each
+    row before a Package is created for it, so rows that are not kept cost
+    no more memory than the row itself.
+
+    Keyword arguments:
+    filename -- the package file to read.
+    batch_size -- the largest number of packages in each yielded list.
+    zips -- a collection of zip codes to keep (None keeps every zip).
+    deadline_range -- (earliest, latest) deadlines in minutes to keep,
+                      inclusive (None keeps every deadline).
+    shard_by -- "zip" or "deadline" to divide the packages into shard_count
+                shards by that column; only shard shard_index is kept.
+                Sharding by zip keeps every package for an area together.
+                Deadlines are compared in minutes, so "EOD" and
+                "05:00:00 PM" are in the same shard.
+    shard_count -- the number of shards.
+    shard_index -- the shard to keep, from 0 to shard_count - 1.
+
+    Time complexity: O(n)
+    Space complexity: O(batch_size)
+    """
+
+    if shard_by not in (None, "zip", "deadline"):
+        raise ValueError("Unknown shard column: " + str(shard_by))
+
+    with open(filename, newline='') as f:
+        batch = []
+        for row in csv.reader(f):
+            if len(row) == 0:
+                continue
+            row = [column.strip() for column in row]
+            row += [""] * (8 - len(row))
+
+            # Special notes containing commas without quotes are split
+            # into more columns; join them back together.
+            if len(row) > 8:
+                row = row[:7] + [", ".join(row[7:])]
+
+            if zips != None and row[4] not in zips:
+                continue
+            deadline = convert_standard_time_to_minutes(row[5])
+            if deadline_range != None and not (
+                    deadline_range[0] <= deadline <= deadline_range[1]):
+                continue
+            if shard_by != None:
+                shard_key = row[4] if shard_by == "zip" else deadline
+                if (default_hasher.hash_key(shard_key) % shard_count
+                        != shard_index):
+                    continue
+
+            batch.append(Package(int(row[0]), row[1], row[2], row[3], row[4],
+                                 deadline, int(row[6]), row[7]))
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+
+        if len(batch) > 0:
+            yield batch
+
 def import_packages_to_hashtable(hashtable, packages, filename):
     """Import package data into a list and a hash table."""
 
-    with open(filename) as f:
-        lines = f.readlines()
-
-        # Read each line in the file, create a package item for it, and place
-        # the package in the hashtable.
-        for line in lines:
-            line = line.strip()
-            line = line.replace('"','')
-            line = line.split(",")
-
-            # If the special notes column has commas in it, correct the multiple
-            # comma separated columns to 1 column.
-            special_notes = ""
-            if len(line) > 8:
-                special_notes = line[7]
-                for i in range(8, len(line)):
-                    special_notes += ", " + line[i]
-                line = line[:7] + [special_notes]
-
-            # Create a package.
-            package = Package(int(line[0]), str(line[1]), str(line[2]), str(line[3]),
-                              str(line[4]), convert_standard_time_to_minutes(str(line[5])),
-                              int(line[6]), str(line[7]))
-
+    for batch in stream_packages(filename):
+        for package in batch:
             # Place the package into the hash table.
             hashtable.add(package)
 
             # Add the package to the provided queue.
             packages.append(package)
 
-def import_distance_map_to_graph(g, v, filename):
-    """Import distance table into the graph as weighted edges."""
+def link_packages_to_graph(packages, v):
+    """
+    Set each package's vertex id to the vertex at its delivery address.
+
+    Packages whose address is not in the graph are given a vertex id of None.
+
+    Keyword arguments:
+    packages -- a list of packages.
+    v -- the hashtable of the graph's vertices.
+    """
+
+    for package in packages:
+        vertex = v.get(package.address_and_zip)
+        package.vertex_id = None if vertex == None else vertex.id
+
+def import_distance_map_to_graph(g, v, filename, all_pairs="dijkstra"):
+    """
+    Import distance table into the graph as weighted edges.
 
-    with open(filename) as f:
-        lines = f.readlines()
-        matrix = []
-        address_list = []
+    Keyword arguments:
+    g -- the graph to add vertices and edges to.
+    v -- the hashtable to add the vertices to.
+    filename -- the map file to import.
+    all_pairs -- how to build the all-pairs shortest path tables: "dijkstra"
+                 (a search from every vertex) or "floyd-warshall" (from the
+                 distance matrix, vectorized if NumPy is installed).
 
-        # Convert each line in the file to a list and append the list to the
-        # matrix list to create a 2d list. Get the address at the beginning
-        # of each line and add it to the address list.
-        for i, line in enumerate(lines):
-            if i == 0:
+    Raises ValueError for "floyd-warshall" if the graph already has
+    vertices: its tables are indexed by the rows of the file, which are only
+    the vertex ids when the file's vertices are the first ones added.
+    """
+
+    if all_pairs not in ("dijkstra", "floyd-warshall"):
+        raise ValueError("Unknown all-pairs method: " + str(all_pairs))
+    if all_pairs == "floyd-warshall" and len(g.vertex_list) > 0:
+        raise ValueError("Floyd-Warshall needs an empty graph to import into.")
+
+    address_list, weights = distance_matrix.read_distance_matrix(filename)
+
+    # Add vertices to the graph for each address imported from the file.
+    vertex_list = []
+    for address in address_list:
+        vertex = Vertex(address)
+        g.add_vertex(vertex)
+        v.add(vertex)
+        vertex_list.append(vertex)
+
+    # Add an undirected edge (a directed edge each way) for each road in the
+    # lower triangle of the matrix, all at once so they are packed straight
+    # into the graph's CSRGraph. Rows are converted to lists so the weights
+    # are Python floats.
+    sources = array('q')
+    targets = array('q')
+    edge_weights = array('d')
+    for c in range(len(vertex_list)):
+        row = list(weights[c])
+        for r in range(c):
+            weight = float(row[r])
+            if weight > 0.0:
+                sources.append(vertex_list[c].id)
+                targets.append(vertex_list[r].id)
+                sources.append(vertex_list[r].id)
+                targets.append(vertex_list[c].id)
+                edge_weights.append(weight)
+                edge_weights.append(weight)
+    g.add_edges(sources, targets, edge_weights)
+
+    # Build the all-pairs shortest path tables once now that every edge
+    # is in place.
+    if all_pairs == "floyd-warshall":
+        distance, previous = distance_matrix.floyd_warshall(weights)
+        g.set_all_pairs_shortest_paths(distance, previous)
+    else:
+        g.compute_all_pairs_shortest_paths()
+
+def import_management_updates_to_schedule(schedule, filename, v=None):
+    """
+    Import timed management updates into an update schedule.
+
+    Keyword arguments:
+    schedule -- the update schedule to add the updates to.
+    filename -- the update file to import.
+    v -- the hashtable of the graph's vertices, used to check that corrected
+         addresses are on the map (default of None to not check them).
+
+    Raises ValueError, naming the row, for a row with an unknown action, a
+    missing field its action needs (such as a recall without an until time),
+    or an address correction to an address that is not in v.
+    """
+
+    with open(filename, newline='') as f:
+        reader = csv.reader(f)
+
+        # Skip the header row.
+        next(reader, None)
+
+        # Create a management update for each row and add it to the schedule.
+        for row in reader:
+            if len(row) == 0:
                 continue
-            line = line.strip()
-            line = line.split(',')
-            matrix.append(line[1:i])
-            address_list.append(line[0])
-
-        # Add vertices to the graph for each address imported from the file.
-        for address in address_list:
-            vertex = Vertex(address)
-            g.add_vertex(vertex)
-            v.add(vertex)
-
-        # For each unique intersection in the matrix, create a new vertex and
-        # add an undirected edge to the graph.
-        for c, col in enumerate(matrix):
-            for r, row in enumerate(col):
-                weight = float(matrix[c][r])
-                if weight > 0.0:
-                    vertex_a = v.get(address_list[c])
-                    vertex_b = v.get(address_list[r])
-                    g.add_undirected_edge(vertex_a, vertex_b, weight)
+            row += [""] * (9 - len(row))
+            (time, action, package_id, address, city, state, zip, deadline,
+             until) = [column.strip() for column in row[:9]]
+
+            try:
+                update = ManagementUpdate(
+                    convert_standard_time_to_minutes(time), action,
+                    int(package_id) if package_id != "" else None,
+                    address or None, city or None, state or None, zip or None,
+                    convert_standard_time_to_minutes(deadline)
+                    if deadline != "" else None,
+                    convert_standard_time_to_minutes(until)
+                    if until != "" else None)
+                update.validate()
+
+                # A package cannot be delivered to an address that is not on
+                # the map.
+                if v != None and action == ManagementUpdate.CORRECT_ADDRESS:
+                    address_and_zip = update.get_address_and_zip()
+                    if v.get(address_and_zip) == None:
+                        raise ValueError("address {!r} is not on the map."
+                                         .format(address_and_zip))
+
+                schedule.add(update)
+            except ValueError as error:
+                raise ValueError("{} row {}: {}".format(
+                    filename, reader.line_num, error)) from None
+
+def import_with_snapshot(g, v, hashtable, packages, map_filename,
+                         package_filename, snapshot_filename):
+    """
+    Import map and package data, using a snapshot file when it is current.
+
+    If the snapshot was built from these CSV files, unchanged since, it is
+    loaded instead of parsing them. Otherwise, or if it cannot be read, the CSV files are
+    imported and a new snapshot is written for the next run. Either way the
+    packages are then linked to their vertices.
+
+    Keyword arguments:
+    g -- the graph to add vertices and edges to.
+    v -- the hashtable to add the vertices to.
+    hashtable -- the hashtable to add the packages to.
+    packages -- the list to append the packages to.
+    map_filename -- the map file to import.
+    package_filename -- the package file to import.
+    snapshot_filename -- the snapshot file to load or write.
+    """
+
+    source_filenames = [map_filename, package_filename]
+    if snapshot.is_fresh(snapshot_filename, source_filenames):
+        try:
+            snapshot.load_snapshot(snapshot_filename, g, v, hashtable, packages,
+                                   source_filenames)
+            link_packages_to_graph(packages, v)
+            return
+        except snapshot.SnapshotError:
+            pass
+
+    import_distance_map_to_graph(g, v, map_filename)
+    import_packages_to_hashtable(hashtable, packages, package_filename)
+    link_packages_to_graph(packages, v)
+    try:
+        snapshot.save_snapshot(snapshot_filename, g, packages,
+                               source_filenames)
+    except OSError:
+        # A read-only directory only means the next run parses the CSVs.
+        pass
@@ -0,0 +1,251 @@
+"""
+Functions used to time the phases of the simulation and count hot operations.
+
+Nothing is measured until enable is called. enable replaces the simulation's
+phase functions (see PHASES) in a module with timed copies, and the methods
+in COUNTERS with counted copies; disable puts the originals back. While
+disabled, no code of this module runs, so instrumentation costs nothing.
+Reroutes after a recall or address correction are counted (see
+PHASE_COUNTERS), as are the stops route repair changes in place.
+
+Times are recorded per phase and per truck, and include the time of any
+phase called from inside them (e.g. min_path inside load_trucks). Counts are
+recorded per counter and per phase, the innermost phase running at the time
+of the call.
+
+Example, for a headless run:
+instrumentation.enable(main)
+simulation.run_scenario(Scenario())
+instrumentation.print_summary()
+
+Functions:
+enable -- start timing phases and counting operations.
+disable -- stop and restore the original functions.
+reset -- clear the recorded times, counts, and trace.
+get_summary -- return the recorded times and counts as a dictionary.
+print_summary -- print tables of the recorded times and counts.
+write_json -- write the summary and trace to a JSON file.
+"""
+
+import functools
+import json
+import time
+
+from datastructures.CSRGraph import CSRGraph
+from datastructures.HashTable import HashTable
+from datastructures.IndexedMinHeap import IndexedMinHeap
+from datastructures.KeyedMinHeap import KeyedMinHeap
+from datastructures.MinHeap import MinHeap
+from datastructures.OpenAddressingHashTable import OpenAddressingHashTable
+from datastructures.PriorityQueue import PriorityQueue
+from utilities import route_planning
+
+# Functions of main.py that are timed, and the index of their truck argument
+# (a truck or a list of trucks), if any.
+PHASES = (("management_updates_at_hub", None),
+          ("management_updates_for_trucks", 0),
+          ("reroute_truck", 0),
+          ("repair_route_for_truck", 0),
+          ("load_trucks", 0),
+          ("set_destinations_for_truck", 0),
+          ("min_path", None),
+          ("deliver_packages", 0))
+
+# Phases whose calls are counted as well, and the name of the counter for
+# each. The count is recorded under the phase the call was made from.
+PHASE_COUNTERS = (("reroute_truck", "reroute"),)
+
+# Methods (or functions of a module) that are counted, and the name of the
+# counter for each. Subclass methods that call the parent's method (such as
+# EventQueue.push) are not listed, so each operation is counted once.
+COUNTERS = ((CSRGraph, "dijkstra", "dijkstra"),
+            (MinHeap, "push", "heap push"),
+            (MinHeap, "pop", "heap pop"),
+            (MinHeap, "update", "heap update"),
+            (MinHeap, "heapify", "heap heapify"),
+            (KeyedMinHeap, "push", "heap push"),
+            (KeyedMinHeap, "pop", "heap pop"),
+            (KeyedMinHeap, "update", "heap update"),
+            (KeyedMinHeap, "heapify", "heap heapify"),
+            (PriorityQueue, "push", "heap push"),
+            (PriorityQueue, "pop", "heap pop"),
+            (PriorityQueue, "update_priority", "heap update"),
+            (IndexedMinHeap, "push", "heap push"),
+            (IndexedMinHeap, "pop", "heap pop"),
+            (IndexedMinHeap, "decrease_key", "heap update"),
+            (IndexedMinHeap, "change_key", "heap update"),
+            (route_planning, "insert_truck_stop", "reroute stop insert"),
+            (route_planning, "remove_truck_stop", "reroute stop remove"),
+            (HashTable, "get", "hash lookup"),
+            (OpenAddressingHashTable, "get", "hash lookup"))
+
+# Largest number of trace events kept, so a long run cannot use up memory.
+MAX_TRACE_EVENTS = 1000000
+
+enabled = False
+
+# (phase, truck number) -> [calls, seconds]
+timings = {}
+
+# (counter, phase) -> count
+counts = {}
+
+# Trace events in the Chrome trace event format, or None if not tracing.
+trace = None
+
+# Phases running now, innermost last.
+phases = []
+
+# (owner, attribute name, original value) of each replaced function.
+originals = []
+origin = 0.0
+
+def get_truck_number(args, index):
+    """Return the number of the truck (or only truck in a list) in args."""
+
+    if index == None or index >= len(args):
+        return None
+    truck = args[index]
+    if isinstance(truck, list):
+        if len(truck) != 1:
+            return None
+        truck = truck[0]
+    return getattr(truck, "number", None)
+
+def make_timed(function, phase, truck_index):
+    """Return a copy of a function that records its time under a phase."""
+
+    @functools.wraps(function)
+    def timed(*args, **kwargs):
+        truck = get_truck_number(args, truck_index)
+        phases.append(phase)
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            phases.pop()
+            timing = timings.get((phase, truck))
+            if timing == None:
+                timing = [0, 0.0]
+                timings[(phase, truck)] = timing
+            timing[0] += 1
+            timing[1] += elapsed
+            if trace != None and len(trace) < MAX_TRACE_EVENTS:
+                trace.append({"name": phase, "ph": "X",
+                              "ts": (start - origin) * 1000000,
+                              "dur": elapsed * 1000000, "pid": 0,
+                              "tid": 0 if truck == None else truck})
+    return timed
+
+def make_counted(function, counter):
+    """Return a copy of a function that counts its calls."""
+
+    @functools.wraps(function)
+    def counted(*args, **kwargs):
+        key = (counter, phases[-1] if len(phases) > 0 else None)
+        counts[key] = counts.get(key, 0) + 1
+        return function(*args, **kwargs)
+    return counted
+
+def enable(module, tracing=False) -> None:
+    """
+    Start timing the phases in a module and counting operations.
+
+    Keyword arguments:
+    module -- the module holding the simulation's functions: main, or
+              sys.modules['__main__'] when main.py is run as a script.
+    tracing -- whether to keep a trace event for every timed call.
+    """
+
+    global enabled, trace, origin
+    if enabled:
+        disable()
+
+    phase_counters = dict(PHASE_COUNTERS)
+    for name, truck_index in PHASES:
+        function = getattr(module, name)
+        originals.append((module, name, function))
+        timed = make_timed(function, name, truck_index)
+        if name in phase_counters:
+            timed = make_counted(timed, phase_counters[name])
+        setattr(module, name, timed)
+
+    for owner, name, counter in COUNTERS:
+        function = owner.__dict__[name]
+        originals.append((owner, name, function))
+        setattr(owner, name, make_counted(function, counter))
+
+    trace = [] if tracing else None
+    origin = time.perf_counter()
+    enabled = True
+
+def disable() -> None:
+    """Stop timing and counting; the recorded values are kept."""
+
+    global enabled
+    while len(originals) > 0:
+        owner, name, function = originals.pop()
+        setattr(owner, name, function)
+    phases.clear()
+    enabled = False
+
+def reset() -> None:
+    """Clear the recorded times, counts, and trace."""
+
+    global trace, origin
+    timings.clear()
+    counts.clear()
+    if trace != None:
+        trace = []
+    origin = time.perf_counter()
+
+def sort_key(item):
+    """Sort (name, truck or phase) keys by name, then with None first."""
+
+    name, group = item[0]
+    if group == None:
+        return (name, 0, "")
+    return (name, 1, group)
+
+def get_summary() -> {}:
+    """Return the recorded times and counts as a dictionary."""
+
+    return {
+        "timings": [{"phase": phase, "truck": truck, "calls": calls,
+                     "seconds": seconds}
+                    for (phase, truck), (calls, seconds)
+                    in sorted(timings.items(), key=sort_key)],
+        "counts": [{"counter": counter, "phase": phase, "count": count}
+                   for (counter, phase), count
+                   in sorted(counts.items(), key=sort_key)],
+    }
+
+def print_summary() -> None:
+    """Print tables of the recorded times and counts."""
+
+    summary = get_summary()
+    print("Phase | Truck | Calls | Total ms | Mean ms")
+    for timing in summary["timings"]:
+        truck = "-" if timing["truck"] == None else timing["truck"]
+        print(timing["phase"], "|", truck, "|", timing["calls"], "|",
+              "{:0.3f}".format(timing["seconds"] * 1000), "|",
+              "{:0.3f}".format(timing["seconds"] * 1000 / timing["calls"]))
+    print()
+    print("Counter | Phase | Count")
+    for count in summary["counts"]:
+        phase = "-" if count["phase"] == None else count["phase"]
+        print(count["counter"], "|", phase, "|", count["count"])
+
+def write_json(filename) -> None:
+    """
+    Write the summary, and the trace if tracing, to a JSON file.
+
+    The file can be opened with a Chrome trace event viewer (such as
+    chrome://tracing or Perfetto); each truck is shown as a thread.
+    """
+
+    summary = get_summary()
+    summary["traceEvents"] = trace if trace != None else []
+    with open(filename, "w") as f:
+        json.dump(summary, f)
@@ -0,0 +1,327 @@
+"""
+Functions used to improve the order in which a truck visits its stops.
+
+A tour is a list of vertex ids. The first and last ids of a tour are the
+fixed start and end of the route (they may be the same vertex); every id in
+between is a stop that may be reordered. Distances are read from an all-pairs
+distance matrix indexed by vertex id (see Graph.distance_matrix). The local
+search moves assume symmetric distances, as produced by an undirected graph.
+
+The "deadline" strategy treats each stop's delivery deadline as the end of
+a time window and rebuilds the tour by cheapest feasible insertion, so stops
+with early deadlines are not left behind closer stops with later ones. If
+the rebuilt tour is later than the tour it was given, the given tour is
+kept. The end of a tour has no deadline, even if it is also a stop.
+
+Functions:
+route_length -- return the total distance of a tour.
+route_lateness -- return the total minutes by which a tour misses deadlines.
+two_opt -- improve a tour by reversing segments.
+or_opt -- improve a tour by moving short segments.
+deadline_insertion -- build a tour that respects stop deadlines.
+optimize_tour -- improve a tour with the selected strategy.
+"""
+
+import time
+
+# Names accepted by optimize_tour. "greedy" leaves the tour unchanged.
+STRATEGIES = ("greedy", "2-opt", "or-opt", "2-opt+or-opt", "deadline")
+
+# Default limit for a single call to optimize_tour. Counting moves rather
+# than time makes the result the same on every run, however busy the machine
+# is; a time budget can be given as well.
+DEFAULT_MAX_ITERATIONS = 1000
+
+# Improvements smaller than this are treated as floating point noise.
+EPSILON = 1e-9
+
+def route_length(tour, distance) -> float:
+    """
+    Return the total distance of a tour.
+
+    Keyword arguments:
+    tour -- a list of vertex ids.
+    distance -- an all-pairs distance matrix indexed by vertex id.
+
+    Time complexity: O(n)
+    """
+
+    length = 0
+    for i in range(len(tour) - 1):
+        length += distance[tour[i]][tour[i + 1]]
+    return length
+
+def route_lateness(tour, distance, deadlines, start_time, speed) -> float:
+    """
+    Return the total minutes by which a tour misses its stop deadlines.
+
+    The last id is the fixed end of the tour, so its deadline is ignored.
+
+    Keyword arguments:
+    tour -- a list of vertex ids.
+    distance -- an all-pairs distance matrix indexed by vertex id.
+    deadlines -- a dictionary of vertex id to deadline in minutes.
+    start_time -- the time in minutes at which the tour starts.
+    speed -- the speed of the truck in miles per hour.
+
+    Time complexity: O(n)
+    """
+
+    minutes_per_mile = 60 / speed
+    time = start_time
+    lateness = 0
+    for i in range(1, len(tour) - 1):
+        time += distance[tour[i - 1]][tour[i]] * minutes_per_mile
+        deadline = deadlines.get(tour[i])
+        if deadline != None and time > deadline:
+            lateness += time - deadline
+    return lateness
+
+def two_opt(tour, distance, max_iterations=DEFAULT_MAX_ITERATIONS,
+            deadline=None) -> int:
+    """
+    Improve a tour in place by reversing segments; return the moves made.
+
+    Repeatedly replaces the edges (a, b) and (c, d) with (a, c) and (b, d) by
+    reversing the segment b..c whenever that shortens the tour.
+
+    Keyword arguments:
+    tour -- a list of vertex ids; the first and last ids are not moved.
+    distance -- an all-pairs distance matrix indexed by vertex id.
+    max_iterations -- the maximum number of improving moves to make.
+    deadline -- an optional time.perf_counter() value to stop at.
+
+    Time complexity: O(n^2) per pass over the tour.
+    Space complexity: O(1)
+    """
+
+    moves = 0
+    improved = True
+    while improved and moves < max_iterations:
+        improved = False
+        for i in range(1, len(tour) - 2):
+            if deadline != None and time.perf_counter() > deadline:
+                return moves
+            a = tour[i - 1]
+            b = tour[i]
+            for j in range(i + 1, len(tour) - 1):
+                c = tour[j]
+                d = tour[j + 1]
+                delta = (distance[a][c] + distance[b][d]
+                         - distance[a][b] - distance[c][d])
+                if delta < -EPSILON:
+                    tour[i:j + 1] = tour[i:j + 1][::-1]
+                    b = tour[i]
+                    moves += 1
+                    improved = True
+                    if moves >= max_iterations:
+                        return moves
+    return moves
+
+def or_opt(tour, distance, max_iterations=DEFAULT_MAX_ITERATIONS,
+           deadline=None, max_segment_length=3) -> int:
+    """
+    Improve a tour in place by moving short segments; return the moves made.
+
+    Moves a segment of one to max_segment_length consecutive stops to the
+    position between two other stops whenever that shortens the tour.
+
+    Keyword arguments:
+    tour -- a list of vertex ids; the first and last ids are not moved.
+    distance -- an all-pairs distance matrix indexed by vertex id.
+    max_iterations -- the maximum number of improving moves to make.
+    deadline -- an optional time.perf_counter() value to stop at.
+    max_segment_length -- the longest segment to move (default of 3).
+
+    Time complexity: O(L * n^2) per pass over the tour where L is
+    max_segment_length.
+    Space complexity: O(L)
+    """
+
+    moves = 0
+    improved = True
+    while improved and moves < max_iterations:
+        improved = False
+        for length in range(1, max_segment_length + 1):
+            i = 1
+            while i + length < len(tour):
+                if deadline != None and time.perf_counter() > deadline:
+                    return moves
+
+                previous = tour[i - 1]
+                first = tour[i]
+                last = tour[i + length - 1]
+                following = tour[i + length]
+                removal_gain = (distance[previous][first]
+                                + distance[last][following]
+                                - distance[previous][following])
+
+                # Find the cheapest place to reinsert the segment.
+                best_delta = -EPSILON
+                best_j = None
+                for j in range(len(tour) - 1):
+                    if j >= i - 1 and j <= i + length - 1:
+                        continue
+                    p = tour[j]
+                    q = tour[j + 1]
+                    delta = (distance[p][first] + distance[last][q]
+                             - distance[p][q] - removal_gain)
+                    if delta < best_delta:
+                        best_delta = delta
+                        best_j = j
+
+                if best_j != None:
+                    segment = tour[i:i + length]
+                    del tour[i:i + length]
+                    insert_at = best_j + 1 if best_j < i else best_j + 1 - length
+                    tour[insert_at:insert_at] = segment
+                    moves += 1
+                    improved = True
+                    if moves >= max_iterations:
+                        return moves
+                else:
+                    i += 1
+    return moves
+
+def deadline_insertion(tour, distance, deadlines, start_time, speed) -> []:
+    """
+    Return a tour built by inserting stops in order of their deadlines.
+
+    Stops are taken in order of deadline (ties keep their order in the given
+    tour) and each one is inserted where it adds the least lateness, and
+    among equally late positions, the least distance. The slack (minutes
+    until the tightest later deadline) of each position is used to skip the
+    lateness calculation for positions that cannot make any stop late.
+
+    Keyword arguments:
+    tour -- a list of vertex ids; the first and last ids are not moved.
+    distance -- an all-pairs distance matrix indexed by vertex id.
+    deadlines -- a dictionary of vertex id to deadline in minutes. Stops
+                 without a deadline, and the end of the tour, are never
+                 late.
+    start_time -- the time in minutes at which the tour starts.
+    speed -- the speed of the truck in miles per hour.
+
+    Time complexity: O(n^2) when every stop can be inserted without making
+    another stop late, O(n^3) in the worst case.
+    Space complexity: O(n)
+    """
+
+    infinity = float('inf')
+    minutes_per_mile = 60 / speed
+
+    route = [tour[0], tour[-1]]
+    stops = sorted(tour[1:-1], key=lambda el : deadlines.get(el, infinity))
+
+    for stop in stops:
+        stop_deadline = deadlines.get(stop, infinity)
+
+        # Arrival time at each vertex on the current route.
+        arrival = [start_time]
+        for i in range(1, len(route)):
+            arrival.append(arrival[i - 1]
+                           + distance[route[i - 1]][route[i]] * minutes_per_mile)
+
+        # slack[i] is the smallest (deadline - arrival) of the stops from
+        # position i to the end of the route.
+        slack = [infinity] * (len(route) + 1)
+        for i in range(len(route) - 2, 0, -1):
+            slack[i] = min(slack[i + 1],
+                           deadlines.get(route[i], infinity) - arrival[i])
+
+        best_cost = None
+        best_position = 0
+        for k in range(len(route) - 1):
+            p = route[k]
+            q = route[k + 1]
+            added = distance[p][stop] + distance[stop][q] - distance[p][q]
+            delay = added * minutes_per_mile
+
+            arrive_at_stop = arrival[k] + distance[p][stop] * minutes_per_mile
+            lateness = max(0, arrive_at_stop - stop_deadline)
+
+            # Only recalculate the lateness of later stops if the delay is
+            # larger than the slack after this position.
+            if delay > slack[k + 1]:
+                for j in range(k + 1, len(route) - 1):
+                    deadline = deadlines.get(route[j], infinity)
+                    lateness += (max(0, arrival[j] + delay - deadline)
+                                 - max(0, arrival[j] - deadline))
+
+            cost = (lateness, added)
+            if best_cost == None or cost < best_cost:
+                best_cost = cost
+                best_position = k + 1
+
+        route.insert(best_position, stop)
+
+    return route
+
+def optimize_tour(tour, distance, strategy="2-opt+or-opt",
+                  time_budget=None,
+                  max_iterations=DEFAULT_MAX_ITERATIONS,
+                  deadlines=None, start_time=0, speed=None) -> []:
+    """
+    Return an improved copy of a tour.
+
+    Keyword arguments:
+    tour -- a list of vertex ids; the first and last ids are not moved.
+    distance -- an all-pairs distance matrix indexed by vertex id.
+    strategy -- one of STRATEGIES.
+    time_budget -- seconds to spend improving the tour (default of None for
+                   no limit other than max_iterations). With a time budget,
+                   the result can depend on how busy the machine is.
+    max_iterations -- the maximum number of improving moves to make.
+    deadlines -- a dictionary of vertex id to deadline in minutes (used by
+                 the "deadline" strategy).
+    start_time -- the time in minutes at which the tour starts (used by the
+                  "deadline" strategy).
+    speed -- the speed of the truck in miles per hour (used by the
+             "deadline" strategy).
+
+    With "2-opt+or-opt", the two searches alternate until neither can improve
+    the tour or a limit is reached.
+    """
+
+    if strategy not in STRATEGIES:
+        raise ValueError("Unknown routing strategy: " + str(strategy))
+
+    tour = list(tour)
+    if strategy == "greedy" or len(tour) < 4:
+        return tour
+
+    if strategy == "deadline":
+        if deadlines == None or speed == None:
+            raise ValueError("The deadline strategy needs deadlines and a speed.")
+        inserted = deadline_insertion(tour, distance, deadlines, start_time,
+                                      speed)
+
+        # Keep the given tour if inserting by deadline made it later, or as
+        # late and longer.
+        def get_cost(el):
+            return (route_lateness(el, distance, deadlines, start_time, speed),
+                    route_length(el, distance))
+        if get_cost(tour) < get_cost(inserted):
+            return tour
+        return inserted
+
+    deadline = None
+    if time_budget != None:
+        deadline = time.perf_counter() + time_budget
+
+    if strategy == "2-opt":
+        two_opt(tour, distance, max_iterations, deadline)
+    elif strategy == "or-opt":
+        or_opt(tour, distance, max_iterations, deadline)
+    else:
+        moves_left = max_iterations
+        while moves_left > 0:
+            moves = two_opt(tour, distance, moves_left, deadline)
+            moves += or_opt(tour, distance, moves_left - moves, deadline)
+            moves_left -= moves
+            if moves == 0:
+                break
+            if deadline != None and time.perf_counter() > deadline:
+                break
+
+    return tour
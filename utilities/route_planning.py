@@ -0,0 +1,458 @@
+"""
+Functions used to plan truck routes, one at a time or in a process pool.
+
+Routes are planned on vertex ids with the graph's all-pairs shortest path
+tables (see Graph.distance_matrix), so planning does not need the Vertex
+objects. RoutePlanner copies the tables once into flat arrays and hands them
+to each worker process when it starts; each route then only sends its stop
+ids to a worker and gets a list of vertex ids back.
+
+Functions:
+flatten_tables -- return a graph's all-pairs tables as flat arrays.
+plan_route -- return the path of a route through a set of stops.
+order_stops -- order stops by going to the next closest stop.
+join_tour -- return the path through a tour of stops.
+insert_stop -- insert a stop into a tour where it adds the least distance.
+remove_stop -- remove a stop from a tour.
+insert_truck_stop -- add a stop to a truck's route without replanning it.
+remove_truck_stop -- remove a stop from a truck's route without replanning it.
+set_truck_tour -- set a truck's route to a tour of stops.
+
+Classes:
+RoutePlanner -- plans several routes at once in a process pool.
+RouteCache -- keeps recently planned routes so they are not planned again.
+"""
+
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from datastructures.LRUCache import LRUCache
+from utilities import route_optimization
+
+def flatten_tables(graph) -> ():
+    """
+    Return the vertex count and the all-pairs distance and previous tables
+    of a graph as flat V * V arrays (row u starts at index u * V).
+
+    Time complexity: O(V^2)
+    Space complexity: O(V^2)
+    """
+
+    distance = graph.distance_matrix()
+    previous = graph.all_pairs_previous
+    vertex_count = len(graph.vertex_list)
+
+    flat_distance = array('d')
+    flat_previous = array('q')
+    for u in range(vertex_count):
+        flat_distance.extend(distance[u])
+        flat_previous.extend(previous[u])
+    return vertex_count, flat_distance, flat_previous
+
+def split_rows(flat, vertex_count) -> []:
+    """Return a list of read-only views of each row of a flat V * V array."""
+
+    view = memoryview(flat).toreadonly()
+    return [view[u * vertex_count:(u + 1) * vertex_count]
+            for u in range(vertex_count)]
+
+def plan_route(start, stops, end, distance, previous, strategy="greedy",
+               deadlines=None, start_time=0, speed=None, time_budget=None) -> []:
+    """
+    Return the path of a route through a set of stops as a list of vertex ids.
+
+    The stops are first ordered by going to the next closest stop (greedy
+    approach, see order_stops), breaking ties by the lower vertex id, so the
+    route does not depend on the order the stops are listed in. Unless the strategy is
+    "greedy", that order is then improved by local search (see
+    utilities.route_optimization). The shortest paths between consecutive
+    stops are then joined into one path.
+
+    Keyword arguments:
+    start -- the id of the starting vertex.
+    stops -- a list of the ids of the vertices to visit.
+    end -- the id of the vertex to end at.
+    distance -- the all-pairs distance table indexed by vertex id.
+    previous -- the all-pairs previous vertex table indexed by vertex id.
+    strategy -- the route optimization strategy (default of "greedy").
+    deadlines -- a dictionary of vertex id to delivery deadline in minutes
+                 (used by the "deadline" strategy).
+    start_time -- the time at which the route starts (used by the "deadline"
+                  strategy).
+    speed -- the speed of the truck (used by the "deadline" strategy).
+    time_budget -- seconds to spend improving the order of the stops
+                   (default of None to stop after
+                   route_optimization.DEFAULT_MAX_ITERATIONS moves, so the
+                   route is the same on every run).
+
+    Time complexity: O(S^2 + P) where S is the number of stops and P is the
+    number of vertices in the returned path, plus the time of the route
+    optimization strategy.
+
+    Space complexity: O(S + P)
+    """
+
+    tour = order_stops(start, stops, distance)
+    tour.append(end)
+
+    # Improve the greedy order of the stops.
+    if strategy != "greedy":
+        tour = route_optimization.optimize_tour(
+            tour, distance, strategy, time_budget=time_budget,
+            deadlines=deadlines, start_time=start_time, speed=speed)
+
+    return join_tour(tour, distance, previous)
+
+def order_stops(start, stops, distance) -> []:
+    """
+    Return a list of vertex ids starting at start and then going to the next
+    closest stop until every reachable stop is visited.
+
+    Ties between equally close stops go to the lower vertex id, so the order
+    does not depend on the order the stops are listed in.
+
+    Keyword arguments:
+    start -- the id of the starting vertex.
+    stops -- a list of the ids of the vertices to visit.
+    distance -- the all-pairs distance table indexed by vertex id.
+
+    Time complexity: O(S^2) where S is the number of stops.
+    """
+
+    remaining = sorted(stops)
+    tour = [start]
+    current = start
+
+    while len(remaining) > 0:
+        row = distance[current]
+        index = 0
+        for i, v in enumerate(remaining):
+            if row[v] < row[remaining[index]]:
+                index = i
+        closest = remaining.pop(index)
+
+        # If a path does not exist to the closest vertex, the search can stop
+        # here.
+        if row[closest] == float('inf'):
+            break
+
+        tour.append(closest)
+        current = closest
+
+    return tour
+
+def join_tour(tour, distance, previous) -> []:
+    """
+    Return the path through a tour of vertex ids as a list of vertex ids,
+    joining the shortest paths between consecutive stops.
+
+    If there is no path between two stops, the path found thus far is
+    returned.
+
+    Keyword arguments:
+    tour -- a list of vertex ids.
+    distance -- the all-pairs distance table indexed by vertex id.
+    previous -- the all-pairs previous vertex table indexed by vertex id.
+
+    Time complexity: O(P) where P is the number of vertices in the path.
+    """
+
+    path = [tour[0]]
+    for i in range(1, len(tour)):
+        from_id = tour[i - 1]
+        to_id = tour[i]
+
+        # If a path was not found, return the path found thus far.
+        if distance[from_id][to_id] == float('inf'):
+            break
+
+        # Follow the previous vertex ids back from the end of the leg.
+        leg = [to_id]
+        current = to_id
+        while current != from_id:
+            current = previous[from_id][current]
+            leg.append(current)
+        leg.pop()
+        leg.reverse()
+        path += leg
+
+    return path
+
+def insert_stop(tour, stop, distance) -> int:
+    """
+    Insert a stop into a tour in place where it adds the least distance;
+    return its index.
+
+    The stop is tried between each pair of consecutive ids, so the first and
+    last ids of the tour stay in place.
+
+    Keyword arguments:
+    tour -- a list of vertex ids with at least a start and an end.
+    stop -- the id of the vertex to insert.
+    distance -- the all-pairs distance table indexed by vertex id.
+
+    Time complexity: O(n) where n is the length of the tour.
+    """
+
+    best_index = 1
+    best_cost = float('inf')
+    for i in range(1, len(tour)):
+        a = tour[i - 1]
+        b = tour[i]
+        cost = distance[a][stop] + distance[stop][b] - distance[a][b]
+        if cost < best_cost - route_optimization.EPSILON:
+            best_index = i
+            best_cost = cost
+    tour.insert(best_index, stop)
+    return best_index
+
+def remove_stop(tour, stop) -> bool:
+    """
+    Remove a stop from a tour in place, joining its neighbours; return
+    whether it was found.
+
+    The first and last ids of the tour are not removed.
+
+    Time complexity: O(n) where n is the length of the tour.
+    """
+
+    for i in range(1, len(tour) - 1):
+        if tour[i] == stop:
+            del tour[i]
+            return True
+    return False
+
+def insert_truck_stop(truck, vertex, graph, polish_iterations=0) -> bool:
+    """
+    Add a stop to a truck's route where it adds the least distance, instead
+    of planning the route again. Return False if the truck already stops
+    there.
+
+    The route keeps its order otherwise; polish_iterations bounds the 2-opt
+    and or-opt moves then made to improve it. Call this when the truck is
+    at a vertex, as Truck.set_route is.
+
+    Keyword arguments:
+    truck -- a truck object.
+    vertex -- the vertex to stop at.
+    graph -- the graph containing the vertices.
+    polish_iterations -- the most local search moves to make (default of 0
+                         to keep the order).
+
+    Time complexity: O(P) where P is the number of destinations, plus
+    O(S^2) per pass of the polish where S is the number of stops.
+    """
+
+    tour = truck.get_tour()
+    if vertex.id in tour:
+        return False
+    if len(tour) == 1:
+        tour.append(vertex.id)
+    else:
+        insert_stop(tour, vertex.id, graph.distance_matrix())
+    set_truck_tour(truck, tour, graph, polish_iterations)
+    return True
+
+def remove_truck_stop(truck, vertex, graph, polish_iterations=0) -> bool:
+    """
+    Remove a stop from a truck's route, going straight from the stop before
+    it to the stop after it. Return False if the stop is not on the route;
+    the end of the route is not removed.
+
+    See insert_truck_stop for the arguments.
+
+    Time complexity: O(P) where P is the number of destinations, plus
+    O(S^2) per pass of the polish where S is the number of stops.
+    """
+
+    tour = truck.get_tour()
+    if not remove_stop(tour, vertex.id):
+        return False
+    set_truck_tour(truck, tour, graph, polish_iterations)
+    return True
+
+def set_truck_tour(truck, tour, graph, polish_iterations=0) -> None:
+    """Set a truck's route to a tour of vertex ids (see Truck.get_tour)."""
+
+    distance = graph.distance_matrix()
+    if polish_iterations > 0:
+        tour = route_optimization.optimize_tour(
+            tour, distance, "2-opt+or-opt", time_budget=None,
+            max_iterations=polish_iterations)
+
+    path = join_tour(tour, distance, graph.all_pairs_previous)
+    truck.set_route([graph.vertex_list[i] for i in path],
+                    [graph.vertex_list[i] for i in tour[1:]], graph)
+
+# Tables of the graph in a worker process, set by init_worker.
+worker_distance = None
+worker_previous = None
+
+def init_worker(vertex_count, flat_distance, flat_previous) -> None:
+    """Keep the flattened tables sent to a worker process for plan_routes."""
+
+    global worker_distance, worker_previous
+    worker_distance = split_rows(flat_distance, vertex_count)
+    worker_previous = split_rows(flat_previous, vertex_count)
+
+def plan_in_worker(request) -> []:
+    """Plan one route request with the tables of the worker process."""
+
+    start, stops, end, strategy, deadlines, start_time, speed, budget = request
+    return plan_route(start, stops, end, worker_distance, worker_previous,
+                      strategy, deadlines, start_time, speed, budget)
+
+class RoutePlanner:
+    """Plans the routes of several trucks at once in a process pool."""
+
+    def __init__(self, graph, max_workers=None, time_budget=None):
+        """
+        Initialize the RoutePlanner and start its worker processes.
+
+        The graph's all-pairs tables are copied into two flat arrays, which
+        are sent once to each worker when it starts. Changes to the graph
+        after this point are not seen by the workers; create a new planner
+        instead.
+
+        Routes are planned with plan_route, so by default the parallel and
+        serial planners stop improving a route after the same number of
+        moves and plan the same routes on every run. Results come back in
+        request order.
+
+        Keyword arguments:
+        graph -- the graph to plan routes on.
+        max_workers -- the number of worker processes (default of the number
+                       of CPUs).
+        time_budget -- seconds to spend improving each route (default of
+                       None; see plan_route). With a time budget, a route
+                       can depend on how busy the machine is.
+        """
+
+        self.time_budget = time_budget
+        if max_workers == None:
+            max_workers = os.cpu_count() or 1
+        self.max_workers = max_workers
+
+        vertex_count, flat_distance, flat_previous = flatten_tables(graph)
+        self.executor = ProcessPoolExecutor(
+            max_workers, initializer=init_worker,
+            initargs=(vertex_count, flat_distance, flat_previous))
+
+    def plan_routes(self, requests) -> []:
+        """
+        Return the path of each route request as a list of vertex ids.
+
+        Keyword arguments:
+        requests -- a list of (start, stops, end, strategy, deadlines,
+                    start_time, speed) tuples, with the arguments of
+                    plan_route.
+
+        Requests are sent to the workers in chunks, so each worker gets
+        about four chunks.
+        """
+
+        requests = [request + (self.time_budget,) for request in requests]
+        if len(requests) == 0:
+            return []
+        chunk_size = max(1, len(requests) // (self.max_workers * 4))
+        return list(self.executor.map(plan_in_worker, requests,
+                                      chunksize=chunk_size))
+
+    def close(self) -> None:
+        """Stop the worker processes."""
+
+        self.executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+class RouteCache:
+    """Recently planned routes of a graph, keyed by their start, stops, and end."""
+
+    def __init__(self, graph, capacity=1024, source=None):
+        """
+        Initialize the RouteCache.
+
+        Routes are kept in an LRUCache keyed by the start vertex id, a
+        frozenset of the stop ids, the end vertex id, and the strategy. The
+        order of the stops does not change the key, or the route plan_route
+        returns, so a route is found again however the stops were listed.
+        With the "deadline" strategy the stops' deadlines, start time, and
+        speed are part of the key too. Routes planned with a time budget
+        can depend on how busy the machine is, so they are not cached; a
+        cached route is then always the route plan_route would return.
+
+        The cache is cleared when the graph's version changes, i.e. after
+        any vertex, edge, or shortest path changed.
+
+        Keyword arguments:
+        graph -- the graph routes are planned on.
+        capacity -- the largest number of routes kept.
+        source -- a label of the data the graph was built from (e.g. the map
+                  file), used to check that a later graph is the same one
+                  before calling attach.
+        """
+
+        self.graph = graph
+        self.routes = LRUCache(capacity)
+        self.source = source
+        self.version = graph.version
+        self.invalidations = 0
+
+    def attach(self, graph):
+        """
+        Plan routes on another graph, keeping the cached routes.
+
+        The graph must have the same vertices, in the same order, and the
+        same edges as the current one; for example, the same map imported
+        again for another run of the simulation.
+        """
+
+        self.graph = graph
+        self.version = graph.version
+
+    def get_route(self, start, stops, end, strategy="greedy", deadlines=None,
+                  start_time=0, speed=None, time_budget=None) -> []:
+        """
+        Return the path of a route as a list of vertex ids, planning it with
+        plan_route if it is not cached. See plan_route for the arguments.
+
+        Time complexity: O(S) for a cached route, where S is the number of
+        stops; otherwise the time of plan_route.
+        """
+
+        # Routes planned in a time budget are not repeatable.
+        if time_budget != None:
+            return plan_route(start, stops, end, self.graph.distance_matrix(),
+                              self.graph.all_pairs_previous, strategy,
+                              deadlines, start_time, speed, time_budget)
+
+        if self.graph.version != self.version:
+            self.routes.clear()
+            self.version = self.graph.version
+            self.invalidations += 1
+
+        key = (start, frozenset(stops), end, strategy)
+        if strategy == "deadline":
+            key += (frozenset(deadlines.items()), start_time, speed)
+
+        path = self.routes.get(key)
+        if path == None:
+            path = tuple(plan_route(start, stops, end,
+                                    self.graph.distance_matrix(),
+                                    self.graph.all_pairs_previous, strategy,
+                                    deadlines, start_time, speed))
+            self.routes.put(key, path)
+        return list(path)
+
+    def get_stats(self):
+        """Return a dictionary of the cache's size, hits, and misses."""
+
+        stats = self.routes.get_stats()
+        stats["invalidations"] = self.invalidations
+        return stats
@@ -0,0 +1,112 @@
+"""
+Functions used to run the delivery simulation without the admin interface.
+
+A scenario (see models.Scenario) sets the fleet, the strategies, and the
+data files of a run. run_scenario sets up the simulation in main.py for the
+scenario, runs it until EOD without prompting, and returns a
+models.SimulationResult. run_sweep runs many scenarios in worker processes,
+for example to find the smallest fleet that delivers every package on time.
+
+Run from the repository root to compare fleet sizes:
+python -m utilities.simulation
+
+Functions:
+run_scenario -- run one scenario and return its result.
+run_sweep -- run a list of scenarios in parallel and return their results.
+print_results -- print a table of results.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import main
+from models.Package import Package
+from models.Scenario import Scenario
+from models.SimulationResult import SimulationResult
+
+def run_scenario(scenario) -> SimulationResult:
+    """
+    Run the simulation for a scenario from start to EOD; return its result.
+
+    Keyword arguments:
+    scenario -- a Scenario object.
+
+    Raises ValueError if the scenario cannot be run, e.g. sequential loading
+    with fewer than 2 trucks.
+    """
+
+    trucks = main.set_up_simulation(scenario)
+
+    # The admin is only prompted at run_until, so never prompt before EOD.
+    run_until = [scenario.end_time]
+    end_time = main.run_simulation(trucks, scenario.start_time,
+                                   scenario.end_time, scenario.time_segment,
+                                   run_until)
+
+    on_time_count = 0
+    late_package_ids = []
+    total_lateness = 0
+    max_lateness = 0
+    for package in main.packages:
+        if package.status == Package.DELIVERED_ON_TIME:
+            on_time_count += 1
+        elif package.status == Package.DELIVERED_LATE:
+            lateness = package.delivered_time - package.delivery_deadline
+            late_package_ids.append(package.package_id)
+            total_lateness += lateness
+            max_lateness = max(max_lateness, lateness)
+
+    undelivered_count = (len(main.packages) - on_time_count
+                         - len(late_package_ids))
+    route_cache_stats = None
+    if main.route_cache != None:
+        route_cache_stats = main.route_cache.get_stats()
+    return SimulationResult(scenario.name, on_time_count,
+                            len(late_package_ids), undelivered_count,
+                            [truck.mileage for truck in trucks],
+                            total_lateness, max_lateness, late_package_ids,
+                            end_time, route_cache_stats)
+
+def run_sweep(scenarios, max_workers=None) -> []:
+    """
+    Run each scenario in a worker process; return the results in order.
+
+    Each worker imports main.py once and then runs its scenarios one after
+    another, so a result does not depend on which worker ran it.
+
+    Keyword arguments:
+    scenarios -- a list of Scenario objects.
+    max_workers -- the number of worker processes (default of the number of
+                   CPUs, but no more than the number of scenarios).
+    """
+
+    if len(scenarios) == 0:
+        return []
+    if max_workers == None:
+        max_workers = os.cpu_count() or 1
+    max_workers = min(max_workers, len(scenarios))
+
+    with ProcessPoolExecutor(max_workers) as executor:
+        return list(executor.map(run_scenario, scenarios))
+
+def print_results(results) -> None:
+    """Print a table of simulation results."""
+
+    print("Scenario | On time | Late | Undelivered | Total lateness"
+          + " | Max lateness | Mileage per truck | Total mileage")
+    for result in results:
+        print(result.name, "|", result.on_time_count, "|", result.late_count,
+              "|", result.undelivered_count, "|",
+              "{:0.1f}".format(result.total_lateness), "|",
+              "{:0.1f}".format(result.max_lateness), "|",
+              ", ".join("{:0.2f}".format(m) for m in result.truck_mileage),
+              "|", "{:0.2f}".format(result.total_mileage))
+
+if __name__ == '__main__':
+    scenarios = []
+    for loading_strategy in ("sequential", "fleet"):
+        for truck_count in range(2, 5):
+            scenarios.append(Scenario(
+                "{} trucks, {}".format(truck_count, loading_strategy),
+                truck_count=truck_count, loading_strategy=loading_strategy))
+    print_results(run_sweep(scenarios))
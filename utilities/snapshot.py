@@ -0,0 +1,262 @@
+"""
+Functions used to save and load a binary snapshot of the imported data.
+
+A snapshot holds the graph (vertex addresses, edges in CSRGraph form, and
+the all-pairs shortest path tables) and the imported packages, so a later
+run can skip parsing the CSV files and inserting edges one at a time.
+
+File layout (all numbers in native byte order):
+header -- magic bytes, format version, byte order, the vertex, edge, and
+          package counts, and a digest of the source files (see
+          get_source_digest).
+arrays -- CSR offsets, targets, and weights, the all-pairs distance and
+          previous tables as flat V * V arrays, and the package ids,
+          deadlines, and masses. Each array starts at a multiple of 8 bytes
+          so it can be read straight from a memory map.
+strings -- vertex addresses and package text fields, each stored as a
+           4-byte length and UTF-8 bytes.
+
+Functions:
+get_source_digest -- return a digest identifying a list of source files.
+is_fresh -- return whether a snapshot was built from the current sources.
+save_snapshot -- write a graph and packages to a snapshot file.
+load_snapshot -- read a snapshot file into a graph and package table.
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from datastructures.CSRGraph import CSRGraph
+from datastructures.Graph import Vertex
+from models.Package import Package
+
+# Increase when the file layout changes so old snapshots are regenerated.
+VERSION = 3
+MAGIC = b"PDSSNAP\0"
+HEADER = struct.Struct("<8sIBxxxIQI4x32s")
+BYTE_ORDERS = {"little": 0, "big": 1}
+
+class SnapshotError(Exception):
+    """Raised when a snapshot file is missing, out of date, or corrupt."""
+
+def get_source_digest(source_filenames) -> bytes:
+    """
+    Return a SHA-256 digest of the resolved path, size, and modification
+    time of each source file, in order.
+
+    A snapshot stores the digest of the files it was built from, so it is
+    not used for other files, or for the same files once they change.
+    """
+
+    digest = hashlib.sha256()
+    for filename in source_filenames:
+        status = os.stat(filename)
+        digest.update(os.path.realpath(filename).encode("utf-8"))
+        digest.update(struct.pack("<qq", status.st_size, status.st_mtime_ns))
+    return digest.digest()
+
+def read_header(filename):
+    """Return the unpacked header of a snapshot file; None if unreadable."""
+
+    try:
+        with open(filename, "rb") as f:
+            return HEADER.unpack(f.read(HEADER.size))
+    except (OSError, struct.error):
+        return None
+
+def is_fresh(snapshot_filename, source_filenames) -> bool:
+    """
+    Return whether a snapshot exists and was built from the source files as
+    they are now, by the current format version.
+    """
+
+    header = read_header(snapshot_filename)
+    if header == None:
+        return False
+    magic, version = header[0], header[1]
+    return (magic == MAGIC and version == VERSION
+            and header[-1] == get_source_digest(source_filenames))
+
+def pad(data):
+    """Pad a bytearray with zeros to a multiple of 8 bytes."""
+
+    data += bytes(-len(data) % 8)
+
+def write_strings(data, strings):
+    """Append length prefixed UTF-8 strings to a bytearray."""
+
+    for string in strings:
+        encoded = string.encode("utf-8")
+        data += struct.pack("<I", len(encoded))
+        data += encoded
+
+def save_snapshot(filename, graph, packages, source_filenames=()):
+    """
+    Write a graph and list of packages to a snapshot file.
+
+    The file is written to a temporary name and renamed, so a run that
+    stops part way never leaves a corrupt snapshot behind. The temporary
+    name includes the process id, so processes writing the same snapshot at
+    once do not write into each other's file.
+
+    Keyword arguments:
+    filename -- the snapshot file to write.
+    graph -- the imported graph.
+    packages -- the list of imported packages.
+    source_filenames -- the files the graph and packages were imported
+                        from, recorded so is_fresh can check them.
+
+    Time complexity: O(V^2 + E + P)
+    """
+
+    csr = graph.get_csr()
+    vertex_count = len(graph.vertex_list)
+    distance = graph.distance_matrix()
+    previous = graph.all_pairs_previous
+
+    data = bytearray(HEADER.pack(MAGIC, VERSION, BYTE_ORDERS[sys.byteorder],
+                                 vertex_count, csr.get_edge_count(),
+                                 len(packages),
+                                 get_source_digest(source_filenames)))
+    pad(data)
+
+    flat_distance = array('d')
+    flat_previous = array('q')
+    for u in range(vertex_count):
+        flat_distance.extend(distance[u])
+        flat_previous.extend(previous[u])
+
+    arrays = [csr.offsets, csr.targets, csr.weights, flat_distance,
+              flat_previous,
+              array('q', [p.package_id for p in packages]),
+              array('q', [p.delivery_deadline for p in packages]),
+              array('q', [p.mass for p in packages])]
+    for values in arrays:
+        data += values.tobytes()
+        pad(data)
+
+    write_strings(data, [vertex.data for vertex in graph.vertex_list])
+    for p in packages:
+        write_strings(data, [p.address, p.city, p.state, p.zip,
+                             p.special_notes])
+
+    temporary_filename = filename + "." + str(os.getpid()) + ".tmp"
+    with open(temporary_filename, "wb") as f:
+        f.write(data)
+    os.replace(temporary_filename, filename)
+
+def load_snapshot(filename, graph, vertices, hashtable, packages,
+                  source_filenames=None):
+    """
+    Read a snapshot file into an empty graph and package table.
+
+    The file is memory mapped where possible, so the arrays are copied
+    straight out of the page cache without a separate read.
+
+    Keyword arguments:
+    filename -- the snapshot file to read.
+    graph -- an empty graph to add vertices and edges to.
+    vertices -- the hashtable to add the vertices to.
+    hashtable -- the hashtable to add the packages to.
+    packages -- the list to append the packages to.
+    source_filenames -- the files the snapshot should have been built from
+                        (default of None to skip the check).
+
+    Raises SnapshotError, without changing the graph or tables, if the file
+    was written by another version, on a machine with a different byte
+    order, or from other source files, or is truncated.
+
+    Time complexity: O(V^2 + E + P)
+    """
+
+    with open(filename, "rb") as f:
+        try:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            buffer = f.read()
+
+    try:
+        with memoryview(buffer) as view:
+            read_snapshot(view, graph, vertices, hashtable, packages,
+                          source_filenames)
+    except (struct.error, ValueError, IndexError, UnicodeDecodeError) as e:
+        raise SnapshotError("Corrupt snapshot file: " + filename) from e
+    finally:
+        if isinstance(buffer, mmap.mmap):
+            buffer.close()
+
+def read_snapshot(view, graph, vertices, hashtable, packages,
+                  source_filenames=None):
+    """Read the contents of a snapshot memoryview; see load_snapshot."""
+
+    (magic, version, byte_order, vertex_count, edge_count, package_count,
+     source_digest) = HEADER.unpack_from(view, 0)
+    if magic != MAGIC or version != VERSION:
+        raise SnapshotError("Snapshot version does not match.")
+    if byte_order != BYTE_ORDERS[sys.byteorder]:
+        raise SnapshotError("Snapshot byte order does not match.")
+    if (source_filenames != None
+            and source_digest != get_source_digest(source_filenames)):
+        raise SnapshotError("Snapshot was built from other source files.")
+    position = HEADER.size + (-HEADER.size % 8)
+
+    def read_array(typecode, count):
+        nonlocal position
+        values = array(typecode)
+        end = position + count * values.itemsize
+        if end > len(view):
+            raise ValueError("Snapshot is truncated.")
+        values.frombytes(view[position:end])
+        position = end + (-end % 8)
+        return values
+
+    offsets = read_array('q', vertex_count + 1)
+    targets = read_array('q', edge_count)
+    weights = read_array('d', edge_count)
+    flat_distance = read_array('d', vertex_count * vertex_count)
+    flat_previous = read_array('q', vertex_count * vertex_count)
+    package_ids = read_array('q', package_count)
+    deadlines = read_array('q', package_count)
+    masses = read_array('q', package_count)
+
+    def read_string():
+        nonlocal position
+        length = struct.unpack_from("<I", view, position)[0]
+        position += 4
+        if position + length > len(view):
+            raise ValueError("Snapshot is truncated.")
+        string = str(view[position:position + length], "utf-8")
+        position += length
+        return string
+
+    # Read everything before changing the graph or table, so a corrupt file
+    # leaves them empty.
+    addresses = [read_string() for _ in range(vertex_count)]
+    package_fields = [[read_string() for _ in range(5)]
+                      for _ in range(package_count)]
+
+    for address in addresses:
+        vertex = Vertex(address)
+        graph.add_vertex(vertex)
+        vertices.add(vertex)
+    graph.load_csr(CSRGraph(offsets, targets, weights))
+
+    distance = []
+    previous = []
+    for u in range(vertex_count):
+        start = u * vertex_count
+        end = start + vertex_count
+        distance.append(flat_distance[start:end].tolist())
+        previous.append(flat_previous[start:end].tolist())
+    graph.set_all_pairs_shortest_paths(distance, previous)
+
+    for i, fields in enumerate(package_fields):
+        address, city, state, zip, special_notes = fields
+        package = Package(package_ids[i], address, city, state, zip,
+                          deadlines[i], masses[i], special_notes)
+        hashtable.add(package)
+        packages.append(package)